@@ -18,6 +18,7 @@ MONGO_USER = os.environ.get('MONGO_USER')
 MONGO_PASSWORD = os.environ.get('MONGO_PASSWORD')
 MONGO_DATABASE = os.environ.get('MONGO_DATABASE')
 MONGO_COLLECTION = os.environ.get('MONGO_COLLECTION', 'recsys_data')
+MONGO_HEALTH_CHECK_INTERVAL = float(os.environ.get('MONGO_HEALTH_CHECK_INTERVAL', 30))  # 공유 연결 상태 확인(ping) 최소 간격 (초)
 
 # 필수 환경 변수 확인
 if not all([MONGO_HOST, MONGO_USER, MONGO_PASSWORD, MONGO_DATABASE]):
@@ -40,6 +41,12 @@ if USE_SSH_TUNNEL and not all([SSH_HOST, SSH_USER]) and not (SSH_PASSWORD or SSH
 # 동기화 설정
 SYNC_INTERVAL_HOURS = float(os.environ.get('SYNC_INTERVAL_HOURS', 1.0))
 SYNC_ON_STARTUP = os.environ.get('SYNC_ON_STARTUP', 'false').lower() == 'true'
+MONGO_SYNC_MODE = os.environ.get('MONGO_SYNC_MODE', 'full')  # full, incremental (변경분만 가져와 로컬 스냅샷에 병합)
+MONGO_SYNC_UPDATED_FIELD = os.environ.get('MONGO_SYNC_UPDATED_FIELD', 'updated_at')  # 증분 동기화 기준 수정 시각 필드
+MONGO_SYNC_ID_COLLECTIONS = [name.strip() for name in os.environ.get('MONGO_SYNC_ID_COLLECTIONS', '').split(',') if name.strip()]  # 수정 시각 필드가 없을 때 _id(ObjectId) 기준 증분 동기화를 허용할 컬렉션 (추가만 되고 수정되지 않는 컬렉션, 쉼표 구분)
+MONGO_SYNC_FULL_EVERY = int(os.environ.get('MONGO_SYNC_FULL_EVERY', 24))  # 증분 동기화 N번마다 전체 동기화 (0 이하이면 사용 안 함)
+MONGO_SYNC_CONCURRENCY = int(os.environ.get('MONGO_SYNC_CONCURRENCY', 5))  # 사용자 관련 컬렉션 동시 조회 수 (1이면 순차 조회)
+MONGO_SYNC_BATCH_SIZE = int(os.environ.get('MONGO_SYNC_BATCH_SIZE', 1000))  # 전체 조회 커서가 한 번에 받아올 문서 수
 
 # MongoDB 설정 로드 알림 (민감한 정보는 로깅하지 않음)
 if MONGO_HOST:
@@ -1,11 +1,83 @@
 # app/dependencies/__init__.py
 
+import uuid
+from dataclasses import dataclass, fields
 from datetime import datetime
+from typing import Any, Optional
 
 # 글로벌 변수 초기화
 globals_dict = {}
 model_initializing = False  # 모델 초기화 상태를 추적하는 전역 변수
 last_initialization_attempt = None  # 마지막 초기화 시도 시간
 
+
+@dataclass(frozen=True)
+class ModelSnapshot:
+    """
+    추천에 필요한 모델 상태를 한 번에 묶은 불변 스냅샷
+
+    재학습 시에는 새 스냅샷을 따로 완성한 뒤 swap_model_snapshot으로 참조만 교체합니다.
+    요청은 시작할 때 get_model_snapshot()으로 참조 하나를 잡고 끝까지 사용하므로
+    재학습 중에도 새 scaler와 이전 df_model이 섞이거나 빈 상태를 보는 일이 없습니다.
+    (포함된 DataFrame/모델 객체도 게시 이후에는 수정하지 않습니다.)
+    """
+    scaler: Any
+    stacking_reg: Any
+    model_features: list
+    df_model: Any
+    score_table: Any
+    inference_model: Any = None  # 추론 전용으로 변환한 스태킹 모델 (없으면 stacking_reg 사용)
+    user_features_df: Any = None
+    user_feature_store: Any = None
+    user_data_frames: Any = None
+    model_version: Optional[str] = None
+    artifact_version: Optional[str] = None  # 저장된 모델 아티팩트 버전 (STORAGE_DIR/models)
+    training_report: Any = None  # 학습 리포트 (스택 CV R², 개별 모델 OOF 지표 등)
+    last_update: Optional[datetime] = None
+
+    def as_dict(self) -> dict:
+        """기존 globals_dict 형식의 딕셔너리로 변환 (평가 모듈 등 딕셔너리 기반 소비자용)"""
+        return {field.name: getattr(self, field.name) for field in fields(self)}
+
+
+# 현재 게시된 모델 스냅샷 (참조 교체만으로 갱신)
+_model_snapshot: Optional[ModelSnapshot] = None
+
+def make_model_version(artifact_version: Optional[str] = None, user_features_df=None) -> str:
+    """
+    추천 캐시 키에 쓰는 모델 버전 문자열 생성
+
+    추천 결과는 모델 아티팩트와 사용자 특성에만 의존하므로 (아티팩트 버전, 사용자 특성 내용 해시)로 만듭니다.
+    같은 아티팩트와 사용자 특성을 로드한 프로세스(uvicorn 워커)는 같은 값을 가지므로 공유 캐시를 함께 사용할 수 있고,
+    재학습하거나 사용자 특성이 바뀌면 값이 바뀌어 이전 캐시 항목은 조회되지 않습니다.
+
+    Args:
+        artifact_version: 저장된 모델 아티팩트 버전 (없으면 생성 시각 + 임의 접미사를 사용하여 캐시를 공유하지 않음)
+        user_features_df: 전처리된 사용자 특성 데이터 (옵션)
+
+    Returns:
+        str: 모델 버전 문자열
+    """
+    if artifact_version is None:
+        return f"{datetime.now().strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:8]}"
+
+    from app.services.stage_cache import hash_dataframe
+    features_hash = hash_dataframe(user_features_df) if user_features_df is not None else "none"
+    return f"{artifact_version}-{features_hash[:12]}"
+
+def get_model_snapshot() -> Optional[ModelSnapshot]:
+    """현재 게시된 모델 스냅샷 반환 (없으면 None)"""
+    return _model_snapshot
+
+def swap_model_snapshot(snapshot: ModelSnapshot) -> Optional[ModelSnapshot]:
+    """새 모델 스냅샷을 원자적으로 게시하고 이전 스냅샷을 반환"""
+    global _model_snapshot
+    previous, _model_snapshot = _model_snapshot, snapshot
+    return previous
+
 def get_globals_dict():
-    return globals_dict
\ No newline at end of file
+    """현재 모델 스냅샷을 포함한 전역 상태 딕셔너리 반환 (요청마다 새 딕셔너리)"""
+    snapshot = _model_snapshot
+    if snapshot is None:
+        return dict(globals_dict)
+    return {**globals_dict, **snapshot.as_dict()}
@@ -116,14 +116,14 @@ async def compare_algorithms(globals_dict=Depends(get_globals_dict)):
             
             if all([stacking_reg, scaler, model_features]):
                 # 기본 추천 생성
-                basic_result = json.loads(generate_recommendations(
+                basic_result = generate_recommendations(
                     df_model.copy(),
                     stacking_reg,
                     model_features,
                     user_id,
                     scaler,
                     user_features=user_features_df
-                ))
+                ).model_dump()
                 
                 # 하이브리드 추천 생성
                 hybrid_result = generate_hybrid_recommendations(
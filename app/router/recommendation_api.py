@@ -2,20 +2,34 @@
 
 import os
 import time
-import json
+import asyncio
 import logging
-import pandas as pd
-from fastapi import APIRouter, HTTPException, BackgroundTasks
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Query, Response
+from fastapi.responses import StreamingResponse
 from app.config import RESTAURANTS_DIR, USER_DIR, FEEDBACK_DIR
-from app.schema.recommendation_schema import UserData, RecommendationItem, CATEGORY_MAPPING
-from app.services.preprocess.restaurant.data_loader import load_restaurant_json_files, load_user_json_files
-from app.services.preprocess.restaurant.preprocessor import preprocess_data
-from app.services.model_trainer import train_model
-from app.services.model_trainer.recommenation.basic import generate_recommendations
-from app.services.preprocess.user.user_preprocess import user_preprocess_data  # 사용자 데이터 전처리 모듈 추가
+from app.setting import (
+    RECOMMEND_TOP_K, RECOMMEND_MAX_TOP_K, RECOMMEND_RETRY_AFTER,
+    RECOMMEND_BATCH_CHUNK_SIZE, RECOMMEND_BATCH_MAX_USERS
+)
+from app.schema.recommendation_schema import (
+    UserData, RecommendationResponse,
+    RecommendationBatchError, RecommendationBatchResponse, CATEGORY_MAPPING
+)
+from app.services.preprocess.restaurant.data_loader import load_user_json_files
+from app.services.preprocess.restaurant.pipeline import load_training_data
+from app.services.model_trainer import load_or_train_model
+from app.services.model_trainer.recommenation.basic import rank_recommendations_batch
+from app.services.model_trainer.recommenation.score_table import RestaurantScoreTable
+from app.services.preprocess.user.user_preprocess import load_user_features  # 사용자 데이터 전처리 모듈 추가
+from app.services.preprocess.user.user_feature_store import UserFeatureStore
+from app.services.recommend_executor import get_recommend_executor, ExecutorSaturatedError
+from app.services.recommend_batcher import get_recommend_batcher
+from app.services.recommend_cache import get_recommend_cache
 from app.services.evaluation.evaluator import evaluate_recommendation_model
-from app.services.model_trainer import train_model, optimize_recommendation_parameters 
-from app.dependencies import globals_dict, model_initializing, last_initialization_attempt
+from app.dependencies import (
+    ModelSnapshot, get_model_snapshot, swap_model_snapshot, make_model_version,
+    model_initializing, last_initialization_attempt
+)
 from typing import List, Dict, Any
 from datetime import datetime
 
@@ -24,8 +38,17 @@ logger = logging.getLogger("recommendation_api")
 router = APIRouter()
 
 # 초기 데이터 로딩 및 모델 학습
-def initialize_model(force=False):
-    global globals_dict, model_initializing, last_initialization_attempt
+def initialize_model(force=False, retrain=False, full_search=False, rebuild=False):
+    """
+    데이터를 로드해 모델 스냅샷을 게시
+
+    Args:
+        force: 초기화가 진행 중이어도 실행하고 사용자 특성을 다시 계산할지 여부
+        retrain: 입력 데이터가 같아도 저장된 모델 아티팩트를 무시하고 다시 학습할지 여부
+        full_search: 캐시된 하이퍼파라미터를 쓰지 않고 모든 모델을 전체 탐색할지 여부 (retrain 포함)
+        rebuild: 데이터 파이프라인 단계 캐시를 무시하고 로드/전처리를 다시 계산할지 여부
+    """
+    global model_initializing, last_initialization_attempt
     
     # 이미 초기화 중이면 중복 실행 방지
     if model_initializing and not force:
@@ -56,14 +79,14 @@ def initialize_model(force=False):
             model_initializing = False
             return False
         
-        # 식당 데이터 로드
-        df_raw = load_restaurant_json_files(str(RESTAURANTS_DIR))
-        if df_raw.empty:
+        # 식당 데이터 로드 및 전처리 (입력 파일과 코드가 같으면 단계 캐시 사용)
+        df_final = load_training_data(str(RESTAURANTS_DIR), force_rebuild=rebuild)
+        if df_final.empty:
             logger.error("식당 데이터가 비어 있습니다.")
             model_initializing = False
             return False
             
-        logger.info(f"식당 데이터 로드 완료: {len(df_raw)}개 식당")
+        logger.info(f"식당 데이터 로드 완료: {len(df_final)}개 식당")
         
         # 사용자 데이터 로드 및 전처리
         user_data_frames = load_user_json_files(str(USER_DIR))
@@ -73,54 +96,45 @@ def initialize_model(force=False):
         else:
             logger.info(f"사용자 데이터 로드 완료: {len(user_data_frames)}개 파일")
         
-        # 사용자 데이터 전처리 및 특성 추출 부분 수정
+        # 사용자 데이터 전처리 및 특성 추출
         try:
-            # 전처리된 사용자 특성 파일 경로
-            user_features_path = os.path.join(str(USER_DIR), "preprocessed_user_features.csv")
-            
-            # 이미 전처리된 파일이 있고 강제 초기화가 아니면 기존 파일 사용
-            if os.path.exists(user_features_path) and not force:
-                logger.info(f"기존 전처리된 사용자 특성 파일 로드: {user_features_path}")
-                user_features_df = pd.read_csv(user_features_path)
-            else:
-                # 사용자 데이터 파일 경로 리스트 생성
-                logger.info("사용자 데이터 전처리 시작")
-                user_json_files = [
-                    os.path.join(str(USER_DIR), f) for f in os.listdir(str(USER_DIR))
-                    if f.endswith('.json') and not f.startswith('.')  # 숨김 파일 제외
-                ]
-                
-                # 파일 경로 로깅
-                logger.info(f"처리할 사용자 데이터 파일: {len(user_json_files)}개")
-                for file in user_json_files[:5]:  # 첫 5개만 로깅
-                    logger.debug(f"- {os.path.basename(file)}")
-                
-                # 파일 경로 리스트를 전달하여 전처리 수행
-                user_features_df = user_preprocess_data(
-                    user_json_files,  # 파일 경로 리스트 전달
-                    save_path=user_features_path
-                )
-                logger.info(f"사용자 데이터 전처리 완료: {len(user_features_df)}명의 사용자 데이터")
-            
-            # 전역 변수에 사용자 특성 데이터 저장
-            globals_dict["user_features_df"] = user_features_df
+            user_features_df = load_user_features(USER_DIR, force=force)
+            user_feature_store = UserFeatureStore.from_dataframe(user_features_df)
         except Exception as user_err:
             logger.error(f"사용자 데이터 전처리 중 오류 발생: {user_err}", exc_info=True)
             # 오류가 발생해도 계속 진행 (기본 추천은 가능하도록)
-            globals_dict["user_features_df"] = None
-        
-        # 식당 데이터 전처리
-        df_final = preprocess_data(df_raw)
+            user_features_df = None
+            user_feature_store = None
         
-        # 모델 학습
-        model_dict = train_model(df_final)
+        # 입력 데이터 해시가 같은 저장된 모델이 있으면 학습 없이 로드, 없으면 학습 후 저장
+        model_dict, artifact_version = load_or_train_model(df_final, force_retrain=retrain, full_search=full_search)
         
-        # 모델 관련 객체 저장
-        globals_dict.update(model_dict)
+        # 사용자와 무관한 식당별 점수를 미리 계산 (요청 시에는 사용자별 보너스만 적용)
+        # 추론 전용 모델로 변환되었으면 그것을 사용
+        score_table = RestaurantScoreTable.build(
+            model_dict["df_model"],
+            model_dict.get("inference_model") or model_dict["stacking_reg"],
+            model_dict["model_features"],
+            model_dict["scaler"]
+        )
         
-        # 원본 사용자 데이터 저장 (필요시)
-        globals_dict["user_data_frames"] = user_data_frames
-        globals_dict["last_update"] = datetime.now()
+        # 새 스냅샷을 완성한 뒤 참조 교체로 게시 (진행 중인 요청은 이전 스냅샷을 계속 사용)
+        # 모델 버전은 아티팩트 버전 + 사용자 특성 해시이므로, 바뀌면 이전 추천 캐시 항목은 더 이상 조회되지 않음
+        swap_model_snapshot(ModelSnapshot(
+            scaler=model_dict["scaler"],
+            stacking_reg=model_dict["stacking_reg"],
+            inference_model=model_dict.get("inference_model"),
+            model_features=model_dict["model_features"],
+            df_model=model_dict["df_model"],
+            score_table=score_table,
+            user_features_df=user_features_df,
+            user_feature_store=user_feature_store,
+            user_data_frames=user_data_frames,  # 원본 사용자 데이터 저장 (필요시)
+            model_version=make_model_version(artifact_version, user_features_df),
+            artifact_version=artifact_version,
+            training_report=model_dict.get("training_report"),
+            last_update=datetime.now()
+        ))
         
         logger.info("모델 초기화 성공")
         # 초기화 완료 상태로 설정
@@ -128,16 +142,24 @@ def initialize_model(force=False):
         return True
     except Exception as e:
         logger.error(f"모델 초기화 중 오류 발생: {e}", exc_info=True)
-        globals_dict = {}
+        # 실패해도 이전 스냅샷은 그대로 유지하여 계속 서비스
         # 초기화 실패 상태로 설정
         model_initializing = False
         return False
 
 # 모델 재초기화 엔드포인트 추가 (관리자용)
 @router.post("/reload", response_model=Dict[str, str])
-async def reload_model(force: bool = True):
-    """모델을 강제로 다시 로드합니다. 관리자 전용 API입니다."""
-    result = initialize_model(force=force)
+async def reload_model(force: bool = True, retrain: bool = False, full_search: bool = False, rebuild: bool = False):
+    """모델을 강제로 다시 로드합니다. 관리자 전용 API입니다.
+
+    retrain=true이면 입력 데이터가 같아도 저장된 모델 아티팩트를 쓰지 않고 다시 학습합니다.
+    full_search=true이면 캐시된 하이퍼파라미터도 쓰지 않고 모든 모델을 다시 탐색합니다.
+    rebuild=true이면 데이터 파이프라인 단계 캐시를 쓰지 않고 로드/전처리를 다시 계산합니다.
+    """
+    # 학습은 오래 걸리므로 이벤트 루프를 막지 않도록 별도 스레드에서 실행
+    result = await asyncio.get_running_loop().run_in_executor(
+        None, initialize_model, force, retrain, full_search, rebuild
+    )
     
     if result:
         return {"status": "success", "message": "모델 재초기화가 완료되었습니다."}
@@ -151,35 +173,45 @@ async def reload_model(force: bool = True):
 @router.get("/status", response_model=Dict[str, Any])
 async def check_model_status():
     """현재 모델의 초기화 상태를 확인합니다."""
-    global globals_dict, model_initializing, last_initialization_attempt
+    global model_initializing, last_initialization_attempt
     
-    is_initialized = "stacking_reg" in globals_dict and "df_model" in globals_dict
+    snapshot = get_model_snapshot()
+    is_initialized = snapshot is not None
     
     status = {
         "initialized": is_initialized,
         "initializing": model_initializing,
         "last_attempt": last_initialization_attempt.isoformat() if last_initialization_attempt else None,
-        "last_update": globals_dict.get("last_update").isoformat() if globals_dict.get("last_update") else None
+        "last_update": snapshot.last_update.isoformat() if is_initialized and snapshot.last_update else None
     }
     
     if is_initialized:
         # 기본 모델 통계 추가
         status.update({
-            "restaurant_count": len(globals_dict.get("df_model", [])),
-            "user_count": len(globals_dict.get("user_features_df", [])) if globals_dict.get("user_features_df") is not None else 0
+            "restaurant_count": len(snapshot.df_model),
+            "user_count": len(snapshot.user_features_df) if snapshot.user_features_df is not None else 0
         })
     
+    # 추천 작업자 풀 상태
+    status["executor"] = get_recommend_executor().stats()
+    status["batcher"] = get_recommend_batcher().stats()
+    
+    # 추천 결과 캐시 상태
+    status["model_version"] = snapshot.model_version if is_initialized else None
+    status["artifact_version"] = snapshot.artifact_version if is_initialized else None
+    status["training_report"] = snapshot.training_report if is_initialized else None
+    status["cache"] = get_recommend_cache().stats()
+    
     return status
 
 # 평가 지표 확인 엔드포인트 추가
 @router.get("/evaluate", response_model=Dict[str, Any])
 async def evaluate_model():
     """현재 추천 모델의 성능 지표를 계산합니다."""
-    global globals_dict, model_initializing
-    
     try:
         # 모델 초기화 상태 확인
-        if not globals_dict or "stacking_reg" not in globals_dict or "df_model" not in globals_dict:
+        snapshot = get_model_snapshot()
+        if snapshot is None:
             raise HTTPException(
                 status_code=503, 
                 detail="모델이 초기화되지 않았습니다. 먼저 모델을 초기화하세요.",
@@ -187,7 +219,7 @@ async def evaluate_model():
             )
         
         # 모델 평가
-        metrics = evaluate_recommendation_model(globals_dict)
+        metrics = evaluate_recommendation_model(snapshot.as_dict())
         
         return metrics
     
@@ -197,42 +229,57 @@ async def evaluate_model():
         logger.error(f"모델 평가 중 오류 발생: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
+async def _ensure_model_ready() -> ModelSnapshot:
+    """
+    추천에 필요한 모델 스냅샷을 반환합니다. 아직 없고 초기화에 실패한 상태라면 다시 초기화를 시도합니다.
+    요청은 여기서 받은 스냅샷 하나만 끝까지 사용합니다.
+    """
+    global model_initializing
+    
+    snapshot = get_model_snapshot()
+    if snapshot is None:
+        # 모델이 초기화 중인지, 아니면 초기화에 실패했는지 구분
+        if model_initializing:
+            raise HTTPException(
+                status_code=503, 
+                detail="모델 초기화가 진행 중입니다. 잠시 후 다시 시도해주세요.",
+                headers={"Retry-After": "30"}  # 30초 후 재시도 권장
+            )
+        else:
+            # 초기화 실패했다면 자동으로 다시 시도
+            logger.info("모델이 초기화되지 않았습니다. 자동으로 초기화를 시도합니다.")
+            initialize_result = await asyncio.get_running_loop().run_in_executor(None, initialize_model)
+            
+            if not initialize_result:
+                # 다시 시도해도 실패한 경우
+                raise HTTPException(
+                    status_code=503, 
+                    detail="모델 데이터가 초기화되지 않았습니다. 서버 관리자에게 문의하세요.",
+                    headers={"Retry-After": "300"}  # 5분 후 재시도 권장
+                )
+            # 초기화 성공했다면 계속 진행
+            snapshot = get_model_snapshot()
+    
+    return snapshot
+
 # recommend 함수 내부 수정
 @router.post("",
-             response_model=Dict[str, Any],
+             response_model=RecommendationResponse,
              responses={
                  200: {"description": "Success"},
                  400: {"description": "Bad Request"},
-                 503: {"description": "Service Unavailable - Model not initialized yet"}
+                 503: {"description": "Service Unavailable - Model not initialized yet or worker pool saturated"}
              })
 
-async def recommend(user_data: UserData, background_tasks: BackgroundTasks):
+async def recommend(
+    user_data: UserData,
+    background_tasks: BackgroundTasks,
+    k: int = Query(RECOMMEND_TOP_K, ge=1, le=RECOMMEND_MAX_TOP_K, description="추천할 식당 수")
+):
     """사용자 데이터를 받아 개인화된 추천 결과를 생성하고, 결과를 파일로 저장합니다."""
-    global model_initializing, globals_dict
-    
     try:
-        # 모델 초기화 상태 확인
-        if not globals_dict or "stacking_reg" not in globals_dict or "df_model" not in globals_dict:
-            # 모델이 초기화 중인지, 아니면 초기화에 실패했는지 구분
-            if model_initializing:
-                raise HTTPException(
-                    status_code=503, 
-                    detail="모델 초기화가 진행 중입니다. 잠시 후 다시 시도해주세요.",
-                    headers={"Retry-After": "30"}  # 30초 후 재시도 권장
-                )
-            else:
-                # 초기화 실패했다면 자동으로 다시 시도
-                logger.info("모델이 초기화되지 않았습니다. 자동으로 초기화를 시도합니다.")
-                initialize_result = initialize_model()
-                
-                if not initialize_result:
-                    # 다시 시도해도 실패한 경우
-                    raise HTTPException(
-                        status_code=503, 
-                        detail="모델 데이터가 초기화되지 않았습니다. 서버 관리자에게 문의하세요.",
-                        headers={"Retry-After": "300"}  # 5분 후 재시도 권장
-                    )
-                # 초기화 성공했다면 계속 진행
+        # 모델 스냅샷 확보 (초기화 실패 시 자동 재시도)
+        snapshot = await _ensure_model_ready()
 
         user_id = user_data.user_id
         preferred_categories = user_data.preferred_categories
@@ -246,25 +293,42 @@ async def recommend(user_data: UserData, background_tasks: BackgroundTasks):
         if not preferred_ids:
             raise HTTPException(status_code=400, detail="유효한 선호 카테고리를 입력해주세요.")
         
-        df_model = globals_dict.get("df_model")
+        score_table = snapshot.score_table
         
-        # 사용자가 선호하는 카테고리의 식당만 필터링
-        filtered_df = df_model[df_model["category_id"].isin(preferred_ids)].copy()
-        if filtered_df.empty:
+        # 사용자가 선호하는 카테고리의 식당이 있는지 확인
+        if score_table.count_rows(preferred_ids) == 0:
             raise HTTPException(status_code=400, detail="해당 선호 카테고리에 해당하는 식당 데이터가 없습니다.")
         
-        # 전처리된 사용자 특성 데이터 가져오기
-        user_features_df = globals_dict.get("user_features_df")
+        # 사용자 특성 저장소 가져오기
+        user_store = snapshot.user_feature_store
         
-        # 추천 결과 생성 (개인화된 추천)
-        result_json = generate_recommendations(
-            filtered_df, 
-            globals_dict["stacking_reg"], 
-            globals_dict["model_features"], 
-            user_id,
-            globals_dict["scaler"],
-            user_features=user_features_df  # 사용자 특성 데이터 전달 (없으면 None)
-        )
+        # 같은 모델 버전에서 같은 요청의 결과가 캐시되어 있으면 그대로 반환
+        model_version = snapshot.model_version
+        cache = get_recommend_cache()
+        result = None
+        result_json = cache.get(model_version, user_id, preferred_ids, k)
+        
+        if result_json is None:
+            # 추천 결과 생성 (미리 계산된 점수 테이블에 개인화 보너스 적용)
+            # 동시에 들어온 요청은 마이크로 배치로 묶어 제한된 작업자 풀에서 한 번에 계산하고, 포화 시 503으로 응답
+            try:
+                result = await get_recommend_batcher().submit(
+                    score_table,
+                    user_store,  # 사용자 특성 저장소 전달 (없으면 None)
+                    user_id,
+                    preferred_ids,
+                    k
+                )
+            except ExecutorSaturatedError as e:
+                raise HTTPException(
+                    status_code=503,
+                    detail=str(e),
+                    headers={"Retry-After": str(RECOMMEND_RETRY_AFTER)}
+                )
+            
+            # 추천 결과 객체를 한 번만 직렬화하여 캐시에 저장
+            result_json = result.model_dump_json()
+            cache.set(model_version, user_id, preferred_ids, k, result_json)
         
         # 백그라운드 작업으로 추천 결과 저장
         async def save_recommendation():
@@ -273,9 +337,12 @@ async def recommend(user_data: UserData, background_tasks: BackgroundTasks):
                 feedback_filename = f"recommendation_{user_id}_{timestamp}.json"
                 feedback_filepath = os.path.join(str(FEEDBACK_DIR), feedback_filename)
                 
+                # 캐시 적중 시에는 캐시된 결과를 다시 읽어 같은 형식으로 저장
+                feedback = result if result is not None else RecommendationResponse.model_validate_json(result_json)
+                
                 # 디렉토리는 이미 config에서 생성됨
                 with open(feedback_filepath, "w", encoding="utf-8") as f:
-                    f.write(result_json)
+                    f.write(feedback.model_dump_json(indent=4))
                 logger.info(f"추천 결과가 {feedback_filepath}에 저장되었습니다.")
             except Exception as file_err:
                 logger.error(f"추천 결과 저장 실패: {file_err}", exc_info=True)
@@ -283,13 +350,121 @@ async def recommend(user_data: UserData, background_tasks: BackgroundTasks):
         # 백그라운드 작업으로 추가
         background_tasks.add_task(save_recommendation)
 
-        # JSON 문자열을 Python 객체로 변환하여 반환
-        result_data = json.loads(result_json)
-        return result_data
+        # 직렬화된 추천 결과를 그대로 반환
+        return Response(content=result_json, media_type="application/json")
     
     except HTTPException:
         # 이미 생성된 HTTPException은 그대로 다시 발생시킴
         raise
     except Exception as e:
         logger.error(f"추천 API 처리 중 오류 발생: {e}", exc_info=True)
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+async def _stream_batch_results(score_table, user_store, requests: list, errors: list, model_version):
+    """배치 추천 결과를 청크 단위로 계산하면서 NDJSON 한 줄씩 내보냅니다."""
+    executor = get_recommend_executor()
+    cache = get_recommend_cache()
+    for start in range(0, len(requests), RECOMMEND_BATCH_CHUNK_SIZE):
+        chunk = requests[start:start + RECOMMEND_BATCH_CHUNK_SIZE]
+        try:
+            results = await executor.run(rank_recommendations_batch, score_table, chunk, user_store)
+        except ExecutorSaturatedError as e:
+            results = [e] * len(chunk)
+        
+        for (user_id, category_ids, k), result in zip(chunk, results):
+            if isinstance(result, Exception):
+                yield RecommendationBatchError(user=user_id, detail=str(result)).model_dump_json() + "\n"
+            else:
+                result_json = result.model_dump_json()
+                cache.set(model_version, user_id, category_ids, k, result_json)
+                yield result_json + "\n"
+    
+    for error in errors:
+        yield error.model_dump_json() + "\n"
+
+@router.post("/batch",
+             response_model=RecommendationBatchResponse,
+             responses={
+                 200: {"description": "Success (stream=true이면 사용자별 결과를 한 줄씩 담은 application/x-ndjson)"},
+                 400: {"description": "Bad Request"},
+                 503: {"description": "Service Unavailable - Model not initialized yet or worker pool saturated"}
+             })
+async def recommend_batch(
+    user_data_list: List[UserData],
+    k: int = Query(RECOMMEND_TOP_K, ge=1, le=RECOMMEND_MAX_TOP_K, description="사용자별 추천할 식당 수"),
+    stream: bool = Query(False, description="NDJSON 스트리밍 응답 여부 (대량 배치용)")
+):
+    """여러 사용자의 추천 결과를 한 번에 생성합니다. (홈 피드 사전 생성용)"""
+    try:
+        # 모델 스냅샷 확보 (초기화 실패 시 자동 재시도)
+        snapshot = await _ensure_model_ready()
+        
+        if not user_data_list:
+            raise HTTPException(status_code=400, detail="추천할 사용자 목록을 입력해주세요.")
+        if len(user_data_list) > RECOMMEND_BATCH_MAX_USERS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"한 번에 요청할 수 있는 사용자는 최대 {RECOMMEND_BATCH_MAX_USERS}명입니다."
+            )
+        
+        score_table = snapshot.score_table
+        user_store = snapshot.user_feature_store
+        model_version = snapshot.model_version
+        
+        # 사용자별 선호 카테고리 변환 (유효하지 않은 사용자는 오류 목록으로 분리)
+        requests, errors = [], []
+        for user_data in user_data_list:
+            preferred_ids = [CATEGORY_MAPPING.get(cat) for cat in user_data.preferred_categories if cat in CATEGORY_MAPPING]
+            if not user_data.user_id or not preferred_ids:
+                errors.append(RecommendationBatchError(user=user_data.user_id, detail="유효한 선호 카테고리를 입력해주세요."))
+            elif score_table.count_rows(preferred_ids) == 0:
+                errors.append(RecommendationBatchError(user=user_data.user_id, detail="해당 선호 카테고리에 해당하는 식당 데이터가 없습니다."))
+            else:
+                requests.append((user_data.user_id, preferred_ids, k))
+        
+        executor = get_recommend_executor()
+        if executor.saturated:
+            raise HTTPException(
+                status_code=503,
+                detail="추천 요청이 많아 처리할 수 없습니다.",
+                headers={"Retry-After": str(RECOMMEND_RETRY_AFTER)}
+            )
+        
+        # 대량 배치는 청크 단위로 계산하며 바로 스트리밍
+        if stream:
+            return StreamingResponse(
+                _stream_batch_results(score_table, user_store, requests, errors, model_version),
+                media_type="application/x-ndjson"
+            )
+        
+        # 사용자 × 후보 식당 행렬 연산으로 전체 사용자 추천 생성
+        try:
+            results = await executor.run(rank_recommendations_batch, score_table, requests, user_store)
+        except ExecutorSaturatedError as e:
+            raise HTTPException(
+                status_code=503,
+                detail=str(e),
+                headers={"Retry-After": str(RECOMMEND_RETRY_AFTER)}
+            )
+        
+        # 결과는 추천 캐시에도 저장 (홈 피드 사전 생성 후 /recommend 요청이 캐시에서 응답되도록)
+        cache = get_recommend_cache()
+        recommendations = []
+        for (user_id, category_ids, _), result in zip(requests, results):
+            if isinstance(result, Exception):
+                errors.append(RecommendationBatchError(user=user_id, detail=str(result)))
+            else:
+                recommendations.append(result)
+                if cache.enabled:
+                    cache.set(model_version, user_id, category_ids, k, result.model_dump_json())
+        
+        response = RecommendationBatchResponse.model_construct(results=recommendations, errors=errors)
+        return Response(content=response.model_dump_json(), media_type="application/json")
+    
+    except HTTPException:
+        # 이미 생성된 HTTPException은 그대로 다시 발생시킴
+        raise
+    except Exception as e:
+        logger.error(f"배치 추천 API 처리 중 오류 발생: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
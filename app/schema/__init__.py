@@ -1,8 +1,17 @@
 # schemas/__init__.py
 
-from .recommendation_schema import RecommendationItem, UserData
+from .recommendation_schema import (
+    RecommendationItem,
+    RecommendationResponse,
+    RecommendationBatchError,
+    RecommendationBatchResponse,
+    UserData,
+)
 
 __all__ = [
     "RecommendationItem",
+    "RecommendationResponse",
+    "RecommendationBatchError",
+    "RecommendationBatchResponse",
     "UserData",
 ]
\ No newline at end of file
@@ -1,7 +1,7 @@
 # app/models/recommendation_schema.py
 
 from pydantic import BaseModel, Field
-from typing import Dict, Any, List, Optional, Annotated
+from typing import Dict, Any, List, Optional, Annotated, Union
 
 class RecommendationItem(BaseModel):
     category_id: int
@@ -10,6 +10,19 @@ class RecommendationItem(BaseModel):
     predicted_score: float
     composite_score: float
 
+class RecommendationResponse(BaseModel):
+    user: Union[int, str]
+    is_new_user: bool
+    recommendations: List[RecommendationItem]
+
+class RecommendationBatchError(BaseModel):
+    user: Union[int, str]
+    detail: str
+
+class RecommendationBatchResponse(BaseModel):
+    results: List[RecommendationResponse]
+    errors: List[RecommendationBatchError] = []
+
 # 카테고리 매핑 참고용 (선택 사항)
 CATEGORY_MAPPING = {
     "중식": 1,
@@ -0,0 +1,283 @@
+# app/services/columnar_snapshot.py
+# 동기화한 컬렉션의 Arrow IPC 스냅샷 (명시적 스키마, 메모리 맵 읽기)
+
+import os
+import json
+import logging
+import threading
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+
+from app.setting import COLUMNAR_SNAPSHOT_ENABLED
+
+# pyarrow가 없으면 JSON 파일만 사용
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+    has_pyarrow = True
+except ImportError:
+    has_pyarrow = False
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_SUFFIX = ".arrow"
+
+# RecordBatch 하나에 담을 행 수
+SNAPSHOT_BATCH_ROWS = 1024
+
+# 스냅샷 형식 버전 (형식이 바뀌면 이전 스냅샷은 읽지 않고 JSON 파일 사용)
+SNAPSHOT_VERSION = "2"
+
+# 컬렉션별 스키마 (필드 이름, 타입)
+# 로드한 DataFrame이 JSON 파일로 만든 것과 같도록(값과 dtype, 학습 데이터 해시 포함) 숫자는 JSON 로드 결과와 같은 64비트 타입을 사용합니다.
+# "json" 타입은 값마다 타입이 다른 필드로, 값을 JSON 문자열로 저장했다가 읽을 때 원래 값으로 복원합니다.
+SNAPSHOT_SCHEMAS = {
+    "restaurants": [
+        ("db_category_id", "int64"),
+        ("restaurant_id", "int64"),
+        ("name", "string"),
+        ("category_id", "string"),
+        ("score", "float64"),
+        ("review", "json"),  # 570 같은 숫자와 "1,079" 같은 문자열이 섞여 있음
+        ("address", "string"),
+        ("operating_hour", "string"),
+        ("expanded_days", "string"),
+        ("time_range", "string"),
+        ("phone_number", "float64"),
+        ("image_urls", "string"),
+        ("convenience", "string"),
+        ("caution", "string"),
+        ("is_deleted", "bool_"),
+    ],
+    "user_preferences": [
+        ("user_id", "int64"),
+        ("min_price", "int64"),
+        ("max_price", "int64"),
+    ],
+    "likes": [
+        ("user_id", "int64"),
+        ("restaurant_id", "int64"),
+    ],
+    "reservations": [
+        ("user_id", "int64"),
+        ("restaurant_id", "int64"),
+        ("status", "string"),
+        ("reservation_time_id", "int64"),
+        ("reservation_date", "string"),
+        ("seat_type_id", "int64"),
+    ],
+}
+
+# 타입별로 허용하는 값의 Python 타입과, JSON으로 만든 DataFrame이 같은 dtype이 되려면 적어도 하나 있어야 하는 타입
+# (예: float64 열이 정수만 있으면 JSON 경로는 int64가 되므로 스냅샷을 만들지 않음)
+_ALLOWED_TYPES = {
+    "int64": ({int, type(None)}, {int}),
+    "float64": ({float, int, type(None)}, {float}),
+    "string": ({str, type(None)}, {str}),
+    "bool_": ({bool, type(None)}, {bool}),
+}
+
+
+def _arrow_field(name, type_name):
+    if type_name == "json":
+        return pa.field(name, pa.string(), metadata={"encoding": "json"})
+    return pa.field(name, getattr(pa, type_name)())
+
+
+def snapshot_path(json_path) -> Path:
+    """JSON 파일과 같은 이름의 스냅샷 경로"""
+    return Path(json_path).with_suffix(SNAPSHOT_SUFFIX)
+
+
+class SnapshotWriter:
+    """
+    문서를 받아 RecordBatch 단위로 Arrow IPC 파일에 쓰는 스냅샷 작성기
+
+    스키마에 없는 필드가 있거나, 값의 타입 때문에 JSON 파일로 만든 DataFrame과 값 또는 dtype이 달라지는 경우
+    (예: 숫자 필드의 문자열 값, 정수만 있는 float64 필드) 스냅샷을 포기하고(JSON 파일만 사용) 기록만 남깁니다.
+    """
+
+    def __init__(self, path, fields, batch_rows=SNAPSHOT_BATCH_ROWS):
+        self.path = Path(path)
+        self.schema = pa.schema([_arrow_field(name, type_name) for name, type_name in fields],
+                                metadata={"snapshot_version": SNAPSHOT_VERSION})
+        self.batch_rows = batch_rows
+        self.tmp_path = self.path.with_name(f".{self.path.name}.tmp-{os.getpid()}-{threading.get_ident()}")
+        self.failed = False
+        self.count = 0
+        self._types = dict(fields)
+        self._seen = {name: set() for name, _ in fields}  # 필드별로 나온 값의 Python 타입
+        self._columns = []  # 처음 나온 순서 (JSON에서 만든 DataFrame의 컬럼 순서와 같게 유지)
+        self._rows = []
+        self._writer = None
+
+    def _convert(self, document):
+        row = {}
+        for key, value in document.items():
+            type_name = self._types[key]
+            if type_name == "json":
+                row[key] = None if value is None else json.dumps(value, ensure_ascii=False)
+                continue
+            allowed, _ = _ALLOWED_TYPES[type_name]
+            if type(value) not in allowed:
+                raise ValueError(f"{key} 필드의 {type(value).__name__} 값 {value!r}")
+            self._seen[key].add(type(value))
+            row[key] = value
+        return row
+
+    def _check_dtypes(self):
+        """JSON 경로의 DataFrame과 dtype이 같아지는지 확인 (열 전체를 본 뒤에만 알 수 있음)"""
+        for key in self._columns:
+            type_name = self._types[key]
+            if type_name == "json":
+                continue
+            _, required = _ALLOWED_TYPES[type_name]
+            # float64 열은 결측값이 있으면 정수만 있어도 JSON 경로에서 float64가 됨
+            if type_name == "float64" and type(None) in self._seen[key]:
+                required = {float, int}
+            if not self._seen[key] & required:
+                raise ValueError(f"{key} 필드의 값 타입 {sorted(t.__name__ for t in self._seen[key])}")
+
+    def _fail(self, e):
+        self.failed = True
+        self._rows = []
+        logger.info(f"{self.path.name} 스냅샷을 만들지 않고 JSON 파일만 사용합니다: {e}")
+
+    def _flush(self):
+        if not self._rows:
+            return
+        batch = pa.RecordBatch.from_pylist(self._rows, schema=self.schema)
+        if self._writer is None:
+            self._writer = pa.ipc.new_file(str(self.tmp_path), self.schema)
+        self._writer.write_batch(batch)
+        self._rows = []
+
+    def add(self, document):
+        """JSON으로 저장할 형태로 변환된 문서 추가"""
+        if self.failed:
+            return
+        try:
+            for key in document:
+                if key not in self._columns:
+                    if self.schema.get_field_index(key) < 0:
+                        raise ValueError(f"스키마에 없는 필드 {key}")
+                    self._columns.append(key)
+            self._rows.append(self._convert(document))
+            self.count += 1
+            if len(self._rows) >= self.batch_rows:
+                self._flush()
+        except Exception as e:
+            self._fail(e)
+
+    def commit(self) -> bool:
+        """
+        스냅샷 파일 완성 (JSON 파일을 저장한 뒤 호출해야 스냅샷이 더 최신으로 인식됨)
+
+        Returns:
+            bool: 스냅샷 저장 여부
+        """
+        try:
+            if not self.failed:
+                try:
+                    self._check_dtypes()
+                    self._flush()
+                except ValueError as e:
+                    self._fail(e)
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+            if self.failed or self.count == 0:
+                return False
+
+            if self._columns != self.schema.names:
+                # 문서에 없는 필드는 빼고, 컬럼 순서는 문서에 처음 나온 순서로 다시 저장
+                with pa.memory_map(str(self.tmp_path)) as source:
+                    table = pa.ipc.open_file(source).read_all().select(self._columns).replace_schema_metadata(
+                        self.schema.metadata)
+                rewrite_path = self.tmp_path.with_name(self.tmp_path.name + "-select")
+                with pa.ipc.new_file(str(rewrite_path), table.schema) as writer:
+                    writer.write_table(table, max_chunksize=self.batch_rows)
+                os.replace(rewrite_path, self.tmp_path)
+
+            os.replace(self.tmp_path, self.path)
+            return True
+        except Exception as e:
+            logger.error(f"{self.path.name} 스냅샷 저장 오류: {e}", exc_info=True)
+            return False
+        finally:
+            self.abort()
+
+    def abort(self):
+        """작성 중인 임시 파일 삭제"""
+        if self._writer is not None:
+            try:
+                self._writer.close()
+            except Exception:
+                pass
+            self._writer = None
+        if self.tmp_path.exists():
+            self.tmp_path.unlink()
+
+
+def open_snapshot_writer(collection_name, json_path) -> Optional[SnapshotWriter]:
+    """
+    컬렉션 JSON 파일 옆에 저장할 스냅샷 작성기 생성
+
+    Returns:
+        SnapshotWriter: 스키마가 정의된 컬렉션이고 pyarrow를 쓸 수 있으면 작성기, 아니면 None
+    """
+    fields = SNAPSHOT_SCHEMAS.get(collection_name)
+    if not COLUMNAR_SNAPSHOT_ENABLED or not has_pyarrow or fields is None:
+        return None
+    return SnapshotWriter(snapshot_path(json_path), fields)
+
+
+def read_snapshot_table(json_path):
+    """
+    JSON 파일에 대응하는 스냅샷을 메모리 맵으로 읽기
+
+    스냅샷이 없거나, JSON 파일보다 오래되었거나(다른 경로로 JSON만 다시 저장된 경우),
+    형식 버전이 다르면 None을 반환합니다.
+    """
+    if not COLUMNAR_SNAPSHOT_ENABLED or not has_pyarrow:
+        return None
+    path = snapshot_path(json_path)
+    try:
+        if not path.exists() or path.stat().st_mtime < Path(json_path).stat().st_mtime:
+            return None
+        with pa.memory_map(str(path)) as source:
+            table = pa.ipc.open_file(source).read_all()
+        metadata = table.schema.metadata or {}
+        if metadata.get(b"snapshot_version") != SNAPSHOT_VERSION.encode():
+            logger.info(f"{path.name} 스냅샷 형식이 달라 JSON 파일을 사용합니다.")
+            return None
+        return table
+    except Exception as e:
+        logger.warning(f"{path.name} 스냅샷을 읽을 수 없어 JSON 파일을 사용합니다: {e}")
+        return None
+
+
+def load_snapshot_frame(json_paths) -> Optional[pd.DataFrame]:
+    """
+    JSON 파일 목록에 대응하는 스냅샷들을 합쳐 DataFrame으로 반환
+
+    하나라도 스냅샷이 없으면 JSON 파일과 결과가 섞이지 않도록 None을 반환합니다.
+    """
+    tables = []
+    for json_path in json_paths:
+        table = read_snapshot_table(json_path)
+        if table is None:
+            return None
+        tables.append(table)
+    if not tables:
+        return None
+    table = pa.concat_tables(tables, promote_options="default")
+    df = table.to_pandas()
+    for field in table.schema:
+        if field.metadata and field.metadata.get(b"encoding") == b"json":
+            # 값별 원래 타입을 복원한 뒤 JSON 경로와 같은 방식으로 dtype 추론
+            df[field.name] = pd.Series([None if value is None else json.loads(value)
+                                        for value in table.column(field.name).to_pylist()], index=df.index)
+    return df
@@ -17,7 +17,7 @@ from app.config.mongo_config import (
     MONGO_HOST, MONGO_PORT, MONGO_USER, MONGO_PASSWORD, MONGO_DATABASE, MONGO_COLLECTION,
     USE_SSH_TUNNEL, SSH_HOST, SSH_PORT, SSH_USER, SSH_PASSWORD, SSH_KEY_PATH
 )
-from app.services.mongodb.connection import get_mongodb_connection
+from app.services.mongodb.connection import get_connection_manager
 from app.services.mongodb.data_converter import convert_numpy_types
 
 logger = logging.getLogger("direct_mongodb")
@@ -25,18 +25,8 @@ logger = logging.getLogger("direct_mongodb")
 def get_restaurants_from_mongodb():
     """MongoDB에서 레스토랑 데이터를 직접 가져와 DataFrame으로 반환"""
     try:
-        # MongoDB 연결
-        result = get_mongodb_connection()
-        
-        # SSH 터널링을 사용하는 경우
-        if len(result) == 3:
-            client, db, tunnel = result
-            cleanup_tunnel = True
-        else:
-            client, db = result
-            cleanup_tunnel = False
-        
-        try:
+        # 공유 MongoDB 연결 사용 (사용 후 닫지 않음)
+        with get_connection_manager().borrow() as db:
             # 레스토랑 컬렉션에서 데이터 가져오기
             restaurant_collection = db['restaurants']
             restaurant_data = list(restaurant_collection.find({}, {'_id': 0}))
@@ -50,16 +40,6 @@ def get_restaurants_from_mongodb():
             # DataFrame으로 변환
             df_restaurant = pd.DataFrame(restaurant_data)
             return df_restaurant
-            
-        finally:
-            # MongoDB 연결 종료
-            client.close()
-            logger.info("MongoDB 연결 종료")
-            
-            # SSH 터널이 있는 경우 터널도 종료
-            if cleanup_tunnel:
-                tunnel.stop()
-                logger.info("SSH 터널 종료")
     
     except Exception as e:
         logger.error(f"MongoDB 레스토랑 데이터 가져오기 오류: {str(e)}", exc_info=True)
@@ -68,20 +48,10 @@ def get_restaurants_from_mongodb():
 def get_user_data_from_mongodb():
     """MongoDB에서 사용자 관련 데이터를 직접 가져와 DataFrame 사전으로 반환"""
     try:
-        # MongoDB 연결
-        result = get_mongodb_connection()
-        
-        # SSH 터널링을 사용하는 경우
-        if len(result) == 3:
-            client, db, tunnel = result
-            cleanup_tunnel = True
-        else:
-            client, db = result
-            cleanup_tunnel = False
-        
         user_data_frames = {}
         
-        try:
+        # 공유 MongoDB 연결 사용 (사용 후 닫지 않음)
+        with get_connection_manager().borrow() as db:
             # 1. 사용자 기본 정보
             users_collection = db['users']
             user_data = list(users_collection.find({}, {'_id': 0}))
@@ -135,16 +105,6 @@ def get_user_data_from_mongodb():
                 logger.warning("MongoDB에서 추천 시스템 데이터를 찾을 수 없습니다.")
             
             return user_data_frames
-            
-        finally:
-            # MongoDB 연결 종료
-            client.close()
-            logger.info("MongoDB 연결 종료")
-            
-            # SSH 터널이 있는 경우 터널도 종료
-            if cleanup_tunnel:
-                tunnel.stop()
-                logger.info("SSH 터널 종료")
     
     except Exception as e:
         logger.error(f"MongoDB 사용자 데이터 가져오기 오류: {str(e)}", exc_info=True)
@@ -1,10 +1,10 @@
 # app/services/evaluation/evaluator.py
 
 import logging
-import json
 import pandas as pd
 import numpy as np
 from app.services.model_trainer.recommenation.basic import generate_recommendations
+from app.services.preprocess.user.user_feature_store import as_user_feature_store
 from app.services.evaluation.metrics import calculate_ranking_metrics
 from app.services.evaluation.data_generation import (
     create_test_interactions, 
@@ -40,7 +40,8 @@ def evaluate_recommendation_model(globals_dict, df_model=None, user_features_df=
         # 인자로 전달된 값 우선 사용, 없으면 globals_dict에서 가져오기
         df_model = df_model or globals_dict.get("df_model")
         user_features_df = user_features_df or globals_dict.get("user_features_df")
-        stacking_reg = globals_dict.get("stacking_reg")
+        # 추론 전용으로 변환된 모델이 있으면 사용자별 점수 계산에 그것을 사용
+        stacking_reg = globals_dict.get("inference_model") or globals_dict.get("stacking_reg")
         scaler = globals_dict.get("scaler")
         model_features = globals_dict.get("model_features")
         
@@ -114,30 +115,26 @@ def generate_recommendations_for_users(df_model, stacking_reg, model_features, s
     """
     recommendations_dict = {}
     
+    # 사용자 특성 조회용 저장소는 한 번만 생성
+    user_store = as_user_feature_store(user_features_df)
+    
     for user_id in sample_users:
         try:
             # 추천 결과 생성
             # 주의: user_id가 문자열이면 정수로 변환
             user_id_for_rec = int(user_id) if isinstance(user_id, str) else user_id
             
-            result_json = generate_recommendations(
+            result = generate_recommendations(
                 df_model.copy(), 
                 stacking_reg, 
                 model_features, 
                 user_id_for_rec, 
                 scaler, 
-                user_features=user_features_df
+                user_features=user_store
             )
             
-            # JSON 파싱
-            try:
-                result_data = json.loads(result_json)
-            except json.JSONDecodeError:
-                logger.error(f"JSON 파싱 오류: {result_json[:100]}...")
-                continue
-            
             # 추천 식당 ID 리스트 추출
-            recommended_items = [item.get('restaurant_id') for item in result_data.get('recommendations', [])]
+            recommended_items = [item.restaurant_id for item in result.recommendations]
             
             # ID 타입 일관성 확인
             recommended_items = [int(item) if not isinstance(item, int) else item for item in recommended_items]
@@ -177,7 +174,7 @@ def evaluate_with_cross_validation(globals_dict, n_splits=5, k_values=[5, 10, 15
         
         df_model = globals_dict.get("df_model")
         user_features_df = globals_dict.get("user_features_df")
-        stacking_reg = globals_dict.get("stacking_reg")
+        stacking_reg = globals_dict.get("inference_model") or globals_dict.get("stacking_reg")
         scaler = globals_dict.get("scaler")
         model_features = globals_dict.get("model_features")
         
@@ -5,11 +5,17 @@ import asyncio
 from typing import Dict, Any
 import concurrent.futures
 from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 
 from app.config import RESTAURANTS_DIR, USER_DIR
-from app.services.preprocess.restaurant.data_loader import load_restaurant_json_files, load_user_json_files
+from app.services.preprocess.restaurant.data_loader import load_user_json_files
 from app.services.preprocess.restaurant.preprocessor import preprocess_data
-from app.services.model_trainer import train_model
+from app.services.preprocess.restaurant.pipeline import load_training_data
+from app.services.model_trainer import load_or_train_model
+from app.services.model_trainer.recommenation.score_table import RestaurantScoreTable
+from app.services.preprocess.user.user_preprocess import load_user_features
+from app.services.preprocess.user.user_feature_store import UserFeatureStore
+from app.dependencies import ModelSnapshot, swap_model_snapshot, make_model_version
 from app.services.direct_mongodb import get_restaurants_from_mongodb, get_user_data_from_mongodb
 
 logger = logging.getLogger(__name__)
@@ -53,8 +59,8 @@ async def initialize_model(force_reload=False, use_direct_mongodb=False):
                 # 2. MongoDB에서 직접 사용자 관련 데이터 로드
                 future_user_data = executor.submit(get_user_data_from_mongodb)
             else:
-                # 1. 식당 데이터 로드 (restaurants 디렉토리에서)
-                future_restaurant = executor.submit(load_restaurant_json_files, str(RESTAURANTS_DIR))
+                # 1. 식당 데이터 로드 및 전처리 (restaurants 디렉토리에서, 단계 캐시 사용)
+                future_restaurant = executor.submit(load_training_data, str(RESTAURANTS_DIR))
                 
                 # 2. 사용자 관련 데이터 로드 (user 디렉토리에서)
                 future_user_data = executor.submit(load_user_json_files, str(USER_DIR))
@@ -76,23 +82,62 @@ async def initialize_model(force_reload=False, use_direct_mongodb=False):
                 is_initializing = False
                 return globals_dict
             
-            # 3. 식당 데이터 전처리
-            df_processed = await asyncio.get_event_loop().run_in_executor(
+            # 3. 식당 데이터 전처리 (JSON 파일은 파이프라인에서 이미 전처리됨)
+            if use_direct_mongodb:
+                df_processed = await asyncio.get_event_loop().run_in_executor(
+                    None,
+                    lambda: preprocess_data(df_restaurant)
+                )
+            else:
+                df_processed = df_restaurant
+            
+            # 4. 모델 학습 (입력 데이터 해시가 같은 저장된 모델이 있으면 학습 없이 로드)
+            result_dict, artifact_version = await asyncio.get_event_loop().run_in_executor(
                 None,
-                lambda: preprocess_data(df_restaurant)
+                lambda: load_or_train_model(df_processed)
             )
             
-            # 4. 모델 학습
-            result_dict = await asyncio.get_event_loop().run_in_executor(
+            # 5. 사용자와 무관한 식당별 점수 테이블 생성
+            result_dict["score_table"] = await asyncio.get_event_loop().run_in_executor(
                 None,
-                lambda: train_model(df_processed)
+                lambda: RestaurantScoreTable.build(
+                    result_dict["df_model"],
+                    result_dict.get("inference_model") or result_dict["stacking_reg"],
+                    result_dict["model_features"],
+                    result_dict["scaler"]
+                )
             )
             
-            # 5. 결과 저장
-            globals_dict = result_dict
+            # 6. 사용자 특성 로드 (실패해도 기본 추천은 가능하도록 계속 진행)
+            try:
+                user_features_df = await asyncio.get_event_loop().run_in_executor(
+                    None,
+                    lambda: load_user_features(USER_DIR, force=force_reload)
+                )
+                user_feature_store = UserFeatureStore.from_dataframe(user_features_df)
+            except Exception as user_err:
+                logger.error(f"사용자 데이터 전처리 중 오류: {user_err}", exc_info=True)
+                user_features_df = None
+                user_feature_store = None
             
-            # 6. 사용자 관련 데이터 추가
-            globals_dict["user_data_frames"] = user_data_frames
+            # 결과 저장: 완성된 스냅샷을 API에 게시 (참조 교체)
+            snapshot = ModelSnapshot(
+                scaler=result_dict["scaler"],
+                stacking_reg=result_dict["stacking_reg"],
+                inference_model=result_dict.get("inference_model"),
+                model_features=result_dict["model_features"],
+                df_model=result_dict["df_model"],
+                score_table=result_dict["score_table"],
+                user_features_df=user_features_df,
+                user_feature_store=user_feature_store,
+                user_data_frames=user_data_frames,
+                model_version=make_model_version(artifact_version, user_features_df),
+                artifact_version=artifact_version,
+                training_report=result_dict.get("training_report"),
+                last_update=datetime.now()
+            )
+            swap_model_snapshot(snapshot)
+            globals_dict = snapshot.as_dict()
             
             # 7. 모델 학습 완료 로깅
             logger.info("모델 초기화 완료")
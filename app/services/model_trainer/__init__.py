@@ -3,4 +3,5 @@ from .data_preparation import prepare_data, impute_and_clip, scale_and_split
 from .model_training import train_ridge, train_rf, train_xgb, train_lgb, train_cat, train_mlp, train_stacking
 from .model_evaluation import evaluate_model
 from .train_model import train_model
-from .hyperparameter_tuning import optimize_recommendation_parameters
\ No newline at end of file
+from .hyperparameter_tuning import optimize_recommendation_parameters
+from .artifact_store import load_or_train_model, compute_data_hash, compute_training_signature, save_model_artifact, load_latest_model_artifact, prune_model_artifacts
@@ -0,0 +1,348 @@
+# app/services/model_trainer/artifact_store.py
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, Tuple
+
+import joblib
+import pandas as pd
+import sklearn
+
+from app.setting import MODEL_ARTIFACT_KEEP, IMPUTER_REUSE
+
+logger = logging.getLogger(__name__)
+
+# 저장 형식이나 학습 파이프라인이 바뀌어 이전 아티팩트를 재사용하면 안 되는 경우 올립니다.
+ARTIFACT_FORMAT_VERSION = 2
+MANIFEST_FILE = "manifest.json"
+ARTIFACT_FILES = ("scaler", "stacking_reg", "df_model", "imputer")
+
+# 학습 결과를 바꾸는 설정 (값이 바뀌면 같은 데이터라도 저장된 모델을 재사용하지 않음)
+TRAINING_SETTINGS = (
+    "IMPUTATION_MODE", "IMPUTER_REUSE", "HYPERPARAM_SEARCH_MODE",
+    "MODEL_PRUNING_ENABLED", "MODEL_PRUNING_MIN_GAIN_PER_MS",
+)
+
+
+def _library_versions() -> dict:
+    """아티팩트 호환성 판단에 사용할 라이브러리 버전"""
+    versions = {"sklearn": sklearn.__version__, "pandas": pd.__version__, "joblib": joblib.__version__}
+    for name in ("xgboost", "lightgbm", "catboost"):
+        try:
+            versions[name] = __import__(name).__version__
+        except Exception:
+            versions[name] = None
+    return versions
+
+
+def get_artifact_root() -> Path:
+    """모델 아티팩트 루트 디렉토리 (STORAGE_DIR/models)"""
+    from app.config import STORAGE_DIR
+    return Path(STORAGE_DIR) / "models"
+
+
+def compute_data_hash(df_final: pd.DataFrame) -> str:
+    """
+    학습 입력 데이터의 내용 해시 계산
+
+    컬럼 이름/타입과 행 단위 해시를 함께 사용하므로 값, 컬럼 구성, 행 순서가 같을 때만 같은 해시가 나옵니다.
+
+    Args:
+        df_final: 전처리가 완료된 학습 입력 DataFrame
+
+    Returns:
+        str: sha256 16진수 문자열
+    """
+    digest = hashlib.sha256()
+    digest.update(f"format={ARTIFACT_FORMAT_VERSION}".encode("utf-8"))
+    digest.update(json.dumps([[str(c), str(t)] for c, t in df_final.dtypes.items()], ensure_ascii=False).encode("utf-8"))
+    try:
+        row_hashes = pd.util.hash_pandas_object(df_final, index=True)
+    except TypeError:
+        # 리스트/딕셔너리 등 해시할 수 없는 값이 있으면 문자열로 변환해 계산
+        row_hashes = pd.util.hash_pandas_object(df_final.astype(str), index=True)
+    digest.update(row_hashes.to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def compute_training_signature() -> dict:
+    """
+    학습 설정 값과 학습 코드 버전
+
+    model_trainer 패키지의 모듈(데이터 준비, 특성 공학, 모델 학습, 앙상블 등) 소스가 바뀌거나
+    TRAINING_SETTINGS 값이 바뀌면 달라지므로, 데이터 해시와 함께 비교해 오래된 모델을 재사용하지 않습니다.
+
+    Returns:
+        dict: {"settings": 설정 값, "code_version": 소스 해시}
+    """
+    from app import setting
+    from app.services.stage_cache import code_version
+    return {
+        "settings": {name: getattr(setting, name) for name in TRAINING_SETTINGS},
+        "code_version": code_version(Path(__file__).parent),
+    }
+
+
+def _read_manifest(artifact_dir: Path) -> Optional[dict]:
+    try:
+        with open(artifact_dir / MANIFEST_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return None
+
+
+def list_model_artifacts(root: Optional[Path] = None) -> list:
+    """
+    저장된 모델 아티팩트 manifest 목록 (최신순)
+
+    Args:
+        root: 아티팩트 루트 디렉토리 (기본값: STORAGE_DIR/models)
+
+    Returns:
+        list: (아티팩트 디렉토리, manifest) 튜플 목록
+    """
+    root = Path(root) if root else get_artifact_root()
+    if not root.exists():
+        return []
+    artifacts = []
+    for artifact_dir in root.iterdir():
+        # 작성 중인 임시 디렉토리는 제외
+        if not artifact_dir.is_dir() or artifact_dir.name.startswith("."):
+            continue
+        manifest = _read_manifest(artifact_dir)
+        if manifest is not None:
+            artifacts.append((artifact_dir, manifest))
+    artifacts.sort(key=lambda item: item[1].get("created_at", ""), reverse=True)
+    return artifacts
+
+
+def save_model_artifact(model_dict: dict, data_hash: str, root: Optional[Path] = None,
+                        training_signature: Optional[dict] = None) -> str:
+    """
+    학습된 모델을 버전 디렉토리에 저장
+
+    임시 디렉토리에 모두 기록한 뒤 rename으로 게시하므로
+    중간에 실패하거나 다른 프로세스가 읽어도 반쯤 쓰인 아티팩트는 보이지 않습니다.
+
+    Args:
+        model_dict: train_model 반환값 (scaler, stacking_reg, model_features, df_model, imputer)
+        data_hash: 학습 입력 데이터 해시 (compute_data_hash)
+        root: 아티팩트 루트 디렉토리 (기본값: STORAGE_DIR/models)
+        training_signature: 학습 설정/코드 버전 (기본값: compute_training_signature())
+
+    Returns:
+        str: 저장된 아티팩트 버전
+    """
+    root = Path(root) if root else get_artifact_root()
+    training_signature = training_signature or compute_training_signature()
+    root.mkdir(parents=True, exist_ok=True)
+
+    created_at = datetime.now()
+    version = f"{created_at.strftime('%Y%m%d%H%M%S')}-{data_hash[:8]}-{uuid.uuid4().hex[:6]}"
+    tmp_dir = root / f".tmp-{version}"
+
+    try:
+        tmp_dir.mkdir()
+        for name in ARTIFACT_FILES:
+            joblib.dump(model_dict[name], tmp_dir / f"{name}.joblib", compress=3)
+
+        manifest = {
+            "version": version,
+            "created_at": created_at.isoformat(),
+            "format_version": ARTIFACT_FORMAT_VERSION,
+            "data_hash": data_hash,
+            "training_signature": training_signature,
+            "model_features": list(model_dict["model_features"]),
+            "n_rows": int(len(model_dict["df_model"])),
+            "libraries": _library_versions(),
+            "training_report": model_dict.get("training_report", {}),
+        }
+        with open(tmp_dir / MANIFEST_FILE, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+        os.rename(tmp_dir, root / version)
+        logger.info(f"모델 아티팩트 저장 완료: {root / version}")
+        return version
+
+    except Exception as e:
+        logger.error(f"모델 아티팩트 저장 오류: {e}", exc_info=True)
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise e
+
+
+def _is_compatible(manifest: dict) -> bool:
+    """현재 환경에서 불러올 수 있는 아티팩트인지 확인"""
+    if manifest.get("format_version") != ARTIFACT_FORMAT_VERSION:
+        return False
+    # 피클된 모델은 라이브러리 버전이 다르면 불러와도 동작이 달라질 수 있으므로 재사용하지 않음
+    return manifest.get("libraries") == _library_versions()
+
+
+def load_model_artifact(artifact_dir: Path) -> dict:
+    """
+    아티팩트 디렉토리에서 모델 객체 로드
+
+    Args:
+        artifact_dir: 아티팩트 디렉토리
+
+    Returns:
+        dict: train_model 반환값과 같은 형식의 딕셔너리
+    """
+    artifact_dir = Path(artifact_dir)
+    manifest = _read_manifest(artifact_dir)
+    if manifest is None:
+        raise FileNotFoundError(f"manifest가 없는 모델 아티팩트입니다: {artifact_dir}")
+    model_dict = {name: joblib.load(artifact_dir / f"{name}.joblib") for name in ARTIFACT_FILES}
+    model_dict["model_features"] = manifest["model_features"]
+    model_dict["training_report"] = manifest.get("training_report", {})
+    return model_dict
+
+
+def load_latest_model_artifact(data_hash: str, root: Optional[Path] = None,
+                               training_signature: Optional[dict] = None) -> Tuple[Optional[dict], Optional[str]]:
+    """
+    데이터 해시와 학습 설정/코드 버전이 일치하는 가장 최근 아티팩트 로드
+
+    Args:
+        data_hash: 학습 입력 데이터 해시
+        root: 아티팩트 루트 디렉토리 (기본값: STORAGE_DIR/models)
+        training_signature: 학습 설정/코드 버전 (기본값: compute_training_signature())
+
+    Returns:
+        tuple: (모델 딕셔너리, 아티팩트 버전), 없으면 (None, None)
+    """
+    training_signature = training_signature or compute_training_signature()
+    for artifact_dir, manifest in list_model_artifacts(root):
+        if manifest.get("data_hash") != data_hash:
+            continue
+        if manifest.get("training_signature") != training_signature:
+            logger.info(f"학습 설정 또는 학습 코드가 달라 아티팩트를 건너뜁니다: {artifact_dir.name}")
+            continue
+        if not _is_compatible(manifest):
+            logger.info(f"라이브러리/형식 버전이 달라 아티팩트를 건너뜁니다: {artifact_dir.name}")
+            continue
+        try:
+            model_dict = load_model_artifact(artifact_dir)
+            logger.info(f"모델 아티팩트 로드 완료: {artifact_dir.name}")
+            return model_dict, manifest["version"]
+        except Exception as e:
+            # 손상된 아티팩트는 건너뛰고 다음 후보 확인
+            logger.error(f"모델 아티팩트 로드 오류 ({artifact_dir.name}): {e}", exc_info=True)
+    return None, None
+
+
+def load_latest_imputer(root: Optional[Path] = None, training_signature: Optional[dict] = None):
+    """
+    데이터 해시와 관계없이 학습 설정/코드 버전이 같은 가장 최근 호환 아티팩트의 학습된 결측치 보완 모델 로드
+
+    재사용 기간과 데이터 변화 한도는 fit_or_reuse_imputer에서 확인합니다.
+
+    Args:
+        root: 아티팩트 루트 디렉토리 (기본값: STORAGE_DIR/models)
+        training_signature: 학습 설정/코드 버전 (기본값: compute_training_signature())
+
+    Returns:
+        FittedImputer: 저장된 imputer (없으면 None)
+    """
+    training_signature = training_signature or compute_training_signature()
+    for artifact_dir, manifest in list_model_artifacts(root):
+        if manifest.get("training_signature") != training_signature or not _is_compatible(manifest):
+            continue
+        try:
+            return joblib.load(artifact_dir / "imputer.joblib")
+        except Exception as e:
+            logger.error(f"결측치 보완 모델 로드 오류 ({artifact_dir.name}): {e}", exc_info=True)
+    return None
+
+
+def prune_model_artifacts(keep: int = MODEL_ARTIFACT_KEEP, root: Optional[Path] = None) -> int:
+    """
+    최신 keep개만 남기고 오래된 아티팩트 삭제
+
+    Args:
+        keep: 남길 아티팩트 수
+        root: 아티팩트 루트 디렉토리 (기본값: STORAGE_DIR/models)
+
+    Returns:
+        int: 삭제한 아티팩트 수
+    """
+    removed = 0
+    for artifact_dir, _ in list_model_artifacts(root)[max(1, keep):]:
+        shutil.rmtree(artifact_dir, ignore_errors=True)
+        removed += 1
+    if removed:
+        logger.info(f"오래된 모델 아티팩트 {removed}개 삭제")
+    return removed
+
+
+def attach_inference_model(model_dict: dict) -> dict:
+    """
+    스태킹 앙상블을 추론 전용 모델로 변환해 model_dict["inference_model"]에 추가
+
+    학습 데이터 전체로 원본 predict와 결과를 비교하며, 변환할 수 없으면 None을 넣습니다.
+    (아티팩트에는 저장하지 않고 로드할 때마다 다시 변환합니다.)
+    """
+    from .compiled_model import compile_stacking_model
+
+    try:
+        df_model = model_dict["df_model"]
+        features = model_dict["model_features"]
+        X_check = pd.DataFrame(model_dict["scaler"].transform(df_model[features]), columns=features)
+        model_dict["inference_model"] = compile_stacking_model(model_dict["stacking_reg"], X_check)
+    except Exception as e:
+        logger.error(f"추론 모델 준비 오류: {e}", exc_info=True)
+        model_dict["inference_model"] = None
+    return model_dict
+
+
+def load_or_train_model(df_final: pd.DataFrame, force_retrain: bool = False, full_search: bool = False) -> Tuple[dict, str]:
+    """
+    입력 데이터와 학습 설정/코드가 같으면 저장된 모델을 불러오고, 없으면 학습 후 저장
+
+    Args:
+        df_final: 전처리가 완료된 학습 입력 DataFrame
+        force_retrain: True이면 저장된 아티팩트와 결측치 보완 모델을 무시하고 다시 학습
+        full_search: True이면 캐시된 하이퍼파라미터도 쓰지 않고 전체 학습 (force_retrain 포함)
+
+    Returns:
+        tuple: (train_model 형식의 모델 딕셔너리, 모델 버전)
+    """
+    from .train_model import train_model
+
+    data_hash = compute_data_hash(df_final)
+    training_signature = compute_training_signature()
+
+    if not (force_retrain or full_search):
+        try:
+            model_dict, version = load_latest_model_artifact(data_hash, training_signature=training_signature)
+            if model_dict is not None:
+                return attach_inference_model(model_dict), version
+        except Exception as e:
+            logger.error(f"모델 아티팩트 조회 오류: {e}", exc_info=True)
+        logger.info(f"데이터 해시 {data_hash[:12]}와 현재 학습 설정/코드에 맞는 모델 아티팩트가 없어 학습을 시작합니다.")
+
+    # 강제 재학습이 아니면 이전 아티팩트의 결측치 보완 모델을 재사용해 새 행만 변환 (오래되었으면 train_model에서 다시 학습)
+    imputer = None
+    if IMPUTER_REUSE and not (force_retrain or full_search):
+        try:
+            imputer = load_latest_imputer(training_signature=training_signature)
+        except Exception as e:
+            logger.error(f"결측치 보완 모델 조회 오류: {e}", exc_info=True)
+
+    model_dict = train_model(df_final, full_search=full_search, imputer=imputer)
+
+    # 저장에 실패해도 학습된 모델로 계속 서비스
+    try:
+        version = save_model_artifact(model_dict, data_hash, training_signature=training_signature)
+        prune_model_artifacts()
+    except Exception as e:
+        logger.error(f"모델 아티팩트 저장 실패, 저장 없이 진행합니다: {e}", exc_info=True)
+        from app.dependencies import make_model_version
+        version = make_model_version()
+    return attach_inference_model(model_dict), version
@@ -0,0 +1,219 @@
+# app/services/model_trainer/compiled_model.py
+# 스태킹 앙상블을 가벼운 추론 전용 객체로 변환
+
+import logging
+from typing import Optional
+
+import numpy as np
+from catboost import CatBoostRegressor
+from lightgbm import LGBMRegressor
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.linear_model import Ridge
+from sklearn.neural_network import MLPRegressor
+from xgboost import XGBRegressor
+
+logger = logging.getLogger(__name__)
+
+# 기본 허용 오차 (원본 predict와의 최대 절대 오차)
+PARITY_ATOL = 1e-9
+
+_ACTIVATIONS = {
+    "identity": lambda a: a,
+    "relu": lambda a: np.maximum(a, 0, out=a),
+    "tanh": lambda a: np.tanh(a, out=a),
+    "logistic": lambda a: np.divide(1.0, 1.0 + np.exp(-a), out=a),
+}
+
+
+class _LinearPredictor:
+    """Ridge: X @ coef + intercept"""
+
+    dtype = np.float64
+
+    def __init__(self, model: Ridge):
+        self.coef = np.asarray(model.coef_, dtype=float)
+        self.intercept = float(model.intercept_)
+
+    def __call__(self, X: np.ndarray) -> np.ndarray:
+        return X @ self.coef + self.intercept
+
+
+class _MLPPredictor:
+    """MLP: 층별 행렬 곱 + 활성화 함수"""
+
+    dtype = np.float64
+
+    def __init__(self, model: MLPRegressor):
+        self.coefs = [np.asarray(c) for c in model.coefs_]
+        self.intercepts = [np.asarray(b) for b in model.intercepts_]
+        self.hidden_activation = _ACTIVATIONS[model.activation]
+        self.out_activation = _ACTIVATIONS[model.out_activation_]
+
+    def __call__(self, X: np.ndarray) -> np.ndarray:
+        a = X
+        last = len(self.coefs) - 1
+        for i, (coef, intercept) in enumerate(zip(self.coefs, self.intercepts)):
+            a = a @ coef
+            a += intercept
+            a = self.out_activation(a) if i == last else self.hidden_activation(a)
+        return a.ravel()
+
+
+class _ForestPredictor:
+    """랜덤 포레스트: 트리별 네이티브 predict 평균 (float32 입력)"""
+
+    dtype = np.float32
+
+    def __init__(self, model: RandomForestRegressor):
+        self.trees = [estimator.tree_ for estimator in model.estimators_]
+
+    def __call__(self, X: np.ndarray) -> np.ndarray:
+        total = np.zeros(X.shape[0], dtype=np.float64)
+        for tree in self.trees:
+            total += tree.predict(X)[:, 0]
+        total /= len(self.trees)
+        return total
+
+
+class _XGBPredictor:
+    """XGBoost: Booster.inplace_predict (float32 입력, DMatrix 생성 없음)"""
+
+    dtype = np.float32
+
+    def __init__(self, model: XGBRegressor):
+        self.booster = model.get_booster()
+        best_iteration = getattr(model, "best_iteration", None)
+        self.iteration_range = (0, best_iteration + 1) if best_iteration is not None else (0, 0)
+
+    def __call__(self, X: np.ndarray) -> np.ndarray:
+        return np.asarray(self.booster.inplace_predict(X, iteration_range=self.iteration_range), dtype=np.float64)
+
+
+class _LGBMPredictor:
+    """LightGBM: Booster.predict (임계값 비교 정밀도를 위해 float64 입력)"""
+
+    dtype = np.float64
+
+    def __init__(self, model: LGBMRegressor):
+        self.booster = model.booster_
+
+    def __call__(self, X: np.ndarray) -> np.ndarray:
+        return self.booster.predict(X)
+
+
+class _CatBoostPredictor:
+    """CatBoost: 수치형 특성만 있는 모델을 float32 배열로 직접 예측"""
+
+    dtype = np.float32
+
+    def __init__(self, model: CatBoostRegressor):
+        self.model = model
+
+    def __call__(self, X: np.ndarray) -> np.ndarray:
+        return np.asarray(self.model.predict(X, thread_count=1), dtype=np.float64)
+
+
+class _GenericPredictor:
+    """알 수 없는 모델은 원래 predict 사용"""
+
+    dtype = np.float64
+
+    def __init__(self, model):
+        self.model = model
+
+    def __call__(self, X: np.ndarray) -> np.ndarray:
+        return np.asarray(self.model.predict(X), dtype=np.float64)
+
+
+def make_base_predictor(estimator):
+    # 하위 클래스까지 허용하면 동작이 달라질 수 있으므로 정확한 타입만 변환
+    if type(estimator) is Ridge:
+        return _LinearPredictor(estimator)
+    if type(estimator) is MLPRegressor:
+        return _MLPPredictor(estimator)
+    if type(estimator) is RandomForestRegressor:
+        return _ForestPredictor(estimator)
+    if type(estimator) is XGBRegressor:
+        return _XGBPredictor(estimator)
+    if type(estimator) is LGBMRegressor:
+        return _LGBMPredictor(estimator)
+    if type(estimator) is CatBoostRegressor:
+        return _CatBoostPredictor(estimator)
+    logger.info(f"{type(estimator).__name__}는 변환 대상이 아니어서 원래 predict를 사용합니다.")
+    return _GenericPredictor(estimator)
+
+
+class CompiledStackingModel:
+    """
+    추론 전용 스태킹 앙상블
+
+    개별 모델을 라이브러리 네이티브 예측 함수(트리 모델) 또는 행렬 곱(Ridge/MLP)으로 바꾸고,
+    최종 Ridge 블렌딩을 개별 예측 행렬과의 내적 한 번으로 계산합니다.
+    입력은 stacking_reg.predict와 같이 스케일링된 특성입니다.
+    """
+
+    def __init__(self, names: list, predictors: list, blend_coef: np.ndarray, blend_intercept: float, n_features: int):
+        self.names = list(names)
+        self.predictors = list(predictors)
+        self.blend_coef = np.asarray(blend_coef, dtype=float)
+        self.blend_intercept = float(blend_intercept)
+        self.n_features_in_ = n_features
+        self.parity_max_abs_error = None
+
+    def predict(self, X) -> np.ndarray:
+        X64 = np.ascontiguousarray(getattr(X, "values", X), dtype=np.float64)
+        X32 = None
+        base = np.empty((X64.shape[0], len(self.predictors)))
+        for i, predictor in enumerate(self.predictors):
+            if predictor.dtype is np.float32:
+                if X32 is None:
+                    X32 = X64.astype(np.float32)
+                base[:, i] = predictor(X32)
+            else:
+                base[:, i] = predictor(X64)
+        return base @ self.blend_coef + self.blend_intercept
+
+
+def compile_stacking_model(stacking_reg, X_check, atol: float = PARITY_ATOL) -> Optional[CompiledStackingModel]:
+    """
+    학습된 스태킹 앙상블을 추론 전용 객체로 변환하고 원본 predict와 결과를 비교
+
+    StackingRegressor와 OOFStackingRegressor(개별 모델 예측 → Ridge 블렌딩)를 지원합니다.
+    X_check에서 원본과의 최대 절대 오차가 atol을 넘으면 변환 결과를 쓰지 않습니다.
+
+    Args:
+        stacking_reg: 학습된 스태킹 모델
+        X_check: 비교에 사용할 스케일링된 특성 데이터
+        atol: 허용 최대 절대 오차
+
+    Returns:
+        CompiledStackingModel: 변환된 모델 (변환 불가 또는 불일치 시 None)
+    """
+    try:
+        final_estimator = getattr(stacking_reg, "final_estimator_", None)
+        named_estimators = getattr(stacking_reg, "named_estimators_", None)
+        if type(final_estimator) is not Ridge or not named_estimators or getattr(stacking_reg, "passthrough", False):
+            logger.info("지원하지 않는 스태킹 구조여서 추론 모델 변환을 건너뜁니다.")
+            return None
+
+        names = [name for name, est in named_estimators.items() if est != "drop"]
+        predictors = [make_base_predictor(named_estimators[name]) for name in names]
+        compiled = CompiledStackingModel(
+            names, predictors, final_estimator.coef_, final_estimator.intercept_, np.shape(X_check)[1]
+        )
+
+        # 원본 predict와 결과 비교
+        expected = np.asarray(stacking_reg.predict(X_check), dtype=float)
+        actual = compiled.predict(X_check)
+        max_error = float(np.max(np.abs(expected - actual))) if len(expected) else 0.0
+        compiled.parity_max_abs_error = max_error
+        if not np.isfinite(max_error) or max_error > atol:
+            logger.error(f"추론 모델 결과가 원본과 다릅니다 (최대 오차 {max_error:.3e}) - 원본 모델을 사용합니다.")
+            return None
+
+        logger.info(f"추론 모델 변환 완료: {names}, 원본 대비 최대 오차 {max_error:.3e}")
+        return compiled
+
+    except Exception as e:
+        logger.error(f"추론 모델 변환 오류: {e}", exc_info=True)
+        return None
@@ -8,10 +8,166 @@ from sklearn.impute import IterativeImputer
 from sklearn.preprocessing import StandardScaler
 from sklearn.model_selection import train_test_split
 from sklearn.linear_model import BayesianRidge
+from datetime import datetime, timedelta
 import logging
+import time
+
+from app.setting import IMPUTATION_MODE, IMPUTER_MAX_AGE_DAYS, IMPUTER_MAX_ROW_DRIFT
 
 logger = logging.getLogger(__name__)
 
+# 결측치 보완 방식
+# - iterative: IterativeImputer(BayesianRidge) - 컬럼 간 관계를 반복 추정
+# - category_median: 카테고리별 중앙값 (닫힌 형태, 학습 비용 거의 없음)
+# - log_linear: 다른 컬럼으로 최소제곱 선형 회귀 (review는 log1p 공간에서 계산)
+IMPUTATION_MODES = ("iterative", "category_median", "log_linear")
+LOG_SCALE_COLUMNS = ("review",)
+
+
+class FittedImputer:
+    """
+    학습 데이터로 한 번 학습해 두고 재학습 때 재사용하는 결측치 보완 모델
+
+    transform은 결측치가 있는 행만 계산하므로 재사용할 때는 새로 들어온(결측치가 있는) 행만 변환합니다.
+    """
+
+    def __init__(self, columns: list, mode: str = "iterative", group_col: str = "category_id"):
+        if mode not in IMPUTATION_MODES:
+            raise ValueError(f"지원하지 않는 결측치 보완 방식입니다: {mode} (가능한 값: {IMPUTATION_MODES})")
+        self.columns = list(columns)
+        self.mode = mode
+        self.group_col = group_col
+        self.medians_ = {}
+        self.model_ = None
+        self.n_fit_rows_ = 0
+        self.fitted_at_ = None
+
+    def _to_fit_space(self, col, values):
+        return np.log1p(values) if col in LOG_SCALE_COLUMNS else values
+
+    def _from_fit_space(self, col, values):
+        return np.expm1(values) if col in LOG_SCALE_COLUMNS else values
+
+    def fit(self, df: pd.DataFrame) -> "FittedImputer":
+        values = df[self.columns]
+        self.medians_ = values.median().to_dict()
+
+        if self.mode == "iterative":
+            self.model_ = IterativeImputer(estimator=BayesianRidge(), random_state=42, max_iter=10, initial_strategy='median')
+            self.model_.fit(values)
+        elif self.mode == "category_median":
+            if self.group_col in df.columns:
+                self.model_ = {col: df.groupby(self.group_col)[col].median().dropna().to_dict() for col in self.columns}
+            else:
+                self.model_ = {col: {} for col in self.columns}
+        else:
+            # 컬럼별로 나머지 컬럼을 설명 변수로 하는 선형 회귀 계수 (정규 방정식 최소제곱 해)
+            complete = values.dropna()
+            self.model_ = {}
+            for col in self.columns:
+                others = [c for c in self.columns if c != col]
+                if len(complete) <= len(others):
+                    continue
+                X = np.column_stack([np.ones(len(complete))] +
+                                    [self._to_fit_space(c, complete[c].to_numpy(dtype=float)) for c in others])
+                y = self._to_fit_space(col, complete[col].to_numpy(dtype=float))
+                coef, *_ = np.linalg.lstsq(X, y, rcond=None)
+                self.model_[col] = (others, coef)
+
+        self.n_fit_rows_ = int(len(values))
+        self.fitted_at_ = datetime.now().isoformat()
+        return self
+
+    def transform(self, df: pd.DataFrame) -> pd.DataFrame:
+        """df의 결측치를 보완 (결측치가 있는 행만 계산, df를 직접 수정해 반환)"""
+        block = df[self.columns]
+        current = block.to_numpy(dtype=float, copy=True)
+        rows = np.flatnonzero(np.isnan(current).any(axis=1))
+        if not len(rows):
+            return df
+
+        if self.mode == "iterative":
+            current[rows] = self.model_.transform(block.iloc[rows])
+        else:
+            groups = df[self.group_col].to_numpy()[rows] if self.group_col in df.columns else None
+            current[rows] = self._closed_form_fill(current[rows], groups)
+
+        for j, col in enumerate(self.columns):
+            df[col] = current[:, j]
+        return df
+
+    def _closed_form_fill(self, observed: np.ndarray, groups) -> np.ndarray:
+        """category_median / log_linear 방식으로 결측치를 채운 배열"""
+        values = observed.copy()
+        for j, col in enumerate(self.columns):
+            missing = np.isnan(values[:, j])
+            if not missing.any():
+                continue
+            if self.mode == "category_median" and groups is not None:
+                medians = self.model_[col]
+                values[missing, j] = [medians.get(group, np.nan) for group in groups[missing]]
+            elif self.mode == "log_linear" and col in self.model_:
+                others, coef = self.model_[col]
+                predictors = observed[:, [self.columns.index(c) for c in others]]
+                usable = missing & ~np.isnan(predictors).any(axis=1)
+                if usable.any():
+                    X = np.column_stack([np.ones(int(usable.sum()))] +
+                                        [self._to_fit_space(c, predictors[usable, k]) for k, c in enumerate(others)])
+                    values[usable, j] = self._from_fit_space(col, X @ coef)
+            # 위 방식으로 채우지 못한 값은 전체 중앙값 사용
+            values[np.isnan(values[:, j]), j] = self.medians_.get(col, np.nan)
+        return values
+
+    def is_compatible(self, columns: list, mode: str) -> bool:
+        """같은 컬럼/방식으로 학습된 모델인지 확인"""
+        return self.mode == mode and self.columns == list(columns)
+
+    def is_stale(self, n_rows: int, max_age_days: float = IMPUTER_MAX_AGE_DAYS,
+                 max_row_drift: float = IMPUTER_MAX_ROW_DRIFT) -> bool:
+        """
+        재사용하기에 오래되었거나 데이터가 많이 바뀌었는지 확인
+
+        Args:
+            n_rows: 이번 학습 데이터 행 수
+            max_age_days: 학습 후 재사용 기간 (0 이하이면 항상 True)
+            max_row_drift: 학습 당시 행 수 대비 허용 변화율
+
+        Returns:
+            bool: 다시 학습해야 하면 True
+        """
+        if max_age_days <= 0 or not self.fitted_at_ or not self.n_fit_rows_:
+            return True
+        if datetime.now() - datetime.fromisoformat(self.fitted_at_) >= timedelta(days=max_age_days):
+            return True
+        return abs(n_rows - self.n_fit_rows_) / self.n_fit_rows_ > max_row_drift
+
+
+def fit_or_reuse_imputer(df: pd.DataFrame, impute_cols: list, imputer: FittedImputer = None,
+                         mode: str = IMPUTATION_MODE) -> FittedImputer:
+    """
+    재사용 가능한 학습된 imputer가 있으면 그대로 반환하고, 없으면 df로 새로 학습
+    (컬럼/방식이 다르거나, IMPUTER_MAX_AGE_DAYS가 지났거나, 행 수가 IMPUTER_MAX_ROW_DRIFT 넘게 바뀌면 새로 학습)
+
+    Args:
+        df: 학습 데이터프레임
+        impute_cols: 결측치를 보완할 컬럼 리스트
+        imputer: 이전 학습에서 저장된 FittedImputer (없으면 None)
+        mode: 결측치 보완 방식 (IMPUTATION_MODES)
+
+    Returns:
+        FittedImputer: 학습된 imputer
+    """
+    if imputer is not None and imputer.is_compatible(impute_cols, mode):
+        if not imputer.is_stale(len(df)):
+            logger.info(f"저장된 결측치 보완 모델 재사용: {mode} ({imputer.fitted_at_} 학습, {imputer.n_fit_rows_}행)")
+            return imputer
+        logger.info(f"저장된 결측치 보완 모델이 오래되었거나 데이터가 많이 바뀌어 다시 학습합니다: "
+                    f"{imputer.fitted_at_} 학습, {imputer.n_fit_rows_}행 -> {len(df)}행")
+    start = time.perf_counter()
+    imputer = FittedImputer(impute_cols, mode).fit(df)
+    logger.info(f"결측치 보완 모델 학습 완료: {mode}, {time.perf_counter() - start:.3f}초")
+    return imputer
+
 def prepare_data(df: pd.DataFrame, required_cols: list) -> pd.DataFrame:
     try:
         # 기존 코드 + 추가 데이터 품질 검증
@@ -33,23 +189,26 @@ def prepare_data(df: pd.DataFrame, required_cols: list) -> pd.DataFrame:
         logger.error(f"prepare_data 오류: {e}", exc_info=True)
         raise e
 
-def impute_and_clip(df: pd.DataFrame, impute_cols: list, min_values=None, max_values=None) -> pd.DataFrame:
+def impute_and_clip(df: pd.DataFrame, impute_cols: list, min_values=None, max_values=None,
+                    imputer: FittedImputer = None) -> pd.DataFrame:
     """
-    IterativeImputer를 사용하여 결측치 보완 후, 지정된 범위로 클리핑.
+    결측치 보완 후, 지정된 범위로 클리핑.
     
     Args:
         df: 입력 데이터프레임
         impute_cols: 결측치를 보완할 컬럼 리스트
         min_values: 컬럼별 최소값 딕셔너리 (예: {'score': 0})
         max_values: 컬럼별 최대값 딕셔너리 (예: {'score': 5})
+        imputer: 학습된 FittedImputer (없으면 IMPUTATION_MODE 방식으로 df에서 새로 학습)
     """
     try:
         # 기본값 설정
         min_values = min_values or {'score': 0}
         max_values = max_values or {'score': 5.0}
         
-        imputer = IterativeImputer(estimator=BayesianRidge(), random_state=42, max_iter=10, initial_strategy='median')
-        df[impute_cols] = imputer.fit_transform(df[impute_cols])
+        if imputer is None:
+            imputer = fit_or_reuse_imputer(df, impute_cols)
+        df = imputer.transform(df)
         
         # 각 컬럼별로 클리핑 적용
         for col, min_val in min_values.items():
@@ -0,0 +1,161 @@
+# app/services/model_trainer/ensemble_pruning.py
+# 추론 비용 대비 기여도가 낮은 개별 모델을 스태킹 앙상블에서 제외
+
+import logging
+import time
+
+import numpy as np
+
+from app.setting import MODEL_PRUNING_ENABLED, MODEL_PRUNING_MIN_GAIN_PER_MS
+from .compiled_model import make_base_predictor
+from .model_training import OOFStackingRegressor, FinalRidge, meta_cv_score
+
+logger = logging.getLogger(__name__)
+
+# 지연 시간 측정에 사용할 최대 행 수와 반복 횟수
+LATENCY_SAMPLE_ROWS = 1000
+LATENCY_REPEAT = 5
+
+
+def measure_predict_latency(estimators: list, X) -> dict:
+    """
+    개별 모델의 추론 전용 predict 지연 시간(ms) 측정
+
+    실제 서비스와 같은 경로(CompiledStackingModel의 예측 함수)로 최대 1000행을 예측한 시간의 중앙값입니다.
+
+    Args:
+        estimators: (이름, 학습된 모델) 목록
+        X: 측정에 사용할 특성 데이터
+
+    Returns:
+        dict: 모델 이름별 지연 시간(ms)
+    """
+    X64 = np.ascontiguousarray(getattr(X, "values", X)[:LATENCY_SAMPLE_ROWS], dtype=np.float64)
+    latencies = {}
+    for name, estimator in estimators:
+        predictor = make_base_predictor(estimator)
+        X_input = X64.astype(predictor.dtype, copy=False)
+        predictor(X_input)  # 워밍업
+        timings = []
+        for _ in range(LATENCY_REPEAT):
+            start = time.perf_counter()
+            predictor(X_input)
+            timings.append((time.perf_counter() - start) * 1000)
+        latencies[name] = float(np.median(timings))
+    return latencies
+
+
+def ablation_gains(oof: np.ndarray, y: np.ndarray, folds: list, columns: list) -> dict:
+    """
+    폴드 밖 예측에서 모델 하나씩 뺐을 때 스택 CV R²가 얼마나 떨어지는지 계산
+
+    Args:
+        oof: 폴드 밖 예측 행렬
+        y: 타깃 배열
+        folds: (train_idx, test_idx) 목록
+        columns: 평가할 oof 열 번호 목록
+
+    Returns:
+        dict: 열 번호별 기여도 (전체 CV R² - 해당 모델 제외 CV R²)
+    """
+    full_score = meta_cv_score(oof[:, columns], y, folds)
+    gains = {}
+    for col in columns:
+        rest = [c for c in columns if c != col]
+        gains[col] = full_score - meta_cv_score(oof[:, rest], y, folds) if rest else full_score
+    return gains
+
+
+def prune_ensemble(stacking, X, y, enabled: bool = MODEL_PRUNING_ENABLED,
+                   min_gain_per_ms: float = MODEL_PRUNING_MIN_GAIN_PER_MS):
+    """
+    개별 모델의 기여도와 추론 비용을 측정하고, 설정 시 비용 대비 기여도가 낮은 모델 제외
+
+    기여도(gain)는 폴드 밖 예측에서 해당 모델을 뺐을 때의 스택 CV R² 감소량이고,
+    gain / 지연 시간(ms)이 min_gain_per_ms보다 낮은 모델 중 가장 낮은 것을 하나씩 빼면서
+    남은 모델로 기여도를 다시 계산합니다. 최소 한 개 모델은 남깁니다.
+    메타 모델은 남은 모델의 폴드 밖 예측으로 다시 학습하므로 개별 모델 재학습은 없습니다.
+
+    Args:
+        stacking: train_stacking이 반환한 OOFStackingRegressor
+        X: 학습 특성 데이터 (지연 시간 측정용)
+        y: 학습 타깃 데이터
+        enabled: False이면 측정과 리포트만 하고 모델은 그대로 유지
+        min_gain_per_ms: 유지할 최소 CV R² 기여도 / ms
+
+    Returns:
+        tuple: (선택된 OOFStackingRegressor, 앙상블 리포트 딕셔너리)
+    """
+    try:
+        if not isinstance(stacking, OOFStackingRegressor) or stacking.oof_predictions_ is None or not stacking.folds_:
+            logger.info("폴드 밖 예측이 없는 모델이어서 앙상블 가지치기를 건너뜁니다.")
+            return stacking, {}
+
+        names = [name for name, _ in stacking.estimators_]
+        oof = stacking.oof_predictions_
+        folds = stacking.folds_
+        y_true = np.asarray(y, dtype=float)
+        latencies = measure_predict_latency(stacking.estimators_, X)
+
+        # 전체 앙상블 기준 기여도 (리포트용)
+        all_columns = list(range(len(names)))
+        initial_gains = ablation_gains(oof, y_true, folds, all_columns)
+
+        kept = list(all_columns)
+        dropped = []
+        while enabled and len(kept) > 1:
+            gains = ablation_gains(oof, y_true, folds, kept)
+            ratios = {col: gains[col] / max(latencies[names[col]], 1e-6) for col in kept}
+            worst = min(kept, key=lambda col: ratios[col])
+            if ratios[worst] >= min_gain_per_ms:
+                break
+            logger.info(f"{names[worst]} 모델 제외: 기여도 {gains[worst]:.3e}, 지연 {latencies[names[worst]]:.3f}ms")
+            kept.remove(worst)
+            dropped.append(names[worst])
+
+        if dropped:
+            final_estimator = FinalRidge().fit(oof[:, kept], y_true)
+            stacking = OOFStackingRegressor.from_oof(
+                [stacking.estimators_[col] for col in kept],
+                final_estimator,
+                oof_predictions=oof[:, kept],
+                oof_metrics={names[col]: dict(stacking.oof_metrics_.get(names[col], {}),
+                                              meta_coef=float(final_estimator.coef_[i]))
+                             for i, col in enumerate(kept)},
+                cv_score=meta_cv_score(oof[:, kept], y_true, folds),
+                folds=folds,
+                n_jobs=stacking.n_jobs,
+            )
+
+        full_latency = sum(latencies.values())
+        chosen_latency = sum(latencies[names[col]] for col in kept)
+        report = {
+            "pruning_enabled": bool(enabled),
+            "min_gain_per_ms": float(min_gain_per_ms),
+            "latency_rows": int(min(len(X), LATENCY_SAMPLE_ROWS)),
+            "learners": {
+                names[col]: {
+                    "gain": float(initial_gains[col]),
+                    "latency_ms": latencies[names[col]],
+                    "gain_per_ms": float(initial_gains[col] / max(latencies[names[col]], 1e-6)),
+                    "kept": col in kept,
+                }
+                for col in all_columns
+            },
+            "chosen": [names[col] for col in kept],
+            "dropped": dropped,
+            "cv_r2_full": float(meta_cv_score(oof, y_true, folds)),
+            "cv_r2_chosen": float(stacking.cv_score_),
+            "latency_ms_full": float(full_latency),
+            "latency_ms_chosen": float(chosen_latency),
+        }
+        logger.info(
+            f"앙상블 선택: {report['chosen']} (CV R² {report['cv_r2_full']:.6f} -> {report['cv_r2_chosen']:.6f}, "
+            f"지연 {full_latency:.3f}ms -> {chosen_latency:.3f}ms)"
+        )
+        return stacking, report
+
+    except Exception as e:
+        # 가지치기에 실패해도 전체 앙상블로 계속 진행
+        logger.error(f"앙상블 가지치기 오류: {e}", exc_info=True)
+        return stacking, {}
@@ -0,0 +1,103 @@
+# app/services/model_trainer/feature_engineering.py
+# 향상된 특성 엔지니어링
+
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def enhance_feature_engineering(df_prepared):
+    """
+    향상된 특성 엔지니어링 함수
+
+    Args:
+        df_prepared: 기본 전처리가 완료된 데이터프레임
+
+    Returns:
+        df_prepared: 향상된 특성이 추가된 데이터프레임
+    """
+    try:
+        logger.debug("향상된 특성 엔지니어링 시작...")
+
+        # 1. 카테고리별 희소성 계산
+        category_counts = df_prepared['category_id'].value_counts()
+        total_restaurants = len(df_prepared)
+        category_sparsity = 1 - (category_counts / total_restaurants)
+
+        # 2. 카테고리 다양성 특성 추가
+        df_prepared['category_diversity_score'] = df_prepared['category_id'].map(
+            category_sparsity.to_dict()
+        ).fillna(0)
+
+        # 3. 카테고리 인기도 측정
+        category_avg_rating = df_prepared.groupby('category_id')['score'].mean()
+        category_avg_reviews = df_prepared.groupby('category_id')['review'].mean()
+
+        df_prepared['category_avg_rating'] = df_prepared['category_id'].map(
+            category_avg_rating.to_dict()
+        ).fillna(df_prepared['score'].mean())
+
+        df_prepared['category_avg_reviews'] = df_prepared['category_id'].map(
+            category_avg_reviews.to_dict()
+        ).fillna(df_prepared['review'].mean())
+
+        # 4. 식당 인기도 점수
+        df_prepared['popularity_score'] = (
+            df_prepared['score'] * 0.6 +
+            np.log1p(df_prepared['review']) * 0.4
+        )
+
+        # 5. 리뷰 기반 상호작용 강도 - 가중치 최적화
+        df_prepared['interaction_intensity'] = (
+            df_prepared['review'] * 0.4 +
+            df_prepared['duration_hours'] * 0.25 +
+            np.log1p(df_prepared['review']) * 0.35
+        )
+
+        # 6. 식당 대비 카테고리 성능 (식당이 해당 카테고리 내에서 얼마나 좋은지)
+        df_prepared['rating_vs_category'] = df_prepared['score'] - df_prepared['category_avg_rating']
+        df_prepared['reviews_vs_category'] = df_prepared['review'] / (df_prepared['category_avg_reviews'] + 1)
+
+        # 7. 복합 특성들
+        # 복합 평점: 카테고리 다양성과 평점 결합
+        df_prepared['composite_rating'] = (
+            df_prepared['score'] * 0.7 +
+            df_prepared['category_diversity_score'] * 0.2 +
+            df_prepared['rating_vs_category'] * 0.1
+        )
+
+        # 복합 인기도: 리뷰 수와 운영 시간 결합
+        df_prepared['engagement_score'] = (
+            np.log1p(df_prepared['review']) * 0.7 +
+            (df_prepared['duration_hours'] / 24) * 0.3
+        )
+
+        # 8. 식당 특성과 카테고리 인기도의 상호작용
+        df_prepared['category_quality_interaction'] = (
+            df_prepared['score'] * df_prepared['category_avg_rating']
+        )
+
+        # 9. 리뷰 밀도 (시간당 리뷰 수)
+        df_prepared['review_density'] = df_prepared['review'] / (df_prepared['duration_hours'] + 1)
+
+        # 10. 편의 시설 복합 점수
+        convenience_cols = [col for col in df_prepared.columns if col.startswith('conv_')]
+        if convenience_cols:
+            df_prepared['convenience_score'] = df_prepared[convenience_cols].sum(axis=1)
+
+        # 11. 리뷰 영향력 비율
+        global_avg_rating = df_prepared['score'].mean()
+        df_prepared['bayesian_rating'] = (
+            (df_prepared['review'] * df_prepared['score'] + 10 * global_avg_rating) /
+            (df_prepared['review'] + 10)
+        )
+
+        logger.debug("향상된 특성 엔지니어링 완료")
+        return df_prepared
+
+    except Exception as e:
+        logger.error(f"향상된 특성 엔지니어링 중 오류 발생: {e}", exc_info=True)
+        # 오류가 발생해도 원본 데이터프레임 반환
+        return df_prepared
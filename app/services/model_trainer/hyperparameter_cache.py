@@ -0,0 +1,170 @@
+# app/services/model_trainer/hyperparameter_cache.py
+# 재학습 간 최적 하이퍼파라미터 재사용
+
+import hashlib
+import json
+import logging
+import math
+import os
+import tempfile
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from app.setting import HYPERPARAM_FULL_SEARCH_DAYS, HYPERPARAM_SEARCH_MODE
+from .model_training import make_base_estimator
+
+logger = logging.getLogger(__name__)
+
+# 탐색 대상이 아닌 실행 환경 파라미터 (캐시에 저장하지 않음)
+_RUNTIME_PARAMS = {"n_jobs", "thread_count"}
+
+
+def compute_data_fingerprint(X) -> str:
+    """
+    하이퍼파라미터 재사용 여부를 판단할 데이터 형태 지문
+
+    피처 구성과 행 수 규모(2의 거듭제곱 단위)만 반영하므로
+    식당 몇 개가 추가/삭제된 재학습에서는 같은 지문이 나옵니다.
+
+    Args:
+        X: 학습 특성 데이터
+
+    Returns:
+        str: 지문 문자열
+    """
+    columns = [str(c) for c in getattr(X, "columns", range(np.shape(X)[1]))]
+    row_bucket = int(round(math.log2(max(len(X), 1))))
+    raw = json.dumps({"columns": columns, "row_bucket": row_bucket}, ensure_ascii=False)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def _to_json_value(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, tuple):
+        return [_to_json_value(v) for v in value]
+    return value
+
+
+def _from_json_value(value):
+    # JSON에는 튜플이 없으므로 리스트는 튜플로 복원 (예: hidden_layer_sizes)
+    if isinstance(value, list):
+        return tuple(_from_json_value(v) for v in value)
+    return value
+
+
+def _same_value(a, b) -> bool:
+    if isinstance(a, float) and isinstance(b, float) and math.isnan(a) and math.isnan(b):
+        return True
+    try:
+        return bool(a == b)
+    except Exception:
+        return False
+
+
+def extract_tuned_params(name: str, model) -> dict:
+    """
+    학습된 모델에서 기본 모델과 다른 하이퍼파라미터만 추출
+
+    Args:
+        name: 모델 이름
+        model: 탐색으로 선택된 모델
+
+    Returns:
+        dict: JSON으로 저장 가능한 하이퍼파라미터
+    """
+    defaults = make_base_estimator(name).get_params()
+    tuned = {}
+    for key, value in model.get_params().items():
+        if key in _RUNTIME_PARAMS or _same_value(defaults.get(key), value):
+            continue
+        tuned[key] = _to_json_value(value)
+    return tuned
+
+
+class HyperparameterCache:
+    """
+    모델 이름별 최적 하이퍼파라미터와 검증 R²를 JSON 파일 하나에 보관
+
+    항목마다 탐색 당시의 데이터 지문과 탐색 방식을 기록하고, 둘 다 같을 때만 재사용합니다.
+    파일은 임시 파일 + os.replace로 기록해 여러 프로세스가 읽어도 깨진 내용을 보지 않습니다.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._entries = self._load()
+
+    def _load(self) -> dict:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.error(f"하이퍼파라미터 캐시 로드 오류: {e}", exc_info=True)
+            return {}
+
+    def get(self, name: str, fingerprint: str) -> Optional[dict]:
+        """
+        데이터 지문과 탐색 방식(HYPERPARAM_SEARCH_MODE)이 같은 캐시 항목 반환
+
+        Args:
+            name: 모델 이름
+            fingerprint: compute_data_fingerprint 결과
+
+        Returns:
+            dict: {"params", "valid_r2", "searched_at"} 또는 None
+        """
+        with self._lock:
+            entry = self._entries.get(name)
+        if not entry or entry.get("fingerprint") != fingerprint:
+            return None
+        if entry.get("search_mode") != HYPERPARAM_SEARCH_MODE.lower():
+            return None
+        return {
+            "params": {k: _from_json_value(v) for k, v in entry["params"].items()},
+            "valid_r2": entry.get("valid_r2"),
+            "searched_at": entry.get("searched_at"),
+        }
+
+    def is_search_due(self, entry: dict, max_age_days: float = HYPERPARAM_FULL_SEARCH_DAYS) -> bool:
+        """마지막 전체 탐색 후 max_age_days가 지났으면 True (0 이하이면 항상 탐색)"""
+        if max_age_days <= 0 or not entry.get("searched_at"):
+            return True
+        searched_at = datetime.fromisoformat(entry["searched_at"])
+        return datetime.now() - searched_at >= timedelta(days=max_age_days)
+
+    def set(self, name: str, fingerprint: str, params: dict, valid_r2: Optional[float]):
+        """전체 탐색 결과 기록 (save 호출 전까지는 메모리에만 반영)"""
+        with self._lock:
+            self._entries[name] = {
+                "fingerprint": fingerprint,
+                "search_mode": HYPERPARAM_SEARCH_MODE.lower(),
+                "params": params,
+                "valid_r2": None if valid_r2 is None else float(valid_r2),
+                "searched_at": datetime.now().isoformat(),
+            }
+
+    def save(self):
+        """캐시 파일을 원자적으로 기록"""
+        with self._lock:
+            entries = dict(self._entries)
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=str(self.path.parent), suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entries, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.error(f"하이퍼파라미터 캐시 저장 오류: {e}", exc_info=True)
+
+
+def get_hyperparameter_cache() -> HyperparameterCache:
+    """STORAGE_DIR/models/hyperparameters.json 캐시 생성 (호출 시점의 파일 내용을 읽음)"""
+    from app.config import STORAGE_DIR
+    return HyperparameterCache(Path(STORAGE_DIR) / "models" / "hyperparameters.json")
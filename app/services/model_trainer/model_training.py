@@ -2,16 +2,23 @@
 # # 개별 모델 학습 및 하이퍼파라미터 튜닝
 
 from sklearn.linear_model import Ridge
-from sklearn.ensemble import RandomForestRegressor, StackingRegressor
+from sklearn.ensemble import RandomForestRegressor
 from xgboost import XGBRegressor
 import lightgbm as lgb
 from catboost import CatBoostRegressor
 from sklearn.neural_network import MLPRegressor
-from sklearn.model_selection import GridSearchCV, cross_val_score
+from sklearn.model_selection import GridSearchCV, KFold
+from sklearn.base import BaseEstimator, RegressorMixin, clone
+from sklearn.metrics import r2_score, mean_squared_error, mean_absolute_error
 from sklearn.linear_model import Ridge as FinalRidge
 from sklearn.model_selection import RandomizedSearchCV
 from sklearn.model_selection import StratifiedKFold
+from sklearn.experimental import enable_halving_search_cv  # 필요
+from sklearn.model_selection import HalvingGridSearchCV, HalvingRandomSearchCV
 import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from app.setting import HYPERPARAM_SEARCH_MODE
 
 import os
 import logging
@@ -28,11 +35,108 @@ if hasattr(multiprocessing, 'freeze_support'):
 
 logger = logging.getLogger(__name__)
 
-def train_ridge(X, y, n_jobs=-1):
+# successive halving 탐색 시 후보마다 점차 늘려 줄 자원 (없으면 학습 샘플 수)
+HALVING_RESOURCES = {'rf': 'n_estimators', 'xgb': 'n_estimators', 'lgb': 'n_estimators', 'cat': 'iterations'}
+
+def make_search(name, estimator, param_grid, n_jobs, n_iter=None, search_mode=None):
+    """
+    설정된 탐색 방식에 맞는 하이퍼파라미터 탐색기 생성
+
+    grid 모드는 기존과 같이 GridSearchCV/RandomizedSearchCV를 사용합니다.
+    halving 모드는 successive halving으로 모든 후보를 적은 자원(부스팅 라운드/트리 수 또는 샘플 수)으로
+    먼저 평가하고, 상위 1/3만 3배 자원으로 다시 평가하는 과정을 반복해 나쁜 후보에 쓰는 연산을 줄입니다.
+    부스팅 라운드를 자원으로 쓰는 모델은 해당 파라미터를 후보에서 빼고 그 최대값까지 늘려 갑니다.
+
+    Args:
+        name: 모델 이름 (ridge, rf, xgb, lgb, cat, mlp)
+        estimator: 기본 모델
+        param_grid: 탐색할 파라미터 후보 (n_iter가 있으면 분포)
+        n_jobs: 탐색 병렬 작업 수
+        n_iter: 랜덤 탐색 후보 수 (None이면 전체 격자 탐색)
+        search_mode: grid 또는 halving (기본값: HYPERPARAM_SEARCH_MODE)
+
+    Returns:
+        탐색기 (fit 후 best_estimator_ 사용)
+    """
+    search_mode = (search_mode or HYPERPARAM_SEARCH_MODE).lower()
+
+    if search_mode == 'halving':
+        param_grid = dict(param_grid)
+        resource = HALVING_RESOURCES.get(name, 'n_samples')
+        max_resources = 'auto'
+        if resource != 'n_samples' and resource in param_grid:
+            max_resources = int(np.max(param_grid.pop(resource)))
+            # CatBoost는 명시적으로 지정한 파라미터만 get_params에 노출하므로 자원 파라미터를 미리 지정
+            if resource not in estimator.get_params():
+                estimator.set_params(**{resource: max_resources})
+        common = dict(
+            factor=3, resource=resource, max_resources=max_resources, min_resources='exhaust',
+            cv=3, scoring='r2', n_jobs=n_jobs, random_state=42
+        )
+        if n_iter:
+            return HalvingRandomSearchCV(estimator, param_grid, n_candidates=n_iter, **common)
+        return HalvingGridSearchCV(estimator, param_grid, **common)
+
+    if search_mode != 'grid':
+        logger.warning(f"알 수 없는 탐색 방식: {search_mode} - grid 방식을 사용합니다.")
+    if n_iter:
+        return RandomizedSearchCV(estimator, param_grid, n_iter=n_iter, cv=3, scoring='r2', n_jobs=n_jobs, random_state=42)
+    return GridSearchCV(estimator, param_grid, cv=3, scoring='r2', n_jobs=n_jobs)
+
+def make_base_estimator(name, n_threads=None):
+    """
+    하이퍼파라미터 탐색 전의 기본 모델 생성
+
+    Args:
+        name: 모델 이름 (ridge, rf, xgb, lgb, cat, mlp)
+        n_threads: XGBoost/LightGBM/CatBoost 내부 스레드 수 (None이면 라이브러리 기본값)
+
+    Returns:
+        탐색 대상 기본 모델
+    """
+    if name == 'ridge':
+        return Ridge()
+    if name == 'rf':
+        return RandomForestRegressor(random_state=42)
+    if name == 'xgb':
+        return XGBRegressor(objective='reg:squarederror', random_state=42, n_jobs=n_threads)
+    if name == 'lgb':
+        # 조기 종료 조건 추가
+        return lgb.LGBMRegressor(random_state=42, verbose=-1, min_split_gain=0, n_jobs=n_threads)
+    if name == 'cat':
+        return CatBoostRegressor(random_state=42, verbose=0, thread_count=n_threads)
+    if name == 'mlp':
+        return MLPRegressor(random_state=42, max_iter=1500, early_stopping=True, tol=1e-3)
+    raise ValueError(f"알 수 없는 모델: {name}")
+
+def fit_with_params(name, X, y, params, n_threads=None):
+    """
+    탐색 없이 주어진 하이퍼파라미터로 모델 하나만 학습
+
+    Args:
+        name: 모델 이름 (ridge, rf, xgb, lgb, cat, mlp)
+        X: 학습 특성 데이터
+        y: 학습 타깃 데이터
+        params: 기본 모델에 덮어쓸 하이퍼파라미터
+        n_threads: XGBoost/LightGBM/CatBoost 내부 스레드 수
+
+    Returns:
+        학습된 모델
+    """
+    try:
+        model = make_base_estimator(name, n_threads)
+        model.set_params(**params)
+        model.fit(X, y)
+        return model
+    except Exception as e:
+        logger.error(f"fit_with_params({name}) 오류: {e}", exc_info=True)
+        raise e
+
+def train_ridge(X, y, n_jobs=-1, search_mode=None):
     try:
         param_grid = {'alpha': [0.0001, 0.001, 0.01, 0.1, 1, 10]}
-        ridge = Ridge()
-        grid = GridSearchCV(ridge, param_grid, cv=3, scoring='r2', n_jobs=n_jobs)
+        ridge = make_base_estimator('ridge')
+        grid = make_search('ridge', ridge, param_grid, n_jobs, search_mode=search_mode)
         grid.fit(X, y)
         return grid.best_estimator_
     except Exception as e:
@@ -40,20 +144,20 @@ def train_ridge(X, y, n_jobs=-1):
         raise e
 
 
-def train_rf(X, y):
+def train_rf(X, y, n_jobs=1, search_mode=None):
     try:
         param_grid = {'n_estimators': [50, 100],
                     'max_depth': [None, 5, 10],
                     'min_samples_split': [2, 5]}
-        rf = RandomForestRegressor(random_state=42)
-        grid = GridSearchCV(rf, param_grid, cv=3, scoring='r2', n_jobs=1)
+        rf = make_base_estimator('rf')
+        grid = make_search('rf', rf, param_grid, n_jobs, search_mode=search_mode)
         grid.fit(X, y)
         return grid.best_estimator_
     except Exception as e:
         logger.error(f"train_rf 오류: {e}", exc_info=True)
         raise e
 
-def train_xgb(X, y):
+def train_xgb(X, y, n_jobs=-1, n_threads=None, search_mode=None):
     try:
         # 하이퍼파라미터 분포 정의
         param_distributions = {
@@ -66,21 +170,10 @@ def train_xgb(X, y):
         }
         
         # XGBoost 모델 생성
-        xgb = XGBRegressor(
-            objective='reg:squarederror', 
-            random_state=42
-        )
+        xgb = make_base_estimator('xgb', n_threads)
         
-        # 랜덤 서치를 사용한 하이퍼파라미터 튜닝
-        random_search = RandomizedSearchCV(
-            estimator=xgb,
-            param_distributions=param_distributions,
-            n_iter=50,  # 탐색할 하이퍼파라미터 조합 수
-            cv=3,       # 3-fold 교차 검증
-            scoring='r2',
-            n_jobs=-1,  # 병렬 처리
-            random_state=42
-        )
+        # 랜덤 서치를 사용한 하이퍼파라미터 튜닝 (50개 조합, 3-fold 교차 검증)
+        random_search = make_search('xgb', xgb, param_distributions, n_jobs, n_iter=50, search_mode=search_mode)
         
         # 모델 훈련
         random_search.fit(X, y)
@@ -93,33 +186,28 @@ def train_xgb(X, y):
         raise e
 
 # 조기 종료 조건 추가 (LightGBM)
-def train_lgb(X, y, n_jobs=-1):
+def train_lgb(X, y, n_jobs=-1, n_threads=None, search_mode=None):
     try:
         param_grid = {'n_estimators': [50, 100],
                      'max_depth': [3, 5, 7, -1],
                      'learning_rate': [0.01, 0.1]}
         
-        # 조기 종료 조건 추가
-        lgb_model = lgb.LGBMRegressor(
-            random_state=42, 
-            verbose=-1, 
-            min_split_gain=0
-        )
+        lgb_model = make_base_estimator('lgb', n_threads)
         
-        grid = GridSearchCV(lgb_model, param_grid, cv=3, scoring='r2', n_jobs=n_jobs)
+        grid = make_search('lgb', lgb_model, param_grid, n_jobs, search_mode=search_mode)
         grid.fit(X, y)
         return grid.best_estimator_
     except Exception as e:
         logger.error(f"train_lgb 오류: {e}", exc_info=True)
         raise e
 
-def train_cat(X, y):
+def train_cat(X, y, n_jobs=1, thread_count=None, search_mode=None):
     try:
         param_grid = {'iterations': [50, 100],
                     'depth': [3, 5],
                     'learning_rate': [0.01, 0.1]}
-        cat = CatBoostRegressor(random_state=42, verbose=0)
-        grid = GridSearchCV(cat, param_grid, cv=3, scoring='r2', n_jobs=1)
+        cat = make_base_estimator('cat', thread_count)
+        grid = make_search('cat', cat, param_grid, n_jobs, search_mode=search_mode)
         grid.fit(X, y)
         return grid.best_estimator_
     except Exception as e:
@@ -127,25 +215,172 @@ def train_cat(X, y):
         raise e
         
 
-def train_mlp(X, y):
+def train_mlp(X, y, n_jobs=1, search_mode=None):
     try:
         param_grid = {'hidden_layer_sizes': [(50,), (100,)],
                     'alpha': [0.0001, 0.001]}
-        mlp = MLPRegressor(random_state=42, max_iter=1500, early_stopping=True, tol=1e-3)
-        grid = GridSearchCV(mlp, param_grid, cv=3, scoring='r2', n_jobs=1)
+        mlp = make_base_estimator('mlp')
+        grid = make_search('mlp', mlp, param_grid, n_jobs, search_mode=search_mode)
         grid.fit(X, y)
         return grid.best_estimator_
     except Exception as e:
         logger.error(f"train_mlp 오류: {e}", exc_info=True)
         raise e
 
-def train_stacking(estimators, X, y):
+class OOFStackingRegressor(RegressorMixin, BaseEstimator):
+    """
+    폴드 밖(out-of-fold) 예측으로 학습한 스태킹 앙상블
+
+    StackingRegressor(cv=3)와 같은 구조(개별 모델 예측 → Ridge 메타 모델)이지만,
+    학습 파이프라인에서는 train_stacking이 이미 전체 학습 데이터로 학습된 탐색 결과를 최종 개별 모델로 그대로 사용합니다.
+    메타 특성(폴드 밖 예측)은 개별 모델을 폴드마다 다시 학습해 한 번만 만들고, 메타 모델 학습과 스택 CV R²에 함께 사용합니다.
+    생성자 인자는 scikit-learn 추정기 규약을 따르므로 get_params/clone 후 fit으로 다시 학습할 수 있습니다.
+    """
+
+    def __init__(self, estimators, final_estimator=None, cv=3, n_jobs=1):
+        self.estimators = estimators
+        self.final_estimator = final_estimator
+        self.cv = cv
+        self.n_jobs = n_jobs
+
+    @classmethod
+    def from_oof(cls, estimators, final_estimator, oof_predictions, oof_metrics, cv_score, folds, n_jobs=1):
+        """
+        학습된 개별 모델, 학습된 메타 모델과 폴드 밖 예측 결과로 학습 완료 상태의 앙상블 생성 (재학습 없음)
+
+        Args:
+            estimators: (이름, 학습된 모델) 목록
+            final_estimator: 폴드 밖 예측으로 학습된 메타 모델
+            oof_predictions: 개별 모델 폴드 밖 예측 행렬
+            oof_metrics: 개별 모델 OOF 지표
+            cv_score: 스택 CV R²
+            folds: (train_idx, test_idx) 목록
+
+        Returns:
+            OOFStackingRegressor: 학습된 앙상블
+        """
+        stacking = cls(list(estimators), clone(final_estimator), cv=len(folds), n_jobs=n_jobs)
+        stacking.estimators_ = list(estimators)
+        stacking.final_estimator_ = final_estimator
+        stacking.oof_predictions_ = oof_predictions
+        stacking.oof_metrics_ = oof_metrics or {}
+        stacking.cv_score_ = cv_score
+        stacking.folds_ = folds
+        return stacking
+
+    def fit(self, X, y):
+        """개별 모델을 X 전체로 다시 학습한 뒤 폴드 밖 예측으로 메타 모델 학습"""
+        X = X if isinstance(X, pd.DataFrame) else pd.DataFrame(X)
+        fitted = [(name, clone(estimator).fit(X, y)) for name, estimator in self.estimators]
+        stacking = _fit_oof_stacking(fitted, X, y, n_jobs=self.n_jobs, cv=self.cv, final_estimator=self.final_estimator)
+        for name in ("estimators_", "final_estimator_", "oof_predictions_", "oof_metrics_", "cv_score_", "folds_"):
+            setattr(self, name, getattr(stacking, name))
+        return self
+
+    @property
+    def named_estimators_(self) -> dict:
+        return dict(self.estimators_)
+
+    def transform(self, X) -> np.ndarray:
+        """개별 모델 예측을 메타 특성 행렬로 변환"""
+        return np.column_stack([estimator.predict(X) for _, estimator in self.estimators_])
+
+    def predict(self, X) -> np.ndarray:
+        return self.final_estimator_.predict(self.transform(X))
+
+
+def meta_cv_score(oof: np.ndarray, y: np.ndarray, folds: list) -> float:
+    """
+    폴드 밖 예측 행렬로 메타 모델(Ridge)만 폴드별로 다시 학습해 스택 CV R² 계산
+
+    Args:
+        oof: 개별 모델 폴드 밖 예측 행렬 (행: 샘플, 열: 모델)
+        y: 타깃 배열
+        folds: (train_idx, test_idx) 목록
+
+    Returns:
+        float: 폴드 평균 R²
+    """
+    fold_scores = []
+    for train_idx, test_idx in folds:
+        meta = FinalRidge().fit(oof[train_idx], y[train_idx])
+        fold_scores.append(r2_score(y[test_idx], meta.predict(oof[test_idx])))
+    return float(np.mean(fold_scores))
+
+
+def _fit_predict_fold(estimator, X, y, train_idx, test_idx):
+    model = clone(estimator)
+    model.fit(X.iloc[train_idx], y.iloc[train_idx])
+    return model.predict(X.iloc[test_idx])
+
+
+def _fit_oof_stacking(estimators, X, y, n_jobs=1, cv=3, final_estimator=None) -> OOFStackingRegressor:
+    """
+    개별 모델을 새 KFold의 폴드마다 다시 학습해 폴드 밖 예측을 만들고, OOF 지표, 스택 CV R², 메타 모델을 계산해 앙상블 생성
+
+    하이퍼파라미터 탐색의 폴드 예측은 남지 않고 캐시된 하이퍼파라미터로 학습할 때는 탐색 자체가 없으므로,
+    폴드 밖 예측은 항상 여기서 개별 모델마다 cv회 학습해 만듭니다. 전달받은 학습된 모델은 최종 개별 모델로만 사용합니다.
+    """
+    y = pd.Series(np.asarray(y, dtype=float), index=X.index)
+    folds = list(KFold(n_splits=cv).split(X))
+
+    # 1. 개별 모델 × 폴드 학습을 한 번에 병렬 실행해 폴드 밖 예측 생성
+    fold_predictions = Parallel(n_jobs=n_jobs)(
+        delayed(_fit_predict_fold)(estimator, X, y, train_idx, test_idx)
+        for _, estimator in estimators
+        for train_idx, test_idx in folds
+    )
+    oof = np.empty((len(X), len(estimators)))
+    for i in range(len(estimators)):
+        for j, (_, test_idx) in enumerate(folds):
+            oof[test_idx, i] = fold_predictions[i * len(folds) + j]
+
+    # 2. 개별 모델 OOF 지표
+    y_true = y.to_numpy()
+    oof_metrics = {}
+    for i, (name, _) in enumerate(estimators):
+        oof_metrics[name] = {
+            "r2": float(r2_score(y_true, oof[:, i])),
+            "rmse": float(np.sqrt(mean_squared_error(y_true, oof[:, i]))),
+            "mae": float(mean_absolute_error(y_true, oof[:, i])),
+        }
+
+    # 3. 같은 폴드로 메타 모델만 다시 학습해 스택 CV R² 계산
+    cv_score = meta_cv_score(oof, y_true, folds)
+
+    # 4. 전체 폴드 밖 예측으로 최종 메타 모델 학습
+    final_estimator = (clone(final_estimator) if final_estimator is not None else FinalRidge()).fit(oof, y_true)
+    for i, (name, _) in enumerate(estimators):
+        oof_metrics[name]["meta_coef"] = float(final_estimator.coef_[i])
+
+    return OOFStackingRegressor.from_oof(estimators, final_estimator, oof, oof_metrics, cv_score, folds,
+                                         n_jobs=n_jobs)
+
+
+def train_stacking(estimators, X, y, n_jobs=1, cv=3):
+    """
+    개별 모델을 폴드마다 다시 학습해 폴드 밖 예측을 한 번 만들고, 스태킹 앙상블과 CV R²를 함께 계산
+
+    기존에는 StackingRegressor.fit(개별 모델마다 1 + cv회 학습)과
+    cross_val_score(전체 스택을 cv회 다시 학습)로 개별 모델을 (1 + cv) × (1 + cv)회 학습했습니다.
+    여기서는 개별 모델마다 cv회 학습해 폴드 밖 예측을 만들고(탐색 때의 폴드 예측을 재사용하지는 않음),
+    메타 모델 학습, 스택 CV R², 개별 모델 OOF 지표를 모두 이 예측에서 계산합니다.
+    전체 학습 데이터로 학습된 최종 개별 모델은 탐색 결과를 그대로 사용합니다.
+    (비교: benchmark_stacking.py)
+
+    Args:
+        estimators: (이름, 학습된 모델) 목록 (탐색 후 전체 학습 데이터로 학습된 모델)
+        X: 학습 특성 데이터
+        y: 학습 타깃 데이터
+        n_jobs: 폴드 학습 병렬 작업 수
+        cv: 폴드 수
+
+    Returns:
+        tuple: (OOFStackingRegressor, 스택 CV R²)
+    """
     try:
-        final_estimator = FinalRidge()
-        stacking = StackingRegressor(estimators=estimators, final_estimator=final_estimator, cv=3, n_jobs=1)
-        stacking.fit(X, y)
-        cv_score = cross_val_score(stacking, X, y, cv=3, scoring='r2', n_jobs=1).mean()
-        return stacking, cv_score
+        stacking = _fit_oof_stacking(list(estimators), X, y, n_jobs=n_jobs, cv=cv)
+        return stacking, stacking.cv_score_
     except Exception as e:
         logger.error(f"train_stacking 오류: {e}", exc_info=True)
-        raise e
\ No newline at end of file
+        raise e
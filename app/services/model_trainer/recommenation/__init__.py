@@ -1,12 +1,17 @@
 # 추가: train_model 함수를 export
 # app/services/model_trainer/recommendation/__init__.py
 
-from .basic import calculate_category_diversity_bonus, generate_recommendations
+from .basic import generate_recommendations, rank_recommendations, rank_recommendations_batch
+from .score_table import RestaurantScoreTable
+from .diversity import calculate_category_diversity_bonus
 from .cold_start import enhance_cold_start_recommendations
 from .hybrid import build_hybrid_recommender, generate_hybrid_recommendations
 
 __all__ = [
     'generate_recommendations',
+    'rank_recommendations',
+    'rank_recommendations_batch',
+    'RestaurantScoreTable',
     'calculate_category_diversity_bonus',
     'enhance_cold_start_recommendations',
     'build_hybrid_recommender',
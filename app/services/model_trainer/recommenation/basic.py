@@ -1,18 +1,21 @@
 # app/services/model_trainer/recommendation/basic.py
 
-from app.setting import A_VALUE, B_VALUE, REVIEW_WEIGHT, CAUTION_WEIGHT, CONVENIENCE_WEIGHT
+from app.setting import A_VALUE, B_VALUE, RECOMMEND_TOP_K, RECOMMEND_BATCH_CHUNK_SIZE
 import numpy as np
-import json
 import pandas as pd
 import logging
-from .diversity import calculate_category_diversity_bonus
-from .cold_start import enhance_cold_start_recommendations
+from .cold_start import find_user_preferred_category
+from .scoring import IMPORTANT_CATEGORIES
+from .score_table import RestaurantScoreTable
+from app.services.preprocess.user.user_feature_store import UserFeatureStore, as_user_feature_store
+from app.schema.recommendation_schema import RecommendationResponse
 
 logger = logging.getLogger(__name__)
 
 def compute_composite_score(row, review_weight, caution_weight, convenience_weight):
     """
-    복합 점수 계산 함수
+    복합 점수 계산 함수 (단일 행 기준)
+    추천 생성 시에는 RestaurantScoreTable이 scoring.compute_composite_scores로 전체 행을 한 번에 계산합니다.
     
     Args:
         row: 데이터 행
@@ -44,7 +47,7 @@ def sigmoid_transform(x, a, b):
     시그모이드 변환 함수
     
     Args:
-        x: 입력 값
+        x: 입력 값 (스칼라 또는 NumPy 배열)
         a: 시그모이드 기울기 파라미터
         b: 시그모이드 중심점 파라미터
         
@@ -59,172 +62,259 @@ def sigmoid_transform(x, a, b):
         raise e
 
 
-def generate_recommendations(data_filtered: pd.DataFrame, stacking_reg, model_features: list, user_id: str, scaler, user_features: pd.DataFrame = None) -> dict:
+def rank_recommendations(score_table: RestaurantScoreTable, user_id: str, category_ids: list = None,
+                         user_store: UserFeatureStore = None, top_k: int = RECOMMEND_TOP_K) -> RecommendationResponse:
     """
-    사용자 ID와 식당 데이터를 기반으로 개인화된 추천 생성
+    미리 계산된 식당 점수 테이블에 사용자별 보너스를 적용하여 개인화된 추천 생성
     신규 사용자의 경우 사용자 특성 없이도 카테고리 기반 추천 제공
+    사용자 1명짜리 배치로 _rank_chunk에 위임합니다.
     
     Args:
-        data_filtered: 필터링된 식당 데이터 DataFrame
-        stacking_reg: 학습된, 적재된 스태킹 모델
-        model_features: 모델 학습에 사용된 특성 목록
+        score_table: 모델 로드 시 생성된 식당 점수 테이블
         user_id: 사용자 ID
-        scaler: 특성 스케일링에 사용된 스케일러
-        user_features: 전처리된 사용자 특성 데이터 DataFrame (없으면 신규 사용자로 간주)
+        category_ids: 추천 대상 카테고리 ID 목록 (None이면 전체 식당)
+        user_store: 사용자 특성 저장소 (없거나 사용자가 없으면 신규 사용자로 간주)
+        top_k: 추천할 식당 수
         
     Returns:
-        dict: 추천 결과를 담은 JSON 문자열
+        RecommendationResponse: 추천 결과 객체 (user, is_new_user, recommendations)
     """
     try:
-        # 사용자 유형 확인 (기존/신규)
-        is_new_user = True
-        user_row = None
-        
         # 사용자 ID를 문자열로 변환
         user_id_str = str(user_id)
         logger.info(f"사용자 ID(str): {user_id_str}의 추천 생성 시작")
         
-        if user_features is not None and not user_features.empty:
-            # 디버깅을 위한 사용자 ID 목록과 타입 로깅
-            sample_ids = user_features['user_id'].head(5).values
-            
-            # 모든 ID를 문자열로 변환하여 비교
-            user_features['user_id_str'] = user_features['user_id'].astype(str)
-            
-            # 변환된 ID로 검색
-            matching_rows = user_features[user_features['user_id_str'] == user_id_str]
-            
-            if not matching_rows.empty:
-                is_new_user = False
-                user_row = matching_rows.iloc[0:1]  # 첫 번째 일치 행만 사용
-                
-                # 가격 필터링 (기존 사용자만)
-                if 'max_price' in user_row.columns and 'price' in data_filtered.columns:
-                    max_price = user_row['max_price'].values[0]
-                    if max_price > 0:
-                        data_filtered = data_filtered[data_filtered['price'] <= max_price].copy()
-            else:
-                logger.info(f"ID {user_id_str}의 사용자 데이터를 찾을 수 없음 - 카테고리 기반 기본 추천 생성")
-        else:
+        if user_store is None or len(user_store) == 0:
             logger.info("사용자 특성 데이터가 없음 - 카테고리 기반 기본 추천 생성")
+        elif user_id not in user_store:
+            logger.info(f"ID {user_id_str}의 사용자 데이터를 찾을 수 없음 - 카테고리 기반 기본 추천 생성")
         
-        # 카테고리 보너스 점수 초기화 (기존/신규 사용자 모두 적용)
-        data_filtered['category_bonus'] = 0.0
+        result = _rank_chunk(score_table, [(user_id, category_ids, top_k)], user_store)[0]
         
-        # 선호 카테고리 보너스 적용 로직
-        if not is_new_user and user_row is not None:
-            # 기존 사용자: 선호 카테고리 데이터 기반 보너스
-            for i in range(1, 13):
-                category_col = f"category_{i}"
-                if category_col in user_row.columns and user_row[category_col].values[0] == 1:
-                    data_filtered.loc[data_filtered['category_id'] == i, 'category_bonus'] = 0.3
-                    
-                    if i in [4, 7, 9, 10]:  # 중요 카테고리
-                        data_filtered.loc[data_filtered['category_id'] == i, 'category_bonus'] += 0.2
-        else:
-            # 신규 사용자: 필터링된 모든 식당은 사용자가 선택한 카테고리에 해당
-            # 모든 식당에 동일한 카테고리 보너스 부여
-            data_filtered['category_bonus'] = 0.3
-
-        # 카테고리 다양성 보너스 추가
-        data_filtered = calculate_category_diversity_bonus(data_filtered)
-        
-        # 카테고리 다양성 보너스 통합 (10% 가중)
-        data_filtered['category_bonus'] += data_filtered.get('category_diversity_bonus', 0) * 0.1
+        logger.info(f"{'신규' if result.is_new_user else '기존'} 사용자 추천 결과 생성 완료")
+        return result
+    
+    except Exception as e:
+        logger.error(f"rank_recommendations 오류: {e}", exc_info=True)
+        raise e
 
-        # 모델 예측을 위한 피처 준비 (기존/신규 사용자 모두 동일)
-        for feature in model_features:
-            if feature not in data_filtered.columns:
-                data_filtered[feature] = 0
 
-        data_filtered = data_filtered.reset_index(drop=True)
-        X_pred = data_filtered[model_features].copy()
-        X_pred_scaled = pd.DataFrame(scaler.transform(X_pred), columns=X_pred.columns)
+def rank_recommendations_batch(score_table: RestaurantScoreTable, requests: list,
+                               user_store: UserFeatureStore = None,
+                               chunk_size: int = RECOMMEND_BATCH_CHUNK_SIZE) -> list:
+    """
+    여러 사용자의 추천을 사용자 × 후보 식당 행렬 연산으로 한 번에 생성
+    요청된 카테고리 합집합의 행을 한 번만 gather하고, 메모리 사용량을 제한하기 위해 chunk_size명씩 나누어 계산합니다.
+    
+    Args:
+        score_table: 모델 로드 시 생성된 식당 점수 테이블
+        requests: (user_id, category_ids, top_k) 튜플 목록
+        user_store: 사용자 특성 저장소 (옵션)
+        chunk_size: 한 번에 계산할 사용자 수
+        
+    Returns:
+        list: 요청 순서대로 RecommendationResponse 또는 해당 요청 처리 중 발생한 예외
+    """
+    results = []
+    for start in range(0, len(requests), max(1, chunk_size)):
+        chunk = requests[start:start + max(1, chunk_size)]
+        try:
+            results.extend(_rank_chunk(score_table, chunk, user_store))
+        except Exception as e:
+            logger.error(f"배치 추천 생성 오류 ({len(chunk)}명): {e}", exc_info=True)
+            results.extend([e] * len(chunk))
+    
+    new_users = sum(1 for result in results if not isinstance(result, Exception) and result.is_new_user)
+    logger.info(f"배치 추천 결과 생성 완료: {len(requests)}명 (신규 사용자 {new_users}명)")
+    return results
 
-        # 모델 예측 수행
-        data_filtered['predicted_score'] = stacking_reg.predict(X_pred_scaled)
-        data_filtered['final_score'] = data_filtered['score']
 
-        # 유의사항 관련 컬럼 확인
-        for col in ['caution_배달가능', 'caution_예약가능', 'caution_포장가능',
-                    'caution_배달불가', 'caution_예약불가', 'caution_포장불가']:
-            if col not in data_filtered.columns:
-                data_filtered[col] = 0
+def _user_feature_vector(user_store: UserFeatureStore, user_rows: np.ndarray, name: str):
+    """사용자별 특성 값 벡터 (특성이 없으면 None, 신규 사용자는 NaN)"""
+    column = user_store.column(name) if user_store is not None else None
+    if column is None:
+        return None
+    return np.where(user_rows < 0, np.nan, column[np.maximum(user_rows, 0)])
 
-        data_filtered['review'] = pd.to_numeric(data_filtered['review'], errors='coerce')
 
-        # 기본 점수 계산 (기존/신규 사용자 모두 동일)
-        data_filtered['composite_score'] = data_filtered.apply(
-            lambda row: compute_composite_score(row, REVIEW_WEIGHT, CAUTION_WEIGHT, CONVENIENCE_WEIGHT), axis=1
+def _rank_chunk(score_table: RestaurantScoreTable, requests: list, user_store: UserFeatureStore) -> list:
+    """
+    사용자 × 후보 식당 행렬에 사용자별 보너스를 적용하고 사용자별 상위 top_k개 추천 결과 생성
+    단일 사용자 경로와 같은 순서로 연산하므로 사용자 1명으로 계산한 결과와 동일합니다.
+    """
+    # 1. 요청된 카테고리 합집합의 후보 행 선택 (카테고리 인덱스 gather)
+    if any(category_ids is None for _, category_ids, _ in requests):
+        union_rows = score_table.all_rows()
+    else:
+        union_rows = score_table.rows_for_categories(
+            {cat for _, category_ids, _ in requests for cat in category_ids}
         )
+    candidate_categories = score_table['category_id'][union_rows]
+    review = score_table['review'][union_rows]
+    n_users, n_candidates = len(requests), len(union_rows)
+    
+    # 2. 사용자 유형 확인 (기존/신규) - 저장소 색인으로 O(1) 조회
+    has_store = user_store is not None and len(user_store) > 0
+    if has_store:
+        user_rows = user_store.lookup_many([user_id for user_id, _, _ in requests])
+    else:
+        user_rows = np.full(n_users, -1, dtype=np.intp)
+    is_new_user = user_rows < 0
+    is_existing = ~is_new_user
+    
+    # 3. 사용자별 후보 마스크 (요청 카테고리 + 기존 사용자 가격 필터링)
+    category_values, category_codes = np.unique(candidate_categories, return_inverse=True)
+    requested = np.ones((n_users, len(category_values)), dtype=bool)
+    for u, (_, category_ids, _) in enumerate(requests):
+        if category_ids is not None:
+            requested[u] = np.isin(category_values, list(category_ids))
+    mask = requested[:, category_codes]
+    
+    max_price = _user_feature_vector(user_store, user_rows, 'max_price') if has_store else None
+    price_filtered = np.zeros(n_users, dtype=bool)
+    if max_price is not None and 'price' in score_table:
+        price_filtered = is_existing & (max_price > 0)
+        if price_filtered.any():
+            price = score_table['price'][union_rows]
+            mask[price_filtered] &= price[None, :] <= max_price[price_filtered, None]
+    
+    # 4. 카테고리 다양성 보너스 (사용자별 후보 집합 안에서의 카테고리 희소성)
+    # 가격 필터링이 없으면 카테고리별 후보 수는 요청 카테고리의 전체 식당 수와 같음
+    per_category = requested * np.bincount(category_codes, minlength=len(category_values))
+    for u in np.flatnonzero(price_filtered):
+        per_category[u] = np.bincount(category_codes[mask[u]], minlength=len(category_values))
+    n_rows = per_category.sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        diversity = 1 - per_category[:, category_codes] / n_rows[:, None]
+    
+    # 5. 선호 카테고리 보너스 (신규 사용자는 필터링된 모든 식당에 동일한 보너스)
+    category_bonus = np.full((n_users, n_candidates), 0.3)
+    if is_existing.any():
+        preferred = np.zeros((n_users, len(category_values)), dtype=bool)
+        for i in range(1, 13):
+            values = _user_feature_vector(user_store, user_rows, f"category_{i}")
+            if values is not None:
+                preferred[:, category_values == i] = (values == 1)[:, None]
+        important = np.isin(category_values, IMPORTANT_CATEGORIES)
+        existing_bonus = np.where(preferred, 0.3, 0.0) + np.where(preferred & important, 0.2, 0.0)
+        category_bonus[is_existing] = existing_bonus[is_existing][:, category_codes]
+    
+    # 카테고리 다양성 보너스 통합 (10% 가중)
+    category_bonus += diversity * 0.1
+    
+    # 기본 점수(모델 로드 시 계산)에 카테고리 보너스 적용
+    composite_score = score_table['base_composite_score'][union_rows][None, :] + category_bonus
+    
+    # 6. 기존 사용자만을 위한 추가 개인화 점수
+    completed_reservations = _user_feature_vector(user_store, user_rows, 'completed_reservations') if has_store else None
+    if completed_reservations is not None and is_existing.any():
+        reservation_users = is_existing & (completed_reservations > 3)
+        if reservation_users.any():
+            composite_score[reservation_users] += np.where(score_table['reservable'][union_rows] == 1, 0.2, 0.0)
+        
+        ratio = _user_feature_vector(user_store, user_rows, 'like_to_reservation_ratio')
+        if ratio is not None:
+            # 찜/예약 비율에 따른 세분화된 보너스 로직
+            bonus_multiplier = np.where(ratio < 1.0, 0.05, np.where(ratio < 2.0, 0.1, 0.15))
+            popularity = np.log(review + 1) / np.log(1000)
+            composite_score[is_existing] += bonus_multiplier[is_existing, None] * popularity[None, :]
+    
+    # 7. 신규 사용자를 위한 추가 처리: 콜드 스타트 보너스 (사용자별 후보 집합 기준 정규화)
+    new_users = np.flatnonzero(is_new_user)
+    if len(new_users) and n_candidates:
+        new_mask = mask[new_users]
+        cold_start_bonus = diversity[new_users] * 0.15
         
-        # 카테고리 보너스 적용
-        data_filtered['composite_score'] += data_filtered['category_bonus']
+        preferred_category = [find_user_preferred_category(user_store, requests[u][0]) for u in new_users]
+        for i, category in enumerate(preferred_category):
+            if category is not None:
+                cold_start_bonus[i] += np.where(candidate_categories == category, 0.4, 0.0)
         
-        # 기존 사용자만을 위한 추가 개인화 점수
-        if not is_new_user and 'completed_reservations' in user_row.columns:
-            completed_reservations = user_row['completed_reservations'].values[0]
-            if completed_reservations > 3:
-                data_filtered.loc[data_filtered['caution_예약가능'] == 1, 'composite_score'] += 0.2
-            
-            if 'like_to_reservation_ratio' in user_row.columns:
-                ratio = user_row['like_to_reservation_ratio'].values[0]
-                # 찜/예약 비율에 따른 세분화된 보너스 로직
-                if ratio < 1.0:
-                    bonus_multiplier = 0.05
-                elif 1.0 <= ratio < 2.0:
-                    bonus_multiplier = 0.1
-                else:
-                    bonus_multiplier = 0.15
-                
-                data_filtered['popularity_bonus'] = bonus_multiplier * (
-                    np.log(data_filtered['review'] + 1) / np.log(1000)
-                )
-                data_filtered['composite_score'] += data_filtered['popularity_bonus']
+        # 인기도 보너스 (로그 스케일), 운영 시간 보너스, 편의시설 보너스
+        cold_start_bonus += _scale_by_user_max(review, new_mask, 0.2, transform=np.log1p)
+        if 'duration_hours' in score_table:
+            cold_start_bonus += _scale_by_user_max(score_table['duration_hours'][union_rows], new_mask, 0.1)
+        cold_start_bonus += score_table['convenience_count'][union_rows][None, :] * 0.05
         
-        # 신규 사용자를 위한 추가 처리: 리뷰 수에 약간의 가중치
-        elif is_new_user:
-            data_filtered = enhance_cold_start_recommendations(data_filtered, user_id, user_features)
+        composite_score[new_users] += cold_start_bonus
+    
+    # 8. 최종 점수 시그모이드 변환
+    with np.errstate(over='ignore', invalid='ignore'):
+        composite_score = sigmoid_transform(composite_score, A_VALUE, B_VALUE)
+    
+    # 9. 사용자별 restaurant_id 기준 중복 제거 후 composite_score 상위 top_k개 부분 선택
+    results = []
+    for u, (user_id, _, top_k) in enumerate(requests):
+        positions = np.flatnonzero(mask[u])
+        rows, scores = union_rows[positions], composite_score[u, positions]
+        top = score_table.select_top_k(rows, scores, top_k)
+        results.append(_build_response(score_table, user_id, is_new_user[u], rows[top], scores[top]))
+    return results
 
-        # 최종 점수 시그모이드 변환
-        data_filtered['composite_score'] = data_filtered['composite_score'].apply(
-            lambda x: sigmoid_transform(x, A_VALUE, B_VALUE)
-        )
 
-        # composite_score 기준 내림차순 정렬
-        recommendations_all = data_filtered.sort_values(by='composite_score', ascending=False)
+def _scale_by_user_max(values: np.ndarray, mask: np.ndarray, weight: float, transform=None) -> np.ndarray:
+    """사용자별 후보 중 최대값으로 나눈 값에 가중치를 곱한 행렬 (최대값이 0 이하이면 0)"""
+    # NaN은 무시하고 사용자별 후보 집합 안에서 최대값 계산
+    max_values = np.fmax.reduce(np.where(mask, values[None, :], np.nan), axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if transform is not None:
+            scaled = (transform(values)[None, :] / transform(max_values)[:, None]) * weight
+        else:
+            scaled = (values[None, :] / max_values[:, None]) * weight
+    scaled[~(max_values > 0)] = 0.0
+    return scaled
 
-        # 중복 제거를 위해 restaurant_id를 기준으로 첫 번째 레코드만 유지
-        recommendations_all = recommendations_all.drop_duplicates(subset=['restaurant_id'], keep='first')
 
-        # 상위 15개 추천 추출
-        top15 = recommendations_all[['category_id', 'restaurant_id', 'score', 'predicted_score', 'composite_score']].head(15).copy()
-        
-        # 결과 포맷팅
-        top15['category_id'] = top15['category_id'].astype(int)
-        top15['restaurant_id'] = top15['restaurant_id'].astype(int)
-        top15['score'] = top15['score'].astype(float)
-        top15['predicted_score'] = top15['predicted_score'].round(3)
-        top15['composite_score'] = top15['composite_score'].round(3)
-
-        # 결과 딕셔너리 생성
-        result_dict = {
-            "user": user_id,
-            "is_new_user": is_new_user,  # 신규 사용자 여부 표시 (옵션)
-            "recommendations": json.loads(top15.to_json(orient='records', force_ascii=False))
+def _build_response(score_table: RestaurantScoreTable, user_id, is_new_user, top_rows: np.ndarray,
+                    top_scores: np.ndarray) -> RecommendationResponse:
+    """선택된 행으로 추천 결과 객체 생성"""
+    # 결과 포맷팅
+    recommendations = [
+        {
+            "category_id": category_id,
+            "restaurant_id": restaurant_id,
+            "score": score,
+            "predicted_score": predicted_score,
+            "composite_score": final_score
         }
-
-        # JSON 문자열 변환
-        result_json = json.dumps(
-            result_dict,
-            ensure_ascii=False,
-            indent=4,
-            default=lambda o: int(o) if isinstance(o, np.int64) else o
+        for category_id, restaurant_id, score, predicted_score, final_score in zip(
+            score_table['category_id'][top_rows].astype(int).tolist(),
+            score_table['restaurant_id'][top_rows].astype(int).tolist(),
+            score_table['score'][top_rows].tolist(),
+            np.round(score_table['predicted_score'][top_rows], 3).tolist(),
+            np.round(top_scores, 3).tolist()
         )
+    ]
+    
+    # 결과 객체 생성 (pydantic-core에서 한 번에 검증, 직렬화는 호출하는 쪽에서 한 번만 수행)
+    return RecommendationResponse.model_validate({
+        "user": user_id.item() if isinstance(user_id, np.generic) else user_id,
+        "is_new_user": bool(is_new_user),  # 신규 사용자 여부 표시 (옵션)
+        "recommendations": recommendations
+    })
 
-        logger.info(f"{'신규' if is_new_user else '기존'} 사용자 추천 결과 생성 완료")
-        return result_json
+
+def generate_recommendations(data_filtered: pd.DataFrame, stacking_reg, model_features: list, user_id: str, scaler, user_features=None) -> RecommendationResponse:
+    """
+    사용자 ID와 식당 데이터를 기반으로 개인화된 추천 생성
+    신규 사용자의 경우 사용자 특성 없이도 카테고리 기반 추천 제공
+    주어진 데이터로 점수 테이블을 만든 뒤 rank_recommendations로 순위를 계산합니다.
+    
+    Args:
+        data_filtered: 필터링된 식당 데이터 DataFrame
+        stacking_reg: 학습된, 적재된 스태킹 모델
+        model_features: 모델 학습에 사용된 특성 목록
+        user_id: 사용자 ID
+        scaler: 특성 스케일링에 사용된 스케일러
+        user_features: 전처리된 사용자 특성 데이터 DataFrame 또는 사용자 특성 저장소 (없으면 신규 사용자로 간주)
+        
+    Returns:
+        RecommendationResponse: 추천 결과 객체
+    """
+    try:
+        score_table = RestaurantScoreTable.build(data_filtered, stacking_reg, model_features, scaler)
+        return rank_recommendations(score_table, user_id, user_store=as_user_feature_store(user_features))
     
     except Exception as e:
         logger.error(f"generate_recommendations 오류: {e}", exc_info=True)
-        raise e
\ No newline at end of file
+        raise e
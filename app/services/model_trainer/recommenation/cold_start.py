@@ -3,109 +3,133 @@
 import numpy as np
 import pandas as pd
 import logging
+from .diversity import compute_category_diversity_bonus
+from .scoring import get_convenience_columns
+from app.services.preprocess.user.user_feature_store import as_user_feature_store
 
 logger = logging.getLogger(__name__)
 
+def find_user_preferred_category(user_store, user_id):
+    """
+    사용자 특성 저장소에서 첫 번째 선호 카테고리 값을 찾는 함수
+
+    Args:
+        user_store: 사용자 특성 저장소 (옵션)
+        user_id: 사용자 ID
+
+    Returns:
+        선호 카테고리 값 (없으면 None)
+    """
+    if user_store is None or user_id not in user_store:
+        return None
+
+    # 선호 카테고리 정보 추출
+    for col in user_store.feature_names_with_prefix('preferred_category'):
+        value = user_store.get(user_id, col)
+        if value is not None and not pd.isna(value):
+            return value
+    return None
+
+def compute_cold_start_bonuses(category_ids, review, duration_hours=None, convenience_count=None,
+                               preferred_category=None, category_counts=None):
+    """
+    신규 사용자용 보너스 점수를 배열 연산으로 계산하는 함수
+
+    Args:
+        category_ids: 행별 카테고리 ID 배열
+        review: 행별 리뷰 수 배열
+        duration_hours: 행별 운영 시간 배열 (옵션)
+        convenience_count: 행별 편의시설 수 배열 (옵션)
+        preferred_category: 사용자 선호 카테고리 (옵션)
+        category_counts: 카테고리별 식당 수 딕셔너리 (미리 계산된 값이 있으면 사용)
+
+    Returns:
+        dict: 보너스 항목별 배열과 합계(cold_start_bonus)
+    """
+    review = np.asarray(review, dtype=float)
+    bonuses = {}
+
+    # 1. 카테고리 다양성 강화 (희소 카테고리에 높은 점수, 다양성 가중치 증가)
+    bonuses['enhanced_diversity_bonus'] = compute_category_diversity_bonus(category_ids, category_counts) * 0.15
+
+    # 2. 선호 카테고리 보너스
+    if preferred_category is not None:
+        bonuses['preferred_category_bonus'] = np.where(np.asarray(category_ids) == preferred_category, 0.4, 0.0)
+
+    # 3. 인기도 기반 보너스 - 로그 스케일링으로 극단값 완화
+    max_review = np.nanmax(review) if len(review) else 0
+    if max_review > 0:
+        bonuses['popularity_bonus'] = (np.log1p(review) / np.log1p(max_review)) * 0.2
+    else:
+        bonuses['popularity_bonus'] = 0
+
+    # 4. 운영 시간 보너스 (운영 시간이 긴 식당 가중치)
+    if duration_hours is not None:
+        duration_hours = np.asarray(duration_hours, dtype=float)
+        max_duration = np.nanmax(duration_hours) if len(duration_hours) else 0
+        if max_duration > 0:
+            bonuses['duration_bonus'] = (duration_hours / max_duration) * 0.1
+        else:
+            bonuses['duration_bonus'] = 0
+    else:
+        bonuses['duration_bonus'] = 0
+
+    # 5. 편의시설 수 기반 보너스
+    if convenience_count is not None:
+        bonuses['convenience_bonus'] = np.asarray(convenience_count, dtype=float) * 0.05
+    else:
+        bonuses['convenience_bonus'] = 0
+
+    # 6. 모든 보너스 합산
+    bonuses['cold_start_bonus'] = (
+        bonuses['enhanced_diversity_bonus'] +
+        bonuses.get('preferred_category_bonus', 0) +
+        bonuses['popularity_bonus'] +
+        bonuses['duration_bonus'] +
+        bonuses['convenience_bonus']
+    )
+    return bonuses
+
 def enhance_cold_start_recommendations(data_filtered, user_id, user_features_df=None):
     """
     신규 사용자를 위한 추천 로직을 강화하는 함수
-    
+
     Args:
         data_filtered: 필터링된 식당 데이터
         user_id: 사용자 ID
-        user_features_df: 사용자 특성 데이터 (옵션)
-        
+        user_features_df: 사용자 특성 데이터 또는 사용자 특성 저장소 (옵션)
+
     Returns:
         pd.DataFrame: 향상된 추천 점수가 포함된 데이터프레임
     """
     try:
         logger.debug(f"신규 사용자 {user_id}를 위한 강화된 추천 로직 적용")
-        
-        # 1. 카테고리 다양성 강화
-        # 각 카테고리별 고르게 추천하도록 조정
-        category_counts = data_filtered['category_id'].value_counts()
-        total_restaurants = len(data_filtered)
-        
-        # 다양성 점수 계산 (희소 카테고리에 높은 점수)
-        diversity_score = 1 - (category_counts / total_restaurants)
-        category_diversity_map = diversity_score.to_dict()
-        
-        # 다양성 점수 적용 (기존 category_diversity_bonus 강화)
-        data_filtered['enhanced_diversity_bonus'] = data_filtered['category_id'].map(
-            category_diversity_map
-        ).fillna(0) * 0.15  # 다양성 가중치 증가
-        
-        # 2. 사용자 선호도 분석 (있는 경우)
-        user_preferred_category = None
-        if user_features_df is not None:
-            # 문자열로 변환하여 비교
-            user_id_str = str(user_id)
-            user_features_df['user_id_str'] = user_features_df['user_id'].astype(str)
-            user_data = user_features_df[user_features_df['user_id_str'] == user_id_str]
-            
-            if not user_data.empty:
-                # 선호 카테고리 정보 추출
-                preferred_cols = [col for col in user_data.columns if col.startswith('preferred_category')]
-                for col in preferred_cols:
-                    if col in user_data.columns and not pd.isna(user_data[col].iloc[0]):
-                        user_preferred_category = user_data[col].iloc[0]
-                        break
-        
-        # 선호 카테고리 보너스 적용
-        if user_preferred_category is not None:
-            # 선호 카테고리 식당에 가중치 부여
-            data_filtered['preferred_category_bonus'] = 0.0
-            data_filtered.loc[data_filtered['category_id'] == user_preferred_category, 'preferred_category_bonus'] = 0.4
-        
-        # 3. 인기도 기반 보너스 (신규 사용자용)
-        # 리뷰 수 기반 인기도 - 로그 스케일링으로 극단값 완화
-        max_review = data_filtered['review'].max()
-        if max_review > 0:
-            data_filtered['popularity_bonus'] = (
-                np.log1p(data_filtered['review']) / np.log1p(max_review)
-            ) * 0.2
-        else:
-            data_filtered['popularity_bonus'] = 0
-        
-        # 4. 운영 시간 보너스
-        if 'duration_hours' in data_filtered.columns:
-            # 운영 시간이 긴 식당 가중치
-            max_duration = data_filtered['duration_hours'].max()
-            if max_duration > 0:
-                data_filtered['duration_bonus'] = (
-                    data_filtered['duration_hours'] / max_duration
-                ) * 0.1
-            else:
-                data_filtered['duration_bonus'] = 0
-        else:
-            data_filtered['duration_bonus'] = 0
-        
-        # 5. 편의시설 보너스
-        convenience_cols = [col for col in data_filtered.columns if col.startswith('conv_') 
-                           and col != 'conv_편의시설 정보 없음']
-        
-        if convenience_cols:
-            # 편의시설 수 기반 보너스
-            data_filtered['convenience_bonus'] = data_filtered[convenience_cols].sum(axis=1) * 0.05
-        else:
-            data_filtered['convenience_bonus'] = 0
-        
-        # 6. 모든 보너스 합산하여 최종 점수에 추가
-        cold_start_bonus = (
-            data_filtered.get('enhanced_diversity_bonus', 0) +
-            data_filtered.get('preferred_category_bonus', 0) +
-            data_filtered.get('popularity_bonus', 0) +
-            data_filtered.get('duration_bonus', 0) +
-            data_filtered.get('convenience_bonus', 0)
+
+        convenience_cols = get_convenience_columns(data_filtered.columns)
+        bonuses = compute_cold_start_bonuses(
+            data_filtered['category_id'].to_numpy(),
+            data_filtered['review'].to_numpy(dtype=float),
+            duration_hours=(
+                data_filtered['duration_hours'].to_numpy(dtype=float)
+                if 'duration_hours' in data_filtered.columns else None
+            ),
+            convenience_count=(
+                data_filtered[convenience_cols].sum(axis=1).to_numpy(dtype=float)
+                if convenience_cols else None
+            ),
+            preferred_category=find_user_preferred_category(as_user_feature_store(user_features_df), user_id)
         )
-        
+
+        for name, values in bonuses.items():
+            data_filtered[name] = values
+
         # 기존 composite_score에 추가
-        data_filtered['cold_start_bonus'] = cold_start_bonus
+        cold_start_bonus = data_filtered['cold_start_bonus']
         data_filtered['composite_score'] += cold_start_bonus
-        
+
         logger.debug(f"신규 사용자 추천 강화 완료: 평균 보너스 점수 {cold_start_bonus.mean():.4f}")
         return data_filtered
-        
+
     except Exception as e:
         logger.error(f"신규 사용자 추천 강화 중 오류: {e}", exc_info=True)
-        return data_filtered
\ No newline at end of file
+        return data_filtered
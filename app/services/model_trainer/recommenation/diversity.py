@@ -1,5 +1,6 @@
 # app/services/model_trainer/recommendation/diversity.py
 
+import numpy as np
 import pandas as pd
 import logging
 
@@ -33,4 +34,31 @@ def calculate_category_diversity_bonus(data_filtered):
     
     except Exception as e:
         logger.error(f"calculate_category_diversity_bonus 오류: {e}", exc_info=True)
-        return data_filtered
\ No newline at end of file
+        return data_filtered
+
+
+def compute_category_diversity_bonus(category_ids, category_counts=None) -> np.ndarray:
+    """
+    카테고리 희소성 기반 다양성 보너스를 배열 연산으로 계산
+    
+    Args:
+        category_ids: 행별 카테고리 ID 배열
+        category_counts: 카테고리별 식당 수 딕셔너리 (미리 계산된 값이 있으면 사용)
+    
+    Returns:
+        np.ndarray: 행별 다양성 보너스
+    """
+    category_ids = np.asarray(category_ids)
+    if len(category_ids) == 0:
+        return np.zeros(0, dtype=float)
+    
+    if category_counts is None:
+        categories, inverse, counts = np.unique(category_ids, return_inverse=True, return_counts=True)
+        return 1 - (counts[inverse] / len(category_ids))
+    
+    # 미리 계산된 카테고리별 식당 수로 보너스 조회 (카테고리 ID는 0 이상의 정수)
+    total_restaurants = sum(category_counts.values())
+    bonus_lookup = np.zeros(max(category_counts) + 1, dtype=float)
+    for cat, count in category_counts.items():
+        bonus_lookup[cat] = 1 - (count / total_restaurants)
+    return bonus_lookup[category_ids]
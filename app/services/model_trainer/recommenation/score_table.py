@@ -0,0 +1,164 @@
+# app/services/model_trainer/recommendation/score_table.py
+
+from app.setting import REVIEW_WEIGHT, CAUTION_WEIGHT, CONVENIENCE_WEIGHT
+import numpy as np
+import pandas as pd
+import logging
+from .scoring import compute_composite_scores, get_convenience_columns
+
+logger = logging.getLogger(__name__)
+
+
+class RestaurantScoreTable:
+    """
+    사용자와 무관한 식당별 점수를 모델 로드 시 한 번 계산해 두는 배열 기반 테이블
+
+    예측 점수(predicted_score), 기본 복합 점수(base_composite_score)와
+    사용자별 보너스 계산에 필요한 컬럼을 NumPy 배열로 보관하고,
+    카테고리별 행 인덱스를 미리 만들어 요청 시에는 배열 gather만 수행합니다.
+    """
+
+    def __init__(self, columns: dict, category_index: dict):
+        self.columns = columns
+        self.category_index = category_index
+        # 카테고리별 식당 수 (다양성 보너스 계산용)
+        self.category_counts = {cat: len(rows) for cat, rows in category_index.items()}
+        # 행별 고유 식당 번호 (여러 카테고리에 속한 식당의 중복 제거용)
+        unique_ids, self.columns['restaurant_index'] = np.unique(columns['restaurant_id'], return_inverse=True)
+        self.n_restaurants = len(unique_ids)
+
+    def __len__(self):
+        return len(self.columns['restaurant_id'])
+
+    def __getitem__(self, name) -> np.ndarray:
+        return self.columns[name]
+
+    def __contains__(self, name) -> bool:
+        return name in self.columns
+
+    @classmethod
+    def build(cls, df_model: pd.DataFrame, stacking_reg, model_features: list, scaler) -> "RestaurantScoreTable":
+        """
+        식당 데이터 전체에 대해 모델 예측과 기본 복합 점수를 계산하여 테이블 생성
+
+        Args:
+            df_model: 식당 데이터 DataFrame
+            stacking_reg: 학습된 스태킹 모델
+            model_features: 모델 학습에 사용된 특성 목록
+            scaler: 특성 스케일링에 사용된 스케일러
+
+        Returns:
+            RestaurantScoreTable: 점수 테이블
+        """
+        try:
+            frame = df_model.reset_index(drop=True).copy()
+
+            # 모델 예측을 위한 피처 준비 (없는 피처는 0으로 채움)
+            for feature in model_features:
+                if feature not in frame.columns:
+                    frame[feature] = 0
+
+            X_pred = frame[model_features]
+            X_pred_scaled = pd.DataFrame(scaler.transform(X_pred), columns=X_pred.columns)
+            predicted_score = np.asarray(stacking_reg.predict(X_pred_scaled), dtype=float)
+
+            frame['final_score'] = frame['score']
+            frame['review'] = pd.to_numeric(frame['review'], errors='coerce')
+            base_composite_score = compute_composite_scores(
+                frame, REVIEW_WEIGHT, CAUTION_WEIGHT, CONVENIENCE_WEIGHT
+            )
+
+            conv_cols = get_convenience_columns(frame.columns)
+            if conv_cols:
+                convenience_count = frame[conv_cols].sum(axis=1).to_numpy(dtype=float)
+            else:
+                convenience_count = np.zeros(len(frame), dtype=float)
+
+            columns = {
+                'restaurant_id': frame['restaurant_id'].to_numpy(),
+                'category_id': frame['category_id'].to_numpy(),
+                'score': frame['score'].to_numpy(dtype=float),
+                'review': frame['review'].to_numpy(dtype=float),
+                'predicted_score': predicted_score,
+                'base_composite_score': base_composite_score,
+                'convenience_count': convenience_count,
+                'reservable': (
+                    frame['caution_예약가능'].to_numpy(dtype=float)
+                    if 'caution_예약가능' in frame.columns else np.zeros(len(frame), dtype=float)
+                ),
+            }
+            if 'duration_hours' in frame.columns:
+                columns['duration_hours'] = pd.to_numeric(frame['duration_hours'], errors='coerce').to_numpy(dtype=float)
+            if 'price' in frame.columns:
+                columns['price'] = pd.to_numeric(frame['price'], errors='coerce').to_numpy(dtype=float)
+
+            # 카테고리별 행 인덱스 생성
+            category_index = {
+                int(cat): np.flatnonzero(columns['category_id'] == cat)
+                for cat in pd.unique(columns['category_id'])
+            }
+
+            logger.info(f"식당 점수 테이블 생성 완료: {len(frame)}개 행, {len(category_index)}개 카테고리")
+            return cls(columns, category_index)
+
+        except Exception as e:
+            logger.error(f"식당 점수 테이블 생성 오류: {e}", exc_info=True)
+            raise e
+
+    def rows_for_categories(self, category_ids) -> np.ndarray:
+        """
+        주어진 카테고리에 속한 행 인덱스 반환 (원본 데이터 순서 유지)
+
+        Args:
+            category_ids: 카테고리 ID 목록
+
+        Returns:
+            np.ndarray: 행 인덱스 배열
+        """
+        parts = [self.category_index[cat] for cat in set(category_ids) if cat in self.category_index]
+        if not parts:
+            return np.empty(0, dtype=np.intp)
+        return np.sort(np.concatenate(parts))
+
+    def count_rows(self, category_ids) -> int:
+        """주어진 카테고리에 속한 행 수 반환"""
+        return sum(self.category_counts.get(cat, 0) for cat in set(category_ids))
+
+    def all_rows(self) -> np.ndarray:
+        """전체 행 인덱스 반환"""
+        return np.arange(len(self))
+
+    def select_top_k(self, rows: np.ndarray, scores: np.ndarray, k: int) -> np.ndarray:
+        """
+        식당별 최고 점수 행만 남긴 뒤 점수 상위 k개를 부분 선택
+
+        전체 정렬 대신 식당별 최대값 집계(O(n))와 argpartition을 사용하고,
+        선택된 k개만 정렬합니다. 동점인 경우 앞선 행을 우선합니다.
+
+        Args:
+            rows: 후보 행 인덱스 배열
+            scores: 후보 행별 점수 배열 (rows와 같은 길이)
+            k: 선택할 식당 수
+
+        Returns:
+            np.ndarray: 선택된 후보 위치 배열 (rows/scores 기준, 점수 내림차순)
+        """
+        n = len(rows)
+        if n == 0 or k <= 0:
+            return np.empty(0, dtype=np.intp)
+
+        scores = np.where(np.isnan(scores), -np.inf, scores)
+        codes = self.columns['restaurant_index'][rows]
+
+        # 식당별 최고 점수와 그 점수를 가진 첫 번째 후보 위치
+        best = np.full(self.n_restaurants, -np.inf)
+        np.maximum.at(best, codes, scores)
+        is_best = np.flatnonzero(scores == best[codes])
+        first = np.full(self.n_restaurants, n)
+        np.minimum.at(first, codes[is_best], is_best)
+        positions = first[first < n]
+
+        # 상위 k개 부분 선택 후 선택된 항목만 정렬
+        if len(positions) > k:
+            positions = positions[np.argpartition(-scores[positions], k - 1)[:k]]
+        return positions[np.lexsort((positions, -scores[positions]))]
@@ -0,0 +1,74 @@
+# app/services/model_trainer/recommendation/scoring.py
+
+import numpy as np
+import pandas as pd
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 유의사항 컬럼 그룹 (긍정/부정)
+CAUTION_POSITIVE_COLS = ['caution_배달가능', 'caution_예약가능', 'caution_포장가능']
+CAUTION_NEGATIVE_COLS = ['caution_배달불가', 'caution_예약불가', 'caution_포장불가']
+
+# 편의시설 평균 계산에서 제외하는 컬럼
+CONVENIENCE_EXCLUDED_COL = "conv_편의시설 정보 없음"
+
+# 추가 보너스를 받는 중요 카테고리
+IMPORTANT_CATEGORIES = [4, 7, 9, 10]
+
+
+def get_convenience_columns(columns) -> list:
+    """
+    편의시설 평균 계산에 사용할 conv_ 컬럼 목록 반환
+
+    Args:
+        columns: 데이터프레임 컬럼 목록
+
+    Returns:
+        list: conv_ 로 시작하는 컬럼 목록 ("편의시설 정보 없음" 제외)
+    """
+    return [col for col in columns if col.startswith("conv_") and col != CONVENIENCE_EXCLUDED_COL]
+
+
+def _sum_columns(df: pd.DataFrame, cols: list) -> np.ndarray:
+    """존재하는 컬럼만 행 단위로 합산 (없는 컬럼은 0으로 간주)"""
+    total = np.zeros(len(df), dtype=float)
+    for col in cols:
+        if col in df.columns:
+            total = total + df[col].to_numpy(dtype=float)
+    return total
+
+
+def compute_composite_scores(df: pd.DataFrame, review_weight, caution_weight, convenience_weight) -> np.ndarray:
+    """
+    복합 점수를 컬럼 단위 배열 연산으로 계산
+    compute_composite_score를 행마다 적용한 결과와 동일한 값을 반환합니다.
+
+    Args:
+        df: final_score, review, caution_*, conv_* 컬럼을 포함한 데이터프레임
+        review_weight: 리뷰 가중치
+        caution_weight: 주의사항 가중치
+        convenience_weight: 편의시설 가중치
+
+    Returns:
+        np.ndarray: 행별 복합 점수
+    """
+    try:
+        base = df['final_score'].to_numpy(dtype=float)
+        review_val = df['review'].to_numpy(dtype=float)
+        review_adjust = review_weight * (np.log(review_val + 50) / np.log(1000))
+
+        caution_balance = _sum_columns(df, CAUTION_POSITIVE_COLS) - _sum_columns(df, CAUTION_NEGATIVE_COLS)
+
+        conv_cols = get_convenience_columns(df.columns)
+        if conv_cols:
+            conv_mean = df[conv_cols].to_numpy(dtype=float).mean(axis=1)
+        else:
+            conv_mean = np.zeros(len(df), dtype=float)
+        conv_adjust = convenience_weight * conv_mean
+
+        return base + review_adjust + caution_weight * caution_balance + conv_adjust
+
+    except Exception as e:
+        logger.error(f"compute_composite_scores 오류: {e}", exc_info=True)
+        raise e
@@ -1,16 +1,21 @@
 # app/services/model_trainer/train_model.py
 
-from .data_preparation import prepare_data, impute_and_clip, scale_and_split
-from .model_training import train_ridge, train_rf, train_xgb, train_lgb, train_cat, train_mlp, train_stacking
+from .data_preparation import prepare_data, impute_and_clip, scale_and_split, fit_or_reuse_imputer
+from .model_training import train_stacking
 from .model_evaluation import evaluate_model
+from .training_scheduler import train_base_learners, resolve_cpu_budget
+from .ensemble_pruning import prune_ensemble
+from .feature_engineering import enhance_feature_engineering
 import numpy as np
 import logging
+import time
 import warnings
 import atexit
 import shutil
 import os
 import tempfile
 from joblib import parallel_backend
+from threadpoolctl import threadpool_limits
 
 # joblib 경고 필터링
 warnings.filterwarnings("ignore", message="resource_tracker")
@@ -18,104 +23,12 @@ warnings.filterwarnings("ignore", message="There appear to be")
 
 logger = logging.getLogger(__name__)
 
-def enhance_feature_engineering(df_prepared):
-    """
-    향상된 특성 엔지니어링 함수
-    
-    Args:
-        df_prepared: 기본 전처리가 완료된 데이터프레임
-    
-    Returns:
-        df_prepared: 향상된 특성이 추가된 데이터프레임
-    """
-    try:
-        logger.debug("향상된 특성 엔지니어링 시작...")
-        
-        # 1. 카테고리별 희소성 계산
-        category_counts = df_prepared['category_id'].value_counts()
-        total_restaurants = len(df_prepared)
-        category_sparsity = 1 - (category_counts / total_restaurants)
-        
-        # 2. 카테고리 다양성 특성 추가
-        df_prepared['category_diversity_score'] = df_prepared['category_id'].map(
-            category_sparsity.to_dict()
-        ).fillna(0)
-        
-        # 3. 카테고리 인기도 측정
-        category_avg_rating = df_prepared.groupby('category_id')['score'].mean()
-        category_avg_reviews = df_prepared.groupby('category_id')['review'].mean()
-        
-        df_prepared['category_avg_rating'] = df_prepared['category_id'].map(
-            category_avg_rating.to_dict()
-        ).fillna(df_prepared['score'].mean())
-        
-        df_prepared['category_avg_reviews'] = df_prepared['category_id'].map(
-            category_avg_reviews.to_dict()
-        ).fillna(df_prepared['review'].mean())
-        
-        # 4. 식당 인기도 점수
-        df_prepared['popularity_score'] = (
-            df_prepared['score'] * 0.6 +
-            np.log1p(df_prepared['review']) * 0.4
-        )
-        
-        # 5. 리뷰 기반 상호작용 강도 - 가중치 최적화
-        df_prepared['interaction_intensity'] = (
-            df_prepared['review'] * 0.4 + 
-            df_prepared['duration_hours'] * 0.25 + 
-            np.log1p(df_prepared['review']) * 0.35
-        )
-        
-        # 6. 식당 대비 카테고리 성능 (식당이 해당 카테고리 내에서 얼마나 좋은지)
-        df_prepared['rating_vs_category'] = df_prepared['score'] - df_prepared['category_avg_rating']
-        df_prepared['reviews_vs_category'] = df_prepared['review'] / (df_prepared['category_avg_reviews'] + 1)
-        
-        # 7. 복합 특성들
-        # 복합 평점: 카테고리 다양성과 평점 결합
-        df_prepared['composite_rating'] = (
-            df_prepared['score'] * 0.7 + 
-            df_prepared['category_diversity_score'] * 0.2 +
-            df_prepared['rating_vs_category'] * 0.1
-        )
-        
-        # 복합 인기도: 리뷰 수와 운영 시간 결합
-        df_prepared['engagement_score'] = (
-            np.log1p(df_prepared['review']) * 0.7 +
-            (df_prepared['duration_hours'] / 24) * 0.3
-        )
-        
-        # 8. 식당 특성과 카테고리 인기도의 상호작용
-        df_prepared['category_quality_interaction'] = (
-            df_prepared['score'] * df_prepared['category_avg_rating']
-        )
-        
-        # 9. 리뷰 밀도 (시간당 리뷰 수)
-        df_prepared['review_density'] = df_prepared['review'] / (df_prepared['duration_hours'] + 1)
-        
-        # 10. 편의 시설 복합 점수
-        convenience_cols = [col for col in df_prepared.columns if col.startswith('conv_')]
-        if convenience_cols:
-            df_prepared['convenience_score'] = df_prepared[convenience_cols].sum(axis=1)
-        
-        # 11. 리뷰 영향력 비율
-        global_avg_rating = df_prepared['score'].mean()
-        df_prepared['bayesian_rating'] = (
-            (df_prepared['review'] * df_prepared['score'] + 10 * global_avg_rating) /
-            (df_prepared['review'] + 10)
-        )
-        
-        logger.debug("향상된 특성 엔지니어링 완료")
-        return df_prepared
-        
-    except Exception as e:
-        logger.error(f"향상된 특성 엔지니어링 중 오류 발생: {e}", exc_info=True)
-        # 오류가 발생해도 원본 데이터프레임 반환
-        return df_prepared
-    
-def train_model(df_final):
+def train_model(df_final, full_search=False, imputer=None):
     """
     전처리된 DataFrame을 입력받아 모델 학습과 평가, 앙상블 모델 학습까지 수행합니다.
     최종적으로 학습에 사용된 스케일러, 앙상블 모델, 모델 피처 목록, 사용 데이터 등을 딕셔너리 형태로 반환합니다.
+    full_search=True이면 캐시된 하이퍼파라미터를 쓰지 않고 모든 모델을 다시 탐색합니다.
+    imputer가 주어지면(이전 아티팩트의 FittedImputer) 다시 학습하지 않고 결측치가 있는 행만 변환합니다.
     """
     try:
         # 1. 데이터 준비: 필수 컬럼 확인 및 결측치 제거
@@ -126,10 +39,20 @@ def train_model(df_final):
         logger.error(f"train_model - 데이터 준비 오류: {e}", exc_info=True)
         raise e
         
-    # 2. 결측치 보완: IterativeImputer를 이용
+    # 2. 결측치 보완: IMPUTATION_MODE 방식 (저장된 imputer가 있으면 재사용)
     try:
         impute_cols = ['score', 'review']
-        df_prepared = impute_and_clip(df_prepared, impute_cols)
+        impute_start = time.perf_counter()
+        n_missing = int(df_prepared[impute_cols].isna().any(axis=1).sum())
+        fitted_imputer = fit_or_reuse_imputer(df_prepared, impute_cols, imputer)
+        df_prepared = impute_and_clip(df_prepared, impute_cols, imputer=fitted_imputer)
+        imputation_report = {
+            "mode": fitted_imputer.mode,
+            "reused": fitted_imputer is imputer,
+            "fitted_at": fitted_imputer.fitted_at_,
+            "n_imputed_rows": n_missing,
+            "seconds": round(time.perf_counter() - impute_start, 4),
+        }
         logger.debug("평점 미제공 식당에 대한 가상 평점 계산이 완료되었습니다.")
     except Exception as e:
         logger.error(f"train_model - imputation 오류: {e}", exc_info=True)
@@ -201,41 +124,55 @@ def train_model(df_final):
         raise e
 
     try:
-        # 5. 개별 모델 학습 (하이퍼파라미터 튜닝 포함)
-        best_ridge = train_ridge(X_train, y_train)
-        best_rf = train_rf(X_train, y_train)
-        best_xgb = train_xgb(X_train, y_train)
-        best_lgb = train_lgb(X_train, y_train)
-        best_cat = train_cat(X_train, y_train)
-        best_mlp = train_mlp(X_train, y_train)
+        # 5. 개별 모델 학습 (하이퍼파라미터 튜닝 포함, CPU 예산 안에서 동시에 실행)
         logger.info("모델 학습을 시작합니다.")
+        cpu_budget = resolve_cpu_budget()
+        best_models = train_base_learners(X_train, y_train, cpu_budget, X_test, y_test, full_search=full_search)
     except Exception as e:
         logger.error(f"train_model - 개별 모델 학습 오류: {e}", exc_info=True)
         raise e
     
     try:
         # 6. 앙상블 모델 학습: 여러 모델을 Stacking하여 앙상블 모델 생성
-        estimators = [
-            ('ridge', best_ridge),
-            ('rf', best_rf),
-            ('xgb', best_xgb),
-            ('lgb', best_lgb),
-            ('cat', best_cat),
-            ('mlp', best_mlp)
-        ]
-        stacking_reg, cv_stacking = train_stacking(estimators, X_train, y_train)
+        estimators = list(best_models.items())
+        # 스태킹 내부의 개별 모델 학습도 같은 CPU 예산의 스레드로 병렬 실행
+        stacking_start = time.perf_counter()
+        with threadpool_limits(limits=1, user_api="blas"), parallel_backend("threading"):
+            stacking_reg, cv_stacking = train_stacking(estimators, X_train, y_train, n_jobs=min(cpu_budget, len(estimators)))
+        logger.info(f"Stacking 앙상블 학습 완료: {time.perf_counter() - stacking_start:.2f}초")
         logger.info(f"Stacking 앙상블 CV R²: {cv_stacking}")
+        for name, metrics in stacking_reg.oof_metrics_.items():
+            logger.info(f"{name} OOF 지표: {metrics}")
     except Exception as e:
         logger.error(f"train_model - 앙상블 모델 학습 오류: {e}", exc_info=True)
         raise
     
-    # (옵션) 각 모델의 평가 지표도 출력할 수 있습니다.
-    # 예: evaluate_model(best_ridge, X_test, y_test)
+    # 7. 개별 모델의 기여도/추론 비용 측정 (MODEL_PRUNING_ENABLED이면 비용 대비 기여도가 낮은 모델 제외)
+    stacking_reg, ensemble_report = prune_ensemble(stacking_reg, X_train, y_train)
+    cv_stacking = stacking_reg.cv_score_
+    
+    # 8. 학습 리포트: 스택 CV R², 개별 모델 OOF 지표, 검증 데이터 R², 앙상블 선택 결과
+    try:
+        valid_r2, _, _ = evaluate_model(stacking_reg, X_test, y_test)
+        training_report = {
+            "stacking_cv_r2": float(cv_stacking),
+            "stacking_valid_r2": float(valid_r2),
+            "base_models": stacking_reg.oof_metrics_,
+            "n_train": int(len(X_train)),
+            "n_valid": int(len(X_test)),
+            "ensemble": ensemble_report,
+            "imputation": imputation_report,
+        }
+    except Exception as e:
+        logger.error(f"train_model - 학습 리포트 생성 오류: {e}", exc_info=True)
+        training_report = {}
     
-    # 7. 반환할 객체들을 딕셔너리로 구성합니다.
+    # 9. 반환할 객체들을 딕셔너리로 구성합니다.
     return {
         "scaler": scaler,
         "stacking_reg": stacking_reg,
         "model_features": model_features,
-        "df_model": df_prepared
+        "df_model": df_prepared,
+        "imputer": fitted_imputer,
+        "training_report": training_report
         }
\ No newline at end of file
@@ -0,0 +1,223 @@
+# app/services/model_trainer/training_scheduler.py
+# 개별 모델 하이퍼파라미터 탐색을 CPU 예산 안에서 동시에 실행
+
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from joblib import parallel_backend
+from sklearn.metrics import r2_score
+from threadpoolctl import threadpool_limits
+
+from app.setting import TRAIN_CPU_BUDGET, HYPERPARAM_R2_DRIFT
+from .model_training import train_ridge, train_rf, train_xgb, train_lgb, train_cat, train_mlp, fit_with_params
+from .hyperparameter_cache import get_hyperparameter_cache, compute_data_fingerprint, extract_tuned_params
+
+logger = logging.getLogger(__name__)
+
+# 학습 순서 (스태킹 estimators 순서와 동일)
+BASE_LEARNERS = ("ridge", "rf", "xgb", "lgb", "cat", "mlp")
+
+# 직렬 실행 시 측정한 대략적인 상대 학습 비용 (코어 배분 가중치)
+BASE_LEARNER_COST = {"ridge": 1, "rf": 15, "xgb": 40, "lgb": 4, "cat": 4, "mlp": 3}
+
+# 탐색 후보 수 × 폴드 수 (탐색 워커 수의 상한)
+BASE_LEARNER_FITS = {"ridge": 18, "rf": 36, "xgb": 150, "lgb": 24, "cat": 24, "mlp": 12}
+
+# 자체 스레드 풀을 가진 라이브러리 (남는 코어를 모델 내부 스레드로 배분)
+NATIVE_THREADED = {"xgb", "lgb", "cat"}
+
+
+def resolve_cpu_budget(cpu_budget=None) -> int:
+    """설정값(0 이하이면 전체 코어)을 실제 사용할 코어 수로 변환"""
+    cpu_budget = TRAIN_CPU_BUDGET if cpu_budget is None else cpu_budget
+    if cpu_budget <= 0:
+        cpu_budget = os.cpu_count() or 1
+    return max(1, int(cpu_budget))
+
+
+def plan_cpu_budget(cpu_budget: int) -> dict:
+    """
+    모델별 코어 배분 계획 수립
+
+    전체 예산을 학습 비용에 비례해 나누되 모델마다 최소 1코어를 보장합니다.
+    배분된 코어는 탐색 워커(joblib)에 먼저 쓰고, 후보 수를 넘는 만큼은
+    XGBoost/LightGBM/CatBoost 내부 스레드로 돌립니다.
+    (배분 합이 예산보다 클 수 있으며, 동시에 실행되는 합은 CpuBudget이 제한합니다.)
+
+    Args:
+        cpu_budget: 전체 코어 예산
+
+    Returns:
+        dict: 모델 이름별 {"cores", "search_jobs", "threads"}
+    """
+    cpu_budget = max(1, int(cpu_budget))
+    total_cost = sum(BASE_LEARNER_COST.values())
+    shares = {name: cpu_budget * BASE_LEARNER_COST[name] / total_cost for name in BASE_LEARNERS}
+    cores = {name: max(1, int(shares[name])) for name in BASE_LEARNERS}
+
+    # 반올림으로 남는 코어는 나머지가 큰 모델부터 배분
+    remainder = cpu_budget - sum(cores.values())
+    if remainder > 0:
+        for name in sorted(BASE_LEARNERS, key=lambda n: shares[n] - int(shares[n]), reverse=True)[:remainder]:
+            cores[name] += 1
+
+    plan = {}
+    for name in BASE_LEARNERS:
+        search_jobs = min(cores[name], BASE_LEARNER_FITS[name])
+        threads = max(1, cores[name] // search_jobs) if name in NATIVE_THREADED else 1
+        plan[name] = {"cores": cores[name], "search_jobs": search_jobs, "threads": threads}
+    return plan
+
+
+class CpuBudget:
+    """
+    동시에 사용하는 코어 수를 예산 이하로 제한하는 게이트
+
+    요청 순서(FIFO)대로 코어를 할당하므로 먼저 제출한 큰 작업이 작은 작업에 밀리지 않습니다.
+    """
+
+    def __init__(self, total: int):
+        self.total = max(1, int(total))
+        self.available = self.total
+        self._condition = threading.Condition()
+        self._next_ticket = 0
+        self._serving = 0
+
+    def acquire(self, cores: int) -> int:
+        cores = min(max(1, cores), self.total)
+        with self._condition:
+            ticket = self._next_ticket
+            self._next_ticket += 1
+            self._condition.wait_for(lambda: self._serving == ticket and self.available >= cores)
+            self.available -= cores
+            self._serving += 1
+            self._condition.notify_all()
+        return cores
+
+    def release(self, cores: int):
+        with self._condition:
+            self.available += cores
+            self._condition.notify_all()
+
+
+def _train_base_learner(name: str, X, y, search_jobs: int, threads: int):
+    """모델 하나의 탐색을 스레드 기반 joblib 백엔드로 실행"""
+    if name == "ridge":
+        return train_ridge(X, y, n_jobs=search_jobs)
+    if name == "rf":
+        return train_rf(X, y, n_jobs=search_jobs)
+    if name == "xgb":
+        return train_xgb(X, y, n_jobs=search_jobs, n_threads=threads)
+    if name == "lgb":
+        return train_lgb(X, y, n_jobs=search_jobs, n_threads=threads)
+    if name == "cat":
+        return train_cat(X, y, n_jobs=search_jobs, thread_count=threads)
+    if name == "mlp":
+        return train_mlp(X, y, n_jobs=search_jobs)
+    raise ValueError(f"알 수 없는 모델: {name}")
+
+
+def _valid_r2(model, X_valid, y_valid):
+    if X_valid is None or y_valid is None or len(X_valid) == 0:
+        return None
+    return float(r2_score(y_valid, model.predict(X_valid)))
+
+
+def _train_or_reuse(name: str, X, y, plan: dict, cached, X_valid, y_valid):
+    """
+    캐시된 하이퍼파라미터가 있으면 한 번만 학습하고, 없거나 검증 R²가 기준보다 떨어지면 전체 탐색
+
+    Returns:
+        tuple: (모델, 검증 R², 전체 탐색 여부)
+    """
+    if cached is not None:
+        model = fit_with_params(name, X, y, cached["params"], plan["cores"])
+        valid_r2 = _valid_r2(model, X_valid, y_valid)
+        baseline = cached.get("valid_r2")
+        if valid_r2 is None or baseline is None or baseline - valid_r2 <= HYPERPARAM_R2_DRIFT:
+            return model, valid_r2, False
+        logger.info(f"{name} 검증 R² 하락 ({baseline:.6f} -> {valid_r2:.6f}), 전체 탐색을 다시 실행합니다.")
+
+    model = _train_base_learner(name, X, y, plan["search_jobs"], plan["threads"])
+    return model, _valid_r2(model, X_valid, y_valid), True
+
+
+def _timed_training(name: str, X, y, plan: dict, budget: CpuBudget, cached, X_valid, y_valid):
+    cores = budget.acquire(plan["cores"])
+    try:
+        start = time.perf_counter()
+        # joblib 백엔드 설정은 스레드별이므로 작업 스레드 안에서 지정
+        with parallel_backend("threading", n_jobs=plan["search_jobs"]):
+            model, valid_r2, searched = _train_or_reuse(name, X, y, plan, cached, X_valid, y_valid)
+        elapsed = time.perf_counter() - start
+    finally:
+        budget.release(cores)
+    mode = "전체 탐색" if searched else "캐시된 하이퍼파라미터"
+    logger.info(
+        f"{name} 모델 학습 완료 ({mode}): {elapsed:.2f}초, 검증 R² {valid_r2} "
+        f"(코어 {plan['cores']}, 탐색 워커 {plan['search_jobs']}, 스레드 {plan['threads']})"
+    )
+    return model, valid_r2, searched
+
+
+def train_base_learners(X, y, cpu_budget=None, X_valid=None, y_valid=None, full_search: bool = False) -> dict:
+    """
+    개별 모델 하이퍼파라미터 탐색을 CPU 예산 안에서 동시에 실행
+
+    데이터 지문이 같은 캐시된 하이퍼파라미터가 있으면 탐색 없이 한 번만 학습합니다.
+    캐시가 없거나, 마지막 탐색 후 HYPERPARAM_FULL_SEARCH_DAYS가 지났거나,
+    검증 R²가 탐색 당시보다 HYPERPARAM_R2_DRIFT 넘게 떨어진 모델만 전체 탐색합니다.
+
+    탐색 워커는 프로세스 대신 스레드로 실행합니다. 트리/부스팅 모델 학습은 GIL을 놓기 때문에
+    스레드로도 코어를 채울 수 있고, 여러 탐색이 loky 프로세스 풀을 동시에 크기 조정하며
+    서로 기다리는 문제도 피할 수 있습니다. BLAS 스레드는 1로 제한해 중복 할당을 막습니다.
+
+    Args:
+        X: 학습 특성 데이터
+        y: 학습 타깃 데이터
+        cpu_budget: 전체 코어 예산 (기본값: TRAIN_CPU_BUDGET, 0 이하이면 전체 코어)
+        X_valid: 검증 특성 데이터 (R² 하락 판단용, 옵션)
+        y_valid: 검증 타깃 데이터 (옵션)
+        full_search: True이면 캐시를 무시하고 모든 모델을 전체 탐색
+
+    Returns:
+        dict: 모델 이름별 최적 모델 (BASE_LEARNERS 순서)
+    """
+    cpu_budget = resolve_cpu_budget(cpu_budget)
+    plan = plan_cpu_budget(cpu_budget)
+    logger.info(f"개별 모델 학습 계획 (CPU 예산 {cpu_budget}): {plan}")
+
+    cache = get_hyperparameter_cache()
+    fingerprint = compute_data_fingerprint(X)
+    cached_entries = {}
+    for name in BASE_LEARNERS:
+        entry = None if full_search else cache.get(name, fingerprint)
+        cached_entries[name] = None if entry is None or cache.is_search_due(entry) else entry
+
+    budget = CpuBudget(cpu_budget)
+    start = time.perf_counter()
+    results = {}
+    with threadpool_limits(limits=1, user_api="blas"):
+        # 오래 걸리는 모델부터 시작해야 전체 완료 시간이 가장 짧아짐
+        order = sorted(BASE_LEARNERS, key=lambda name: BASE_LEARNER_COST[name], reverse=True)
+        with ThreadPoolExecutor(max_workers=len(BASE_LEARNERS), thread_name_prefix="train") as executor:
+            futures = {
+                name: executor.submit(_timed_training, name, X, y, plan[name], budget, cached_entries[name], X_valid, y_valid)
+                for name in order
+            }
+            for name in order:
+                try:
+                    model, valid_r2, searched = futures[name].result()
+                except Exception as e:
+                    logger.error(f"{name} 모델 학습 오류: {e}", exc_info=True)
+                    raise e
+                results[name] = model
+                if searched:
+                    cache.set(name, fingerprint, extract_tuned_params(name, model), valid_r2)
+
+    cache.save()
+    logger.info(f"개별 모델 학습 전체 소요 시간: {time.perf_counter() - start:.2f}초")
+    return {name: results[name] for name in BASE_LEARNERS}
@@ -2,7 +2,7 @@
 
 import logging
 from datetime import datetime
-from app.services.mongodb.connection import get_mongodb_connection
+from app.services.mongodb.connection import get_connection_manager
 from app.services.mongodb.data_collector import process_restaurant_data, process_user_data
 
 logger = logging.getLogger("data_sync")
@@ -12,18 +12,8 @@ def fetch_data_from_mongodb():
     try:
         logger.info("MongoDB에서 데이터 가져오기 시작")
         
-        # MongoDB 연결 (SSH 터널링 자동 설정)
-        result = get_mongodb_connection()
-        
-        # SSH 터널링을 사용하는 경우
-        if len(result) == 3:
-            client, db, tunnel = result
-            cleanup_tunnel = True
-        else:
-            client, db = result
-            cleanup_tunnel = False
-        
-        try:
+        # 공유 MongoDB 연결 사용 (SSH 터널링 자동 설정, 사용 후 닫지 않음)
+        with get_connection_manager().borrow() as db:
             # 타임스탬프 생성 (모든 파일에 동일한 타임스탬프 사용)
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             
@@ -42,16 +32,6 @@ def fetch_data_from_mongodb():
                 success_user = False
             
             return success_restaurant
-            
-        finally:
-            # MongoDB 연결 종료
-            client.close()
-            logger.info("MongoDB 연결 종료")
-            
-            # SSH 터널이 있는 경우 터널도 종료
-            if cleanup_tunnel:
-                tunnel.stop()
-                logger.info("SSH 터널 종료")
     
     except Exception as e:
         logger.error(f"MongoDB 데이터 가져오기 오류: {str(e)}", exc_info=True)
@@ -1,9 +1,14 @@
 # app/servies/mongodb/connection.py
 
 import os
+import time
 import logging
+import threading
+from contextlib import contextmanager
 from dotenv import load_dotenv
 from pymongo import MongoClient
+from pymongo.errors import ConnectionFailure, PyMongoError
+from app.config.mongo_config import MONGO_HEALTH_CHECK_INTERVAL
 
 # SSH 터널링이 필요한 경우에만 import
 try:
@@ -109,4 +114,111 @@ def get_mongodb_via_ssh():
     except Exception as e:
         # 오류 발생 시 터널 종료
         tunnel.stop()
-        raise e
\ No newline at end of file
+        raise e
+
+
+class MongoConnectionManager:
+    """
+    프로세스 전체에서 공유하는 MongoDB 연결 (SSH 터널 하나 + 연결 풀을 가진 MongoClient 하나)
+
+    처음 사용할 때 연결하고, 빌려줄 때 health_check_interval마다 ping과 터널 상태를 확인해
+    끊어졌으면 다시 연결합니다. MongoClient는 스레드 안전하므로 여러 스레드가 같은 연결을 빌려 씁니다.
+    """
+
+    def __init__(self, connect=None, health_check_interval=MONGO_HEALTH_CHECK_INTERVAL):
+        self._connect = connect or get_mongodb_connection
+        self.health_check_interval = health_check_interval
+        self._lock = threading.Lock()
+        self._client = None
+        self._db = None
+        self._tunnel = None
+        self._last_check = 0.0
+        self.connect_count = 0
+
+    def _open(self):
+        result = self._connect()
+        if len(result) == 3:
+            self._client, self._db, self._tunnel = result
+        else:
+            (self._client, self._db), self._tunnel = result, None
+        self._last_check = time.monotonic()
+        self.connect_count += 1
+
+    def _close(self):
+        if self._client is not None:
+            try:
+                self._client.close()
+                logger.info("MongoDB 연결 종료")
+            except Exception as e:
+                logger.warning(f"MongoDB 연결 종료 중 오류: {e}")
+        if self._tunnel is not None:
+            try:
+                self._tunnel.stop()
+                logger.info("SSH 터널 종료")
+            except Exception as e:
+                logger.warning(f"SSH 터널 종료 중 오류: {e}")
+        self._client = self._db = self._tunnel = None
+
+    def _is_healthy(self):
+        if self._tunnel is not None and not getattr(self._tunnel, "is_active", True):
+            return False
+        try:
+            self._client.admin.command("ping")
+            return True
+        except PyMongoError as e:
+            logger.warning(f"MongoDB 연결 상태 확인 실패: {e}")
+            return False
+
+    def get_db(self):
+        """연결된 데이터베이스 객체 반환 (필요하면 연결 또는 재연결)"""
+        with self._lock:
+            if self._client is None:
+                self._open()
+            elif time.monotonic() - self._last_check >= self.health_check_interval:
+                if self._is_healthy():
+                    self._last_check = time.monotonic()
+                else:
+                    logger.info("MongoDB 재연결")
+                    self._close()
+                    self._open()
+            return self._db
+
+    @contextmanager
+    def borrow(self):
+        """
+        공유 연결을 빌려 쓰는 컨텍스트 (사용 후 연결을 닫지 않음)
+
+        연결 오류가 나면 다음에 빌릴 때 바로 상태를 확인하도록 표시합니다.
+        """
+        db = self.get_db()
+        try:
+            yield db
+        except ConnectionFailure:
+            self._last_check = 0.0
+            raise
+
+    def close(self):
+        """연결과 SSH 터널 종료 (애플리케이션 종료 시 호출)"""
+        with self._lock:
+            self._close()
+
+
+# 프로세스 전체에서 공유하는 연결 관리자
+_connection_manager = None
+_connection_manager_lock = threading.Lock()
+
+
+def get_connection_manager():
+    """공유 MongoDB 연결 관리자 반환"""
+    global _connection_manager
+    if _connection_manager is None:
+        with _connection_manager_lock:
+            if _connection_manager is None:
+                _connection_manager = MongoConnectionManager()
+    return _connection_manager
+
+
+def close_mongodb_connection():
+    """공유 MongoDB 연결 종료"""
+    if _connection_manager is not None:
+        _connection_manager.close()
@@ -1,13 +1,27 @@
 # app/servies/mongodb/data_collector.py
 
+import time
 import logging
+import itertools
 from pathlib import Path
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 from app.config import RESTAURANTS_DIR, USER_DIR
+from app.config.mongo_config import MONGO_SYNC_CONCURRENCY
 from app.services.mongodb.data_converter import process_and_save_data, cleanup_old_files
+from app.services.mongodb.incremental_sync import sync_collection
+from app.services.columnar_snapshot import open_snapshot_writer
 
 logger = logging.getLogger(__name__)
 
+def _non_empty(documents):
+    """문서 iterable이 비어 있으면 None, 아니면 첫 문서를 포함한 iterator 반환"""
+    iterator = iter(documents)
+    first = next(iterator, None)
+    if first is None:
+        return None
+    return itertools.chain([first], iterator)
+
 def process_restaurant_data(db, timestamp):
     """MongoDB에서 레스토랑 관련 데이터 처리 및 저장"""
     try:
@@ -15,22 +29,20 @@ def process_restaurant_data(db, timestamp):
         restaurant_dir = Path(RESTAURANTS_DIR)
         restaurant_dir.mkdir(parents=True, exist_ok=True)
         
-        # 레스토랑 컬렉션에서 데이터 가져오기
-        restaurant_collection = db['restaurants']
-        restaurant_data = list(restaurant_collection.find({}, {'_id': 0}))
+        # 레스토랑 컬렉션에서 데이터 가져오기 (증분 모드에서는 변경분만 가져와 스냅샷에 병합)
+        restaurant_data = _non_empty(sync_collection(db, 'restaurants')[0])
         
-        if not restaurant_data:
+        if restaurant_data is None:
             logger.warning("MongoDB에서 식당 데이터를 찾을 수 없습니다.")
             return False
-            
-        logger.info(f"MongoDB에서 {len(restaurant_data)}개의 레스토랑 레코드 가져옴")
         
-        # 데이터 처리 및 저장
+        # 커서를 읽으면서 바로 파일에 저장
         rest_filepath = restaurant_dir / f"restaurant_data_{timestamp}.json"
         success = process_and_save_data(
             restaurant_data, 
             rest_filepath, 
-            "식당 데이터"
+            "식당 데이터",
+            open_snapshot_writer('restaurants', rest_filepath)
         )
         
         if success:
@@ -44,54 +56,50 @@ def process_restaurant_data(db, timestamp):
         logger.error(f"레스토랑 데이터 처리 오류: {str(e)}", exc_info=True)
         return False
 
-def process_user_data(db, timestamp):
-    """MongoDB에서 사용자 관련 데이터 처리 및 저장"""
+# 사용자 관련 컬렉션: (컬렉션 이름, 파일 접두사, 설명)
+USER_COLLECTIONS = [
+    ('users', "user_data_", "사용자 기본 정보"),
+    ('user_preferences', "user_preferences_", "사용자 선호도 데이터"),
+    ('likes', "likes_", "찜 데이터"),
+    ('reservations', "reservations_", "예약 데이터"),
+    ('recsys_data', "recsys_data_", "추천 시스템 데이터"),  # 선택사항
+]
+
+def process_user_data(db, timestamp, concurrency=MONGO_SYNC_CONCURRENCY):
+    """
+    MongoDB에서 사용자 관련 데이터 처리 및 저장
+
+    컬렉션별 조회는 서로 독립적인 네트워크 대기이므로 공유 연결로 최대 concurrency개를 동시에 가져옵니다.
+    (전체 소요 시간이 컬렉션별 시간의 합이 아니라 가장 느린 컬렉션 시간에 가까워짐)
+    """
     # 디렉토리 경로
     user_dir = Path(USER_DIR)
     user_dir.mkdir(parents=True, exist_ok=True)
     
     # 적어도 하나의 쿼리가 성공했는지 추적
-    success_count = 0
-    total_queries = 5  # 총 실행할 쿼리 수
-    
-    # 1. 사용자 기본 정보 가져오기 및 저장
-    success_count += process_collection(
-        db, 'users', 
-        user_dir / f"user_data_{timestamp}.json", 
-        "사용자 기본 정보",
-        user_dir, "user_data_", 3
-    )
+    total_queries = len(USER_COLLECTIONS)  # 총 실행할 쿼리 수
     
-    # 2. 사용자 선호도 데이터 가져오기 및 저장
-    success_count += process_collection(
-        db, 'user_preferences', 
-        user_dir / f"user_preferences_{timestamp}.json", 
-        "사용자 선호도 데이터",
-        user_dir, "user_preferences_", 3
-    )
-    
-    # 3. 찜 데이터 가져오기 및 저장
-    success_count += process_collection(
-        db, 'likes', 
-        user_dir / f"likes_{timestamp}.json", 
-        "찜 데이터",
-        user_dir, "likes_", 3
-    )
+    def run(collection_name, file_prefix, prefix):
+        start = time.perf_counter()
+        result = process_collection(
+            db, collection_name,
+            user_dir / f"{file_prefix}{timestamp}.json",
+            prefix,
+            user_dir, file_prefix, 3
+        )
+        return result, time.perf_counter() - start
     
-    # 4. 예약 데이터 가져오기 및 저장
-    success_count += process_collection(
-        db, 'reservations', 
-        user_dir / f"reservations_{timestamp}.json", 
-        "예약 데이터",
-        user_dir, "reservations_", 3
-    )
+    sync_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, min(concurrency, total_queries)), thread_name_prefix="mongo_sync") as executor:
+        futures = [executor.submit(run, *spec) for spec in USER_COLLECTIONS]
+        results = [future.result() for future in futures]
+    wall_time = time.perf_counter() - sync_start
     
-    # 5. 추천 시스템 통합 데이터 가져오기 및 저장 (선택사항)
-    success_count += process_collection(
-        db, 'recsys_data', 
-        user_dir / f"recsys_data_{timestamp}.json", 
-        "추천 시스템 데이터",
-        user_dir, "recsys_data_", 3
+    for (collection_name, _, _), (result, elapsed) in zip(USER_COLLECTIONS, results):
+        logger.info(f"{collection_name} 동기화 {'성공' if result else '실패'}: {elapsed:.2f}초")
+    success_count = sum(result for result, _ in results)
+    logger.info(
+        f"사용자 데이터 조회 시간: {wall_time:.2f}초 (컬렉션별 합계 {sum(t for _, t in results):.2f}초, 동시 실행 {concurrency}개)"
     )
     
     # 일부 쿼리라도 성공했으면 일부 성공으로 간주
@@ -105,13 +113,11 @@ def process_user_data(db, timestamp):
 def process_collection(db, collection_name, filepath, prefix, dir_path, file_prefix, keep_count):
     """특정 컬렉션에서 데이터를 가져와 저장하는 헬퍼 함수"""
     try:
-        collection = db[collection_name]
-        data = list(collection.find({}, {'_id': 0}))
+        data = _non_empty(sync_collection(db, collection_name)[0])
         
-        if data:
-            logger.info(f"MongoDB에서 {len(data)}개의 {prefix} 레코드 가져옴")
-            
-            if process_and_save_data(data, filepath, prefix):
+        if data is not None:
+            # 커서를 읽으면서 바로 파일에 저장
+            if process_and_save_data(data, filepath, prefix, open_snapshot_writer(collection_name, filepath)):
                 # 파일이 생성되었다면 정리 로직도 실행
                 cleanup_old_files(str(dir_path), file_prefix, keep_count)
                 return 1
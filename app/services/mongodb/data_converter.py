@@ -1,7 +1,9 @@
 # app/servies/mongodb/data_converter.py
 
+import os
 import json
 import logging
+import threading
 import numpy as np
 from datetime import datetime, date
 from pathlib import Path
@@ -58,26 +60,79 @@ def convert_numpy_types(data):
     else:
         return data
 
-def process_and_save_data(data, filepath, prefix):
-    """데이터 전처리 및 파일 저장을 처리하는 헬퍼 함수"""
+def convert_document(data):
+    """
+    문서 하나를 JSON으로 저장할 수 있는 형태로 한 번에 변환
+    (bytes → 문자열, 날짜/시간 → ISO 문자열, NumPy 타입 → Python 네이티브 타입)
+    """
+    if isinstance(data, dict):
+        return {key: convert_document(value) for key, value in data.items()}
+    elif isinstance(data, (list, tuple)):
+        return [convert_document(item) for item in data]
+    elif isinstance(data, bytes):
+        return data.decode('utf-8', errors='replace')
+    elif isinstance(data, (datetime, date)):
+        return data.isoformat()
+    elif isinstance(data, np.integer):
+        return int(data)
+    elif isinstance(data, np.floating):
+        return float(data)
+    elif isinstance(data, np.ndarray):
+        return convert_document(data.tolist())
+    else:
+        return data
+
+def write_json_array(documents, filepath, snapshot=None):
+    """
+    문서를 하나씩 변환하면서 JSON 배열로 스트리밍 저장
+
+    문서 하나를 한 줄에 압축 JSON으로 쓰므로 전체 목록이나 변환된 복사본을 메모리에 만들지 않고,
+    결과는 기존과 같이 json.load로 읽을 수 있습니다.
+    임시 파일에 쓴 뒤 os.replace로 교체하므로 읽는 쪽에서 쓰다 만 파일을 보지 않습니다.
+
+    Args:
+        documents: 문서 iterable (커서 포함)
+        filepath: 저장할 파일 경로
+        snapshot: 변환된 문서를 함께 받을 Arrow 스냅샷 작성기 (선택)
+
+    Returns:
+        int: 저장한 문서 수
+    """
+    filepath = Path(filepath)
+    filepath.parent.mkdir(parents=True, exist_ok=True)
+    # 파일 패턴(*.json)에 걸리지 않는 임시 파일 이름
+    tmp_path = filepath.with_name(f".{filepath.name}.tmp-{os.getpid()}-{threading.get_ident()}")
+    count = 0
     try:
-        # 바이트 데이터를 문자열로 변환
-        data = convert_bytes_to_str(data)
-        # 날짜/시간 객체와 NumPy 타입을 변환
-        data = convert_datetime(data)
-        data = convert_numpy_types(data)
-        
-        # 디렉토리 확인 및 생성
-        filepath.parent.mkdir(parents=True, exist_ok=True)
-        
-        # JSON으로 저장
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-        
-        logger.info(f"{prefix} 저장 완료: {len(data)}개 항목")
+        with open(tmp_path, 'w', encoding='utf-8', buffering=1 << 20) as f:
+            f.write("[")
+            for document in documents:
+                document = convert_document(document)
+                f.write(",\n" if count else "\n")
+                f.write(json.dumps(document, ensure_ascii=False, separators=(",", ":")))
+                if snapshot is not None:
+                    snapshot.add(document)
+                count += 1
+            f.write("\n]\n" if count else "]\n")
+        os.replace(tmp_path, filepath)
+        return count
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+def process_and_save_data(data, filepath, prefix, snapshot=None):
+    """데이터 변환 및 파일 저장을 처리하는 헬퍼 함수 (data는 리스트 또는 커서 등 iterable)"""
+    try:
+        count = write_json_array(data, filepath, snapshot)
+        # JSON 파일을 저장한 뒤 스냅샷을 완성해야 로더가 스냅샷을 최신으로 인식
+        if snapshot is not None and snapshot.commit():
+            logger.info(f"{prefix} 스냅샷 저장 완료: {snapshot.path.name}")
+        logger.info(f"{prefix} 저장 완료: {count}개 항목")
         return True
     except Exception as e:
         logger.error(f"{prefix} 저장 중 오류: {e}")
+        if snapshot is not None:
+            snapshot.abort()
         return False
 
 def cleanup_old_files(directory, prefix, keep_count):
@@ -93,6 +148,8 @@ def cleanup_old_files(directory, prefix, keep_count):
         if len(files) > keep_count:
             for old_file in files[keep_count:]:
                 old_file.unlink()
+                # 같은 이름의 Arrow 스냅샷도 함께 삭제
+                old_file.with_suffix(".arrow").unlink(missing_ok=True)
                 logger.info(f"오래된 파일 삭제: {old_file}")
     
     except Exception as e:
@@ -0,0 +1,238 @@
+# app/services/mongodb/incremental_sync.py
+
+import os
+import pickle
+import logging
+import threading
+from datetime import datetime
+from pathlib import Path
+
+import bson
+from pymongo.errors import PyMongoError
+
+from app.config import STORAGE_DIR
+from app.config.mongo_config import (
+    MONGO_SYNC_MODE, MONGO_SYNC_UPDATED_FIELD, MONGO_SYNC_FULL_EVERY, MONGO_SYNC_BATCH_SIZE, MONGO_SYNC_ID_COLLECTIONS
+)
+
+logger = logging.getLogger(__name__)
+
+# 컬렉션별 로컬 스냅샷 저장 위치
+SNAPSHOT_DIR = Path(STORAGE_DIR) / "sync_snapshot"
+
+# 컬렉션별 스냅샷 파일 동시 갱신 방지
+_locks = {}
+_locks_guard = threading.Lock()
+
+
+def _collection_lock(name):
+    with _locks_guard:
+        return _locks.setdefault(name, threading.Lock())
+
+
+def _snapshot_path(name, snapshot_dir):
+    return Path(snapshot_dir) / f"{name}.pkl"
+
+
+def load_snapshot(name, snapshot_dir=SNAPSHOT_DIR):
+    """저장된 컬렉션 스냅샷 로드 (없거나 읽을 수 없으면 None)"""
+    path = _snapshot_path(name, snapshot_dir)
+    if not path.exists():
+        return None
+    try:
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    except Exception as e:
+        logger.warning(f"{name} 스냅샷을 읽을 수 없어 전체 동기화합니다: {e}")
+        return None
+
+
+def save_snapshot(name, snapshot, snapshot_dir=SNAPSHOT_DIR):
+    """컬렉션 스냅샷 저장 (임시 파일에 쓴 뒤 교체)"""
+    path = _snapshot_path(name, snapshot_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(f".tmp-{os.getpid()}-{threading.get_ident()}")
+    with open(tmp_path, "wb") as f:
+        pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+
+
+def _choose_high_water_field(documents, updated_field, allow_id=False):
+    """
+    증분 조회 기준 필드 선택
+
+    모든 문서에 updated_field가 있으면 그 필드(수정까지 감지)를 사용합니다.
+    _id는 새 문서만 감지하고 기존 문서 수정은 놓치므로 allow_id(추가만 되는 컬렉션으로 설정된 경우)이고
+    모든 _id가 ObjectId일 때만 사용하며, 그 외에는 None(매번 전체 조회)
+    """
+    if not documents:
+        return None
+    if updated_field and all(doc.get(updated_field) is not None for doc in documents):
+        return updated_field
+    if allow_id and all(isinstance(doc.get("_id"), bson.ObjectId) for doc in documents):
+        return "_id"
+    return None
+
+
+def _high_water(documents, field):
+    if field is None or not documents:
+        return None
+    return max(doc[field] for doc in documents)
+
+
+def _start_change_stream_token(collection):
+    """변경 스트림 시작 지점 토큰 (replica set이 아니거나 지원하지 않으면 None)"""
+    try:
+        with collection.watch(full_document="updateLookup") as stream:
+            return stream.resume_token
+    except (PyMongoError, AttributeError, TypeError, NotImplementedError):
+        return None
+
+
+def _apply_change_stream(collection, snapshot, stats):
+    """
+    저장된 resume token 이후의 변경 이벤트를 스냅샷에 적용
+
+    Returns:
+        bool: 적용 성공 여부 (실패하거나 컬렉션이 삭제/교체되었으면 False → 전체 조회)
+    """
+    documents = snapshot["documents"]
+    try:
+        with collection.watch(full_document="updateLookup", resume_after=snapshot["resume_token"]) as stream:
+            while True:
+                change = stream.try_next()
+                if change is None:
+                    break
+                operation = change["operationType"]
+                if operation in ("insert", "update", "replace"):
+                    doc = change.get("fullDocument")
+                    if doc is None:
+                        # 조회 시점에 이미 삭제된 문서
+                        documents.pop(change["documentKey"]["_id"], None)
+                    else:
+                        documents[doc["_id"]] = doc
+                        stats["fetched"] += 1
+                        if stats["bytes"] is not None:
+                            stats["bytes"] += len(bson.encode(doc))
+                elif operation == "delete":
+                    documents.pop(change["documentKey"]["_id"], None)
+                    stats["deleted"] += 1
+                else:
+                    # drop, rename, invalidate 등
+                    logger.info(f"{collection.name} 변경 스트림 이벤트 {operation} - 전체 동기화합니다.")
+                    return False
+            snapshot["resume_token"] = stream.resume_token
+        return True
+    except PyMongoError as e:
+        logger.info(f"{collection.name} 변경 스트림을 사용할 수 없어 다른 방식으로 동기화합니다: {e}")
+        return False
+
+
+def _fetch(collection, query, stats):
+    documents = list(collection.find(query))
+    stats["fetched"] += len(documents)
+    if stats["bytes"] is not None:
+        stats["bytes"] += sum(len(bson.encode(doc)) for doc in documents)
+    return documents
+
+
+def _full_sync(collection, updated_field, stats, allow_id=False):
+    # 변경 스트림 토큰은 조회 전에 받아야 조회 중 변경도 다음 동기화에서 반영됨
+    resume_token = _start_change_stream_token(collection)
+    documents = _fetch(collection, {}, stats)
+    field = _choose_high_water_field(documents, updated_field, allow_id)
+    stats["mode"] = "full"
+    return {
+        "documents": {doc["_id"]: doc for doc in documents},
+        "high_water_field": field,
+        "high_water": _high_water(documents, field),
+        "resume_token": resume_token,
+        "syncs_since_full": 0,
+        "synced_at": datetime.now().isoformat(),
+    }
+
+
+def _stream_full(collection, stats, batch_size):
+    """전체 조회 커서를 batch_size 단위로 받아오며 문서를 하나씩 반환 (통계는 읽는 동안 갱신)"""
+    for doc in collection.find({}, {"_id": 0}).batch_size(batch_size):
+        stats["fetched"] += 1
+        stats["total"] += 1
+        if stats["bytes"] is not None:
+            stats["bytes"] += len(bson.encode(doc))
+        yield doc
+
+
+def sync_collection(db, name, mode=MONGO_SYNC_MODE, updated_field=MONGO_SYNC_UPDATED_FIELD,
+                    full_every=MONGO_SYNC_FULL_EVERY, snapshot_dir=SNAPSHOT_DIR, count_bytes=False,
+                    batch_size=MONGO_SYNC_BATCH_SIZE, id_collections=MONGO_SYNC_ID_COLLECTIONS):
+    """
+    컬렉션을 로컬 스냅샷과 동기화하고 문서(_id 제외)를 반환
+
+    incremental 모드에서는 저장된 스냅샷 이후의 변경만 가져와 병합합니다.
+    1. 변경 스트림(replica set)을 쓸 수 있으면 resume token 이후 이벤트 적용 (삭제 포함)
+    2. 아니면 high-water mark 이후 문서 조회: updated_field >= 마지막 값,
+       또는 id_collections에 있는 컬렉션(추가만 되고 수정되지 않음)은 _id(ObjectId) > 마지막 값
+    3. 둘 다 쓸 수 없으면 매번 전체 조회
+    high-water mark 방식은 삭제를 감지할 수 없으므로 서버 문서 수가 스냅샷과 다르면 전체 조회하고,
+    full_every번마다 한 번은 항상 전체 조회합니다.
+
+    Args:
+        db: MongoDB 데이터베이스 객체
+        name: 컬렉션 이름
+        mode: full(매번 전체 조회) 또는 incremental
+        updated_field: 수정 시각 필드 이름
+        full_every: 증분 동기화를 이 횟수만큼 한 뒤 전체 조회 (0 이하이면 사용 안 함)
+        snapshot_dir: 스냅샷 저장 디렉토리
+        count_bytes: 가져온 문서의 BSON 크기 합계 계산 여부 (벤치마크용)
+        batch_size: full 모드 커서가 한 번에 받아올 문서 수
+        id_collections: updated_field가 없을 때 _id 기준 증분 조회를 허용할 컬렉션 이름 목록
+
+    Returns:
+        tuple: (문서 iterable, 통계 딕셔너리 - mode, fetched, deleted, total, bytes)
+        문서는 한 번만 순회할 수 있고, full 모드의 통계는 문서를 모두 읽은 뒤 채워집니다.
+    """
+    collection = db[name]
+    stats = {"mode": mode, "fetched": 0, "deleted": 0, "total": 0, "bytes": 0 if count_bytes else None}
+
+    if mode != "incremental":
+        return _stream_full(collection, stats, batch_size), stats
+
+    allow_id = name in id_collections
+    with _collection_lock(name):
+        snapshot = load_snapshot(name, snapshot_dir)
+        if snapshot is not None and 0 < full_every <= snapshot["syncs_since_full"]:
+            snapshot = None
+        # _id 기준 증분이 허용되지 않은 컬렉션의 이전 스냅샷은 전체 조회로 다시 만듦
+        if snapshot is not None and snapshot.get("high_water_field") == "_id" and not allow_id:
+            snapshot = None
+
+        applied = False
+        if snapshot is not None and snapshot.get("resume_token") is not None:
+            applied = _apply_change_stream(collection, snapshot, stats)
+            stats["mode"] = "change_stream"
+        elif snapshot is not None and snapshot.get("high_water_field") is not None:
+            field, high_water = snapshot["high_water_field"], snapshot["high_water"]
+            # 같은 시각에 수정된 문서를 놓치지 않도록 updated_field는 >=로 조회 (중복은 _id로 덮어씀)
+            query = {field: {"$gt" if field == "_id" else "$gte": high_water}}
+            changed = _fetch(collection, query, stats)
+            for doc in changed:
+                snapshot["documents"][doc["_id"]] = doc
+            if changed:
+                snapshot["high_water"] = max(high_water, _high_water(changed, field))
+            # 삭제된 문서가 있으면 전체 조회
+            applied = collection.count_documents({}) == len(snapshot["documents"])
+            stats["mode"] = f"high_water:{field}"
+
+        if applied:
+            snapshot["syncs_since_full"] += 1
+            snapshot["synced_at"] = datetime.now().isoformat()
+        else:
+            snapshot = _full_sync(collection, updated_field, stats, allow_id)
+        save_snapshot(name, snapshot, snapshot_dir)
+
+    stats["total"] = len(snapshot["documents"])
+    logger.info(
+        f"{name} 동기화({stats['mode']}): {stats['fetched']}개 조회, {stats['deleted']}개 삭제, 전체 {stats['total']}개"
+    )
+    documents = ({k: v for k, v in doc.items() if k != "_id"} for doc in snapshot["documents"].values())
+    return documents, stats
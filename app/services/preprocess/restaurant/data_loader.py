@@ -7,6 +7,7 @@ import pandas as pd
 import logging
 from pathlib import Path
 from typing import Dict, Tuple
+from app.services.columnar_snapshot import load_snapshot_frame
 
 logger = logging.getLogger(__name__)
 
@@ -23,6 +24,12 @@ def load_restaurant_json_files(directory: str) -> pd.DataFrame:
         logger.error(f"No restaurant JSON files found in directory: {directory}")
         raise FileNotFoundError(f"No restaurant JSON files found in directory: {directory}")
 
+    # 동기화 때 함께 저장된 Arrow 스냅샷이 모두 있으면 JSON 파싱 없이 메모리 맵으로 로드
+    df = load_snapshot_frame(json_files)
+    if df is not None:
+        logger.debug(f"식당 데이터 스냅샷 로드 완료: {len(df)}개 항목")
+        return df
+
     merged_data = []
     for file_path in json_files:
         try:
@@ -47,6 +54,14 @@ def load_restaurant_json_files(directory: str) -> pd.DataFrame:
     
     return df
 
+def _load_records(json_path: Path) -> pd.DataFrame:
+    """레코드 목록 JSON 파일을 DataFrame으로 로드 (같은 이름의 Arrow 스냅샷이 있으면 우선 사용)"""
+    df = load_snapshot_frame([json_path])
+    if df is not None:
+        return df
+    with open(json_path, 'r', encoding='utf-8') as f:
+        return pd.DataFrame(json.load(f))
+
 def load_user_json_files(directory: str) -> Dict[str, pd.DataFrame]:
     """
     사용자 관련 데이터 파일들을 로드하여 DataFrame 딕셔너리로 반환합니다.
@@ -69,13 +84,17 @@ def load_user_json_files(directory: str) -> Dict[str, pd.DataFrame]:
 
         if pref_files:
             latest_file = max(pref_files, key=lambda x: x.stat().st_mtime)
-            with open(latest_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            # 파일 구조에 맞게 데이터 추출
-            if isinstance(data, list):
-                user_data_frames["user_preference"] = pd.DataFrame(data)
-            elif isinstance(data, dict) and "preferences" in data:
-                user_data_frames["user_preference"] = pd.DataFrame(data["preferences"])
+            df = load_snapshot_frame([latest_file])
+            if df is not None:
+                user_data_frames["user_preference"] = df
+            else:
+                with open(latest_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                # 파일 구조에 맞게 데이터 추출
+                if isinstance(data, list):
+                    user_data_frames["user_preference"] = pd.DataFrame(data)
+                elif isinstance(data, dict) and "preferences" in data:
+                    user_data_frames["user_preference"] = pd.DataFrame(data["preferences"])
             logger.info(f"사용자 가격 범위 선호도 데이터 로드 완료: {len(user_data_frames['user_preference'])}개 항목")
         else:
             logger.warning("사용자 가격 범위 선호도 데이터 파일을 찾을 수 없습니다.")
@@ -101,10 +120,8 @@ def load_user_json_files(directory: str) -> Dict[str, pd.DataFrame]:
         like_files = [f for f in dir_path.glob('likes_*.json')]
         if like_files:
             latest_file = max(like_files, key=lambda x: x.stat().st_mtime)
-            with open(latest_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            user_data_frames["likes"] = pd.DataFrame(data)
-            logger.info(f"찜 데이터 로드 완료: {len(data)}개 항목")
+            user_data_frames["likes"] = _load_records(latest_file)
+            logger.info(f"찜 데이터 로드 완료: {len(user_data_frames['likes'])}개 항목")
         else:
             logger.warning("찜 데이터 파일을 찾을 수 없습니다.")
         
@@ -112,10 +129,9 @@ def load_user_json_files(directory: str) -> Dict[str, pd.DataFrame]:
         reservation_files = [f for f in dir_path.glob('reservations_*.json')]
         if reservation_files:
             latest_file = max(reservation_files, key=lambda x: x.stat().st_mtime)
-            with open(latest_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            user_data_frames["reserva치tions"] = pd.DataFrame(data)
-            logger.info(f"예약 데이터 로드 완료: {len(data)}개 항목")
+            reservations_df = _load_records(latest_file)
+            user_data_frames["reserva치tions"] = reservations_df
+            logger.info(f"예약 데이터 로드 완료: {len(reservations_df)}개 항목")
             
             # 완료된 예약만 필터링 - 개선된 코드
             if "reservations" in user_data_frames and "status" in user_data_frames["reservations"].columns:
@@ -0,0 +1,58 @@
+# app/services/preprocess/restaurant/pipeline.py
+# 식당 학습 데이터 파이프라인 (JSON 로드 → 전처리)을 단계 캐시와 함께 실행
+
+import glob
+import logging
+import os
+from pathlib import Path
+
+import pandas as pd
+
+from app.services.preprocess.restaurant.data_loader import load_restaurant_json_files
+from app.services.preprocess.restaurant.preprocessor import preprocess_data
+from app.services import columnar_snapshot
+from app.services.stage_cache import Stage, code_version, hash_files, run_stages
+
+logger = logging.getLogger(__name__)
+
+
+def restaurant_stages(directory: str) -> list:
+    """
+    식당 데이터 파이프라인 단계 목록
+
+    load_restaurants 단계는 data_loader.py와 스냅샷 모듈, preprocess 단계는 전처리 패키지의 모든 모듈을
+    코드 버전으로 사용하므로 전처리 코드만 바뀌면 JSON 로드는 캐시를 사용합니다.
+    """
+    return [
+        Stage("load_restaurants", lambda _: load_restaurant_json_files(directory),
+              code_version(load_restaurant_json_files, columnar_snapshot)),
+        Stage("preprocess", preprocess_data,
+              code_version(*[p for p in Path(__file__).parent.glob("*.py") if p.name != "data_loader.py"])),
+    ]
+
+
+def load_training_data(directory: str, force_rebuild: bool = False) -> pd.DataFrame:
+    """
+    원본 식당 JSON 파일을 읽어 전처리한 학습 데이터(df_final) 반환
+
+    입력 JSON 파일 내용과 단계별 코드가 같으면 STORAGE_DIR/stage_cache에 저장된 결과를 사용하고,
+    바뀐 첫 단계부터만 다시 계산합니다.
+    이후 학습 단계(데이터 준비, 결측치 보완, 특성 엔지니어링, 스케일링)는 여기서 캐시하지 않고,
+    df_final 해시와 학습 설정/코드 버전(compute_training_signature)을 함께 확인하는 모델 아티팩트로 재사용합니다.
+
+    Args:
+        directory: 식당 JSON 파일 디렉토리
+        force_rebuild: True이면 캐시를 무시하고 모든 단계를 다시 계산
+
+    Returns:
+        pd.DataFrame: 전처리된 식당 데이터
+    """
+    try:
+        # 로더와 같은 패턴/순서로 원본 파일 해시 계산
+        json_files = glob.glob(os.path.join(directory, "restaurant_data*.json"))
+        if not json_files:
+            return load_restaurant_json_files(directory)  # 파일이 없을 때의 오류 처리는 로더와 동일
+        return run_stages(restaurant_stages(directory), hash_files(json_files), force_rebuild=force_rebuild)
+    except Exception as e:
+        logger.error(f"학습 데이터 파이프라인 오류: {e}", exc_info=True)
+        raise e
@@ -1,18 +1,22 @@
 import logging
-from .user_preprocess import user_preprocess_data
+from .user_preprocess import user_preprocess_data, load_user_features
 from .user_data_loader import user_load_data
 from .user_feature_extractor import user_extract_features
 from .user_category_encoder import user_encode_categories
 from .user_data_processor import user_convert_to_dataframe, user_save_to_csv
+from .user_feature_store import UserFeatureStore, as_user_feature_store
 
 # 패키지 로거 설정
 logger = logging.getLogger(__name__)
 
 __all__ = [
     'user_preprocess_data',
+    'load_user_features',
     'user_load_data',
     'user_extract_features',
     'user_encode_categories',
     'user_convert_to_dataframe',
     'user_save_to_csv',
+    'UserFeatureStore',
+    'as_user_feature_store',
 ]
\ No newline at end of file
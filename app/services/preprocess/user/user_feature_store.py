@@ -0,0 +1,126 @@
+# app/services/preprocess/user/user_feature_store.py
+
+import numpy as np
+import pandas as pd
+import logging
+
+# 모듈 로거 설정
+logger = logging.getLogger(__name__)
+
+def normalize_user_id(user_id):
+    """사용자 ID를 조회용 문자열 키로 정규화 (1, "1", 1.0 → "1")"""
+    if isinstance(user_id, (float, np.floating)) and float(user_id).is_integer():
+        return str(int(user_id))
+    if isinstance(user_id, np.integer):
+        return str(int(user_id))
+    return str(user_id).strip()
+
+
+class UserFeatureStore:
+    """
+    전처리된 사용자 특성을 모델 로드 시 한 번 색인해 두는 조회용 저장소
+
+    정규화된 사용자 ID → 행 번호 딕셔너리와 연속된 NumPy 특성 행렬을 보관하여
+    요청마다 사용자 DataFrame 전체를 스캔하거나 변경하지 않고 O(1)로 조회합니다.
+    """
+
+    def __init__(self, user_ids: list, feature_names: list, matrix: np.ndarray, object_columns: dict = None,
+                 column_order: list = None):
+        self.feature_names = list(feature_names)
+        self.matrix = np.ascontiguousarray(matrix, dtype=float)
+        self.object_columns = object_columns or {}
+        self.column_order = column_order or self.feature_names + list(self.object_columns)
+        self._feature_pos = {name: i for i, name in enumerate(self.feature_names)}
+
+        # 중복 ID는 첫 번째 행만 사용
+        self._index = {}
+        for row, user_id in enumerate(user_ids):
+            self._index.setdefault(normalize_user_id(user_id), row)
+
+    @classmethod
+    def from_dataframe(cls, user_features_df: pd.DataFrame) -> "UserFeatureStore":
+        """
+        전처리된 사용자 특성 DataFrame으로 저장소 생성
+
+        Args:
+            user_features_df: user_id 컬럼을 포함한 사용자 특성 데이터
+
+        Returns:
+            UserFeatureStore: 사용자 특성 저장소
+        """
+        if user_features_df is None or user_features_df.empty:
+            return cls([], [], np.empty((0, 0)))
+
+        feature_df = user_features_df.drop(columns=['user_id', 'user_id_str'], errors='ignore')
+        numeric_cols = [col for col in feature_df.columns if pd.api.types.is_numeric_dtype(feature_df[col])]
+        object_cols = [col for col in feature_df.columns if col not in numeric_cols]
+
+        store = cls(
+            user_features_df['user_id'].tolist(),
+            numeric_cols,
+            feature_df[numeric_cols].to_numpy(dtype=float),
+            {col: feature_df[col].to_numpy() for col in object_cols},
+            list(feature_df.columns)
+        )
+        logger.info(f"사용자 특성 저장소 생성 완료: {len(store)}명, {len(numeric_cols)}개 수치 특성")
+        return store
+
+    def __len__(self):
+        return len(self._index)
+
+    def __contains__(self, user_id) -> bool:
+        return normalize_user_id(user_id) in self._index
+
+    def has_feature(self, name) -> bool:
+        return name in self._feature_pos or name in self.object_columns
+
+    def lookup(self, user_id):
+        """사용자의 행 번호 반환 (없으면 None)"""
+        return self._index.get(normalize_user_id(user_id))
+
+    def lookup_many(self, user_ids) -> np.ndarray:
+        """여러 사용자의 행 번호 배열 반환 (없는 사용자는 -1)"""
+        return np.array([self._index.get(normalize_user_id(user_id), -1) for user_id in user_ids], dtype=np.intp)
+
+    def column(self, name):
+        """특성 컬럼 전체 배열 반환 (없으면 None)"""
+        if name in self._feature_pos:
+            return self.matrix[:, self._feature_pos[name]]
+        return self.object_columns.get(name)
+
+    def get_vector(self, user_id):
+        """사용자의 수치 특성 벡터 반환 (없으면 None)"""
+        row = self.lookup(user_id)
+        return None if row is None else self.matrix[row]
+
+    def get(self, user_id, name, default=None):
+        """
+        사용자의 특정 특성 값 반환
+
+        Args:
+            user_id: 사용자 ID
+            name: 특성 이름
+            default: 사용자나 특성이 없을 때 반환할 값
+
+        Returns:
+            특성 값 (없으면 default)
+        """
+        row = self.lookup(user_id)
+        if row is None:
+            return default
+        if name in self._feature_pos:
+            return self.matrix[row, self._feature_pos[name]]
+        if name in self.object_columns:
+            return self.object_columns[name][row]
+        return default
+
+    def feature_names_with_prefix(self, prefix) -> list:
+        """접두사로 시작하는 특성 이름 목록 반환 (컬럼 순서 유지)"""
+        return [name for name in self.column_order if name.startswith(prefix)]
+
+
+def as_user_feature_store(user_features):
+    """사용자 특성 DataFrame 또는 저장소를 저장소로 변환 (None이면 None)"""
+    if user_features is None or isinstance(user_features, UserFeatureStore):
+        return user_features
+    return UserFeatureStore.from_dataframe(user_features)
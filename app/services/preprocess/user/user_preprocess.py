@@ -90,4 +90,44 @@ def user_preprocess_data(data_source, save_path=None):
         logger.info("5단계: 전처리된 데이터 저장")
         user_save_to_csv(user_features_df, save_path)
     
-    return user_features_df
\ No newline at end of file
+    return user_features_df
+
+
+def load_user_features(user_dir, force=False):
+    """
+    전처리된 사용자 특성 로드 (저장된 CSV가 있으면 재사용, 없거나 force이면 다시 전처리)
+    
+    Args:
+        user_dir: 사용자 데이터 JSON 파일 디렉토리
+        force: True이면 저장된 CSV를 무시하고 다시 전처리
+        
+    Returns:
+        DataFrame: 전처리된 사용자 특성 데이터프레임
+    """
+    # 전처리된 사용자 특성 파일 경로
+    user_features_path = os.path.join(str(user_dir), "preprocessed_user_features.csv")
+    
+    # 이미 전처리된 파일이 있고 강제 초기화가 아니면 기존 파일 사용
+    if os.path.exists(user_features_path) and not force:
+        logger.info(f"기존 전처리된 사용자 특성 파일 로드: {user_features_path}")
+        return pd.read_csv(user_features_path)
+    
+    # 사용자 데이터 파일 경로 리스트 생성
+    logger.info("사용자 데이터 전처리 시작")
+    user_json_files = [
+        os.path.join(str(user_dir), f) for f in os.listdir(str(user_dir))
+        if f.endswith('.json') and not f.startswith('.')  # 숨김 파일 제외
+    ]
+    
+    # 파일 경로 로깅
+    logger.info(f"처리할 사용자 데이터 파일: {len(user_json_files)}개")
+    for file in user_json_files[:5]:  # 첫 5개만 로깅
+        logger.debug(f"- {os.path.basename(file)}")
+    
+    # 파일 경로 리스트를 전달하여 전처리 수행
+    user_features_df = user_preprocess_data(
+        user_json_files,  # 파일 경로 리스트 전달
+        save_path=user_features_path
+    )
+    logger.info(f"사용자 데이터 전처리 완료: {len(user_features_df)}명의 사용자 데이터")
+    return user_features_df
@@ -0,0 +1,169 @@
+# app/services/recommend_batcher.py
+
+import asyncio
+import bisect
+import logging
+import time
+from app.setting import RECOMMEND_BATCH_WINDOW_MS, RECOMMEND_BATCH_MAX_SIZE, RECOMMEND_BATCH_MAX_PENDING
+from app.services.model_trainer.recommenation.basic import rank_recommendations_batch
+from app.services.recommend_executor import get_recommend_executor, ExecutorSaturatedError
+
+logger = logging.getLogger(__name__)
+
+
+class Histogram:
+    """고정 구간 누적 히스토그램 (/status 응답용)"""
+
+    def __init__(self, bounds: list):
+        self.bounds = list(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.total = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.total += 1
+        self.sum += value
+
+    def as_dict(self) -> dict:
+        labels = [f"<={b:g}" for b in self.bounds] + [f">{self.bounds[-1]:g}"]
+        return {
+            "buckets": dict(zip(labels, self.counts)),
+            "count": self.total,
+            "mean": round(self.sum / self.total, 3) if self.total else 0.0
+        }
+
+
+class RecommendBatcher:
+    """
+    짧은 시간 창 동안 들어온 /recommend 요청을 모아 한 번에 처리하는 마이크로 배처
+
+    첫 요청이 들어온 뒤 window_ms가 지나거나 max_batch개가 모이면
+    같은 점수 테이블/사용자 저장소를 쓰는 요청끼리 묶어 작업자 풀에서 한 번에 계산하고
+    결과를 각 요청에 돌려줍니다.
+    작업자 풀의 한도는 배치 단위로 적용되므로, 받아 둔(대기 + 계산 중) 요청 수가 max_pending에 도달하면
+    새 요청은 대기열에 넣지 않고 ExecutorSaturatedError를 발생시켜 503으로 응답하게 합니다.
+    """
+
+    def __init__(self, window_ms: float = RECOMMEND_BATCH_WINDOW_MS, max_batch: int = RECOMMEND_BATCH_MAX_SIZE,
+                 executor=None, max_pending: int = RECOMMEND_BATCH_MAX_PENDING):
+        self.window = max(0.0, window_ms) / 1000.0
+        self.max_batch = max(1, max_batch)
+        self.max_pending = max(1, max_pending)
+        self.executor = executor
+        self._pending = []
+        self._timer = None
+        # 실행 중인 배치 태스크 (참조가 없으면 실행 도중 가비지 컬렉션될 수 있음)
+        self._tasks = set()
+        # 받아 둔 요청 수 (이벤트 루프 스레드에서만 변경)
+        self.outstanding = 0
+        self.rejected = 0
+        self.batch_sizes = Histogram([1, 2, 4, 8, 16, 32, 64])
+        self.wait_ms = Histogram([0.5, 1, 2, 5, 10, 20, 50, 100])
+
+    async def submit(self, score_table, user_store, user_id, category_ids, top_k: int):
+        """
+        추천 요청을 배치 대기열에 넣고 결과를 기다림
+
+        Args:
+            score_table: 식당 점수 테이블
+            user_store: 사용자 특성 저장소 (옵션)
+            user_id: 사용자 ID
+            category_ids: 추천 대상 카테고리 ID 목록
+            top_k: 추천할 식당 수
+
+        Returns:
+            RecommendationResponse: 추천 결과 객체
+
+        Raises:
+            ExecutorSaturatedError: 받아 둔 요청 수가 한도에 도달한 경우
+        """
+        if self.outstanding >= self.max_pending:
+            self.rejected += 1
+            logger.warning(f"추천 배처 포화: 대기/계산 중 요청 {self.outstanding}개 (한도 {self.max_pending}개)")
+            raise ExecutorSaturatedError("추천 요청이 많아 처리할 수 없습니다.")
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((score_table, user_store, (user_id, category_ids, top_k), time.perf_counter(), future))
+        self.outstanding += 1
+
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.window, self._flush)
+
+        try:
+            return await future
+        finally:
+            self.outstanding -= 1
+
+    def _flush(self):
+        """대기 중인 요청을 배치로 묶어 실행"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending, self._pending = self._pending, []
+        if not pending:
+            return
+
+        # 같은 점수 테이블/사용자 저장소를 쓰는 요청끼리 묶음 (모델 재로드 중 섞이지 않도록)
+        groups = {}
+        for item in pending:
+            groups.setdefault((id(item[0]), id(item[1])), []).append(item)
+        for items in groups.values():
+            task = asyncio.ensure_future(self._run_batch(items))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, items: list):
+        now = time.perf_counter()
+        self.batch_sizes.observe(len(items))
+        for item in items:
+            self.wait_ms.observe((now - item[3]) * 1000)
+
+        score_table, user_store = items[0][0], items[0][1]
+        futures = [item[4] for item in items]
+        try:
+            executor = self.executor or get_recommend_executor()
+            results = await executor.run(rank_recommendations_batch, score_table, [item[2] for item in items], user_store)
+        except Exception as e:
+            # 작업자 풀 포화 등 배치 전체 실패는 모든 요청에 전달
+            for future in futures:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for future, result in zip(futures, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    def stats(self) -> dict:
+        """배치 크기와 대기 시간(ms) 히스토그램 반환 (/status 응답용)"""
+        return {
+            "window_ms": self.window * 1000,
+            "max_batch": self.max_batch,
+            "pending": len(self._pending),
+            "outstanding": self.outstanding,
+            "max_pending": self.max_pending,
+            "running_batches": len(self._tasks),
+            "rejected": self.rejected,
+            "batch_size": self.batch_sizes.as_dict(),
+            "wait_ms": self.wait_ms.as_dict()
+        }
+
+
+# 프로세스 전역 배처
+_recommend_batcher = None
+
+def get_recommend_batcher() -> RecommendBatcher:
+    """프로세스 전역 추천 배처 반환 (최초 호출 시 생성)"""
+    global _recommend_batcher
+    if _recommend_batcher is None:
+        _recommend_batcher = RecommendBatcher()
+        logger.info(f"추천 배처 생성: 시간 창 {_recommend_batcher.window * 1000:g}ms, 최대 배치 {_recommend_batcher.max_batch}개, "
+                    f"최대 대기 요청 {_recommend_batcher.max_pending}개")
+    return _recommend_batcher
@@ -0,0 +1,236 @@
+# app/services/recommend_cache.py
+
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from app.setting import RECOMMEND_CACHE_BACKEND, RECOMMEND_CACHE_MAX_SIZE, RECOMMEND_CACHE_TTL, RECOMMEND_CACHE_DIR
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryCacheBackend:
+    """프로세스 내부 LRU + TTL 캐시 백엔드"""
+
+    name = "memory"
+
+    def __init__(self, max_size: int = RECOMMEND_CACHE_MAX_SIZE, ttl: float = RECOMMEND_CACHE_TTL):
+        self.max_size = max(1, max_size)
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class FileCacheBackend:
+    """
+    디렉토리 기반 공유 캐시 백엔드
+
+    여러 uvicorn 워커가 같은 디렉토리를 사용하면 캐시 적중을 공유할 수 있습니다.
+    항목마다 파일 하나를 임시 파일 + os.replace로 원자적으로 기록하고, 파일 수정 시각으로 TTL을 판단합니다.
+    """
+
+    name = "file"
+
+    def __init__(self, directory, max_size: int = RECOMMEND_CACHE_MAX_SIZE, ttl: float = RECOMMEND_CACHE_TTL):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_size = max(1, max_size)
+        self.ttl = ttl
+        self._writes = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{hashlib.sha1(key.encode('utf-8')).hexdigest()}.json"
+
+    def get(self, key: str):
+        path = self._path(key)
+        try:
+            if time.time() - path.stat().st_mtime > self.ttl:
+                path.unlink(missing_ok=True)
+                self.expirations += 1
+                return None
+            return path.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return None
+
+    def set(self, key: str, value: str):
+        fd, tmp_path = tempfile.mkstemp(dir=str(self.directory), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(value)
+            os.replace(tmp_path, self._path(key))
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        # 주기적으로 만료/초과 항목 정리
+        self._writes += 1
+        if self._writes % 100 == 0:
+            self._prune()
+
+    def _prune(self):
+        entries = []
+        now = time.time()
+        for path in self.directory.glob("*.json"):
+            try:
+                mtime = path.stat().st_mtime
+            except FileNotFoundError:
+                continue
+            if now - mtime > self.ttl:
+                path.unlink(missing_ok=True)
+                self.expirations += 1
+            else:
+                entries.append((mtime, path))
+
+        # 오래된 항목부터 제거
+        entries.sort()
+        for _, path in entries[:max(0, len(entries) - self.max_size)]:
+            path.unlink(missing_ok=True)
+            self.evictions += 1
+
+    def clear(self):
+        for path in self.directory.glob("*.json"):
+            path.unlink(missing_ok=True)
+
+    def __len__(self):
+        return sum(1 for _ in self.directory.glob("*.json"))
+
+
+class RecommendCache:
+    """
+    추천 결과 캐시
+
+    (모델 버전, 사용자 ID, 정렬된 선호 카테고리, k)를 키로 직렬화된 추천 결과(JSON 문자열)를 저장합니다.
+    모델 버전은 (모델 아티팩트 버전, 사용자 특성 해시)로 정해지므로(make_model_version) 같은 아티팩트를 로드한 워커끼리
+    file 백엔드의 항목을 공유하고, 재학습하거나 사용자 특성이 바뀌면 이전 항목은 더 이상 조회되지 않고 LRU/TTL로 정리됩니다.
+    """
+
+    def __init__(self, backend=None):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+
+    @staticmethod
+    def make_key(model_version, user_id, category_ids, k: int) -> str:
+        categories = ",".join(str(cat) for cat in sorted(set(category_ids)))
+        return f"{model_version}:{user_id}:{categories}:{k}"
+
+    def get(self, model_version, user_id, category_ids, k: int):
+        """
+        캐시된 추천 결과 조회
+
+        Args:
+            model_version: 현재 모델 버전
+            user_id: 사용자 ID
+            category_ids: 선호 카테고리 ID 목록
+            k: 추천할 식당 수
+
+        Returns:
+            str: 직렬화된 추천 결과 (없으면 None)
+        """
+        if not self.enabled:
+            return None
+        try:
+            value = self.backend.get(self.make_key(model_version, user_id, category_ids, k))
+        except Exception as e:
+            logger.warning(f"추천 캐시 조회 실패: {e}")
+            value = None
+
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, model_version, user_id, category_ids, k: int, value: str):
+        """직렬화된 추천 결과 저장 (캐시 오류는 추천 응답에 영향을 주지 않음)"""
+        if not self.enabled:
+            return
+        try:
+            self.backend.set(self.make_key(model_version, user_id, category_ids, k), value)
+        except Exception as e:
+            logger.warning(f"추천 캐시 저장 실패: {e}")
+
+    def clear(self):
+        if self.enabled:
+            self.backend.clear()
+
+    def stats(self) -> dict:
+        """캐시 상태 반환 (/status 응답용)"""
+        if not self.enabled:
+            return {"backend": "none"}
+        lookups = self.hits + self.misses
+        return {
+            "backend": self.backend.name,
+            "size": len(self.backend),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.backend.evictions,
+            "expirations": self.backend.expirations
+        }
+
+
+def create_cache_backend(backend: str = RECOMMEND_CACHE_BACKEND):
+    """설정에 따른 캐시 백엔드 생성 (none이면 None)"""
+    backend = (backend or "none").lower()
+    if backend == "memory":
+        return MemoryCacheBackend()
+    if backend == "file":
+        from app.config import STORAGE_DIR
+        return FileCacheBackend(RECOMMEND_CACHE_DIR or Path(STORAGE_DIR) / "recommend_cache")
+    if backend != "none":
+        logger.warning(f"알 수 없는 추천 캐시 백엔드: {backend} - 캐시를 사용하지 않습니다.")
+    return None
+
+
+# 프로세스 전역 캐시
+_recommend_cache = None
+
+def get_recommend_cache() -> RecommendCache:
+    """프로세스 전역 추천 캐시 반환 (최초 호출 시 생성)"""
+    global _recommend_cache
+    if _recommend_cache is None:
+        _recommend_cache = RecommendCache(create_cache_backend())
+        logger.info(f"추천 캐시 생성: {_recommend_cache.stats()['backend']}")
+    return _recommend_cache
@@ -0,0 +1,107 @@
+# app/services/recommend_executor.py
+
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from app.setting import RECOMMEND_WORKERS, RECOMMEND_QUEUE_SIZE
+
+logger = logging.getLogger(__name__)
+
+
+class ExecutorSaturatedError(Exception):
+    """작업자 풀과 대기열이 모두 가득 찼을 때 발생하는 예외"""
+    pass
+
+
+class RecommendExecutor:
+    """
+    추천 점수 계산 같은 CPU 작업을 이벤트 루프 밖에서 실행하는 제한된 작업자 풀
+
+    실행 중 + 대기 중인 작업 수가 max_workers + queue_size를 넘으면
+    작업을 큐에 쌓지 않고 ExecutorSaturatedError를 발생시켜 호출 측에서 503으로 응답하게 합니다.
+    """
+
+    def __init__(self, max_workers: int = RECOMMEND_WORKERS, queue_size: int = RECOMMEND_QUEUE_SIZE):
+        self.max_workers = max(1, max_workers)
+        self.queue_size = max(0, queue_size)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="recommend")
+        # 카운터는 이벤트 루프 스레드에서만 변경
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+
+    @property
+    def capacity(self) -> int:
+        return self.max_workers + self.queue_size
+
+    @property
+    def saturated(self) -> bool:
+        return self.in_flight >= self.capacity
+
+    async def run(self, fn, *args, **kwargs):
+        """
+        함수를 작업자 풀에서 실행하고 결과를 기다림
+
+        Args:
+            fn: 실행할 함수
+            *args, **kwargs: 함수 인자
+
+        Returns:
+            함수 실행 결과
+
+        Raises:
+            ExecutorSaturatedError: 작업자 풀과 대기열이 모두 가득 찬 경우
+        """
+        if self.saturated:
+            self.rejected += 1
+            logger.warning(f"추천 작업자 풀 포화: 실행/대기 {self.in_flight}개 (한도 {self.capacity}개)")
+            raise ExecutorSaturatedError("추천 요청이 많아 처리할 수 없습니다.")
+
+        self.in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(self._executor, lambda: fn(*args, **kwargs))
+            self.completed += 1
+            return result
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self.in_flight -= 1
+
+    def stats(self) -> dict:
+        """작업자 풀 상태 반환 (/status 응답용)"""
+        return {
+            "workers": self.max_workers,
+            "queue_size": self.queue_size,
+            "in_flight": self.in_flight,
+            "queued": max(0, self.in_flight - self.max_workers),
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected
+        }
+
+    def shutdown(self, wait: bool = True):
+        """작업자 풀 종료"""
+        self._executor.shutdown(wait=wait)
+        logger.info("추천 작업자 풀 종료")
+
+
+# 프로세스 전역 작업자 풀
+_recommend_executor = None
+
+def get_recommend_executor() -> RecommendExecutor:
+    """프로세스 전역 추천 작업자 풀 반환 (최초 호출 시 생성)"""
+    global _recommend_executor
+    if _recommend_executor is None:
+        _recommend_executor = RecommendExecutor()
+        logger.info(f"추천 작업자 풀 생성: 작업자 {_recommend_executor.max_workers}개, 대기열 {_recommend_executor.queue_size}개")
+    return _recommend_executor
+
+def shutdown_recommend_executor():
+    """프로세스 전역 추천 작업자 풀 종료"""
+    global _recommend_executor
+    if _recommend_executor is not None:
+        _recommend_executor.shutdown()
+        _recommend_executor = None
@@ -0,0 +1,255 @@
+# app/services/stage_cache.py
+# 학습 파이프라인 단계별 결과 캐시 (입력 내용 + 코드 버전 해시 기반)
+
+import hashlib
+import inspect
+import json
+import logging
+import os
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, List, NamedTuple, Optional
+
+import numpy as np
+import pandas as pd
+
+from app.setting import STAGE_CACHE_ENABLED, STAGE_CACHE_KEEP
+
+logger = logging.getLogger(__name__)
+
+# 저장 형식이 바뀌어 이전 캐시를 쓰면 안 되는 경우 올립니다.
+STAGE_CACHE_FORMAT_VERSION = 1
+
+
+def hash_bytes(*chunks) -> str:
+    digest = hashlib.sha256()
+    for chunk in chunks:
+        digest.update(chunk if isinstance(chunk, bytes) else str(chunk).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def hash_files(paths: list) -> str:
+    """
+    파일 목록의 내용 해시 (순서, 파일 이름, 바이트 내용 반영)
+
+    Args:
+        paths: 파일 경로 목록 (읽는 순서대로)
+
+    Returns:
+        str: sha256 16진수 문자열
+    """
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(os.path.basename(path).encode("utf-8") + b"\0")
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def hash_dataframe(df: pd.DataFrame) -> str:
+    """
+    DataFrame 내용 해시 (컬럼 이름/타입, 인덱스, 값)
+
+    리스트처럼 해시할 수 없는 값이 있으면 문자열 표현으로 계산하므로
+    리스트가 배열로 바뀌는 것처럼 값의 형태가 달라져도 다른 해시가 나옵니다.
+    """
+    digest = hashlib.sha256()
+    digest.update(json.dumps([[str(c), str(t)] for c, t in df.dtypes.items()], ensure_ascii=False).encode("utf-8"))
+    digest.update(type(df.index).__name__.encode("utf-8"))
+    try:
+        row_hashes = pd.util.hash_pandas_object(df, index=True)
+    except TypeError:
+        row_hashes = pd.util.hash_pandas_object(df.astype(str), index=True)
+    digest.update(row_hashes.to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def code_version(*objects) -> str:
+    """
+    함수/모듈 소스 파일 내용 해시 (단계 코드가 바뀌면 캐시를 다시 만들기 위한 값)
+
+    패키지 디렉토리를 넘기면 그 안의 모든 .py 파일을 포함합니다.
+    """
+    paths = []
+    for obj in objects:
+        path = Path(obj) if isinstance(obj, (str, Path)) else Path(inspect.getsourcefile(obj))
+        paths.extend(sorted(path.glob("*.py")) if path.is_dir() else [path])
+    libraries = f"pandas={pd.__version__};numpy={np.__version__};format={STAGE_CACHE_FORMAT_VERSION}"
+    return hash_bytes(libraries, hash_files([str(p) for p in paths]))
+
+
+def _write_parquet(df: pd.DataFrame, path: Path) -> bool:
+    try:
+        import pyarrow  # noqa: F401 (없으면 pickle로 저장)
+    except ImportError:
+        return False
+    try:
+        df.to_parquet(path)
+        return True
+    except Exception as e:
+        logger.info(f"Parquet으로 저장할 수 없어 pickle을 사용합니다: {e}")
+        return False
+
+
+class Stage(NamedTuple):
+    """파이프라인 단계 (fn은 이전 단계 결과 DataFrame 하나를 받아 DataFrame을 반환)"""
+    name: str
+    fn: Callable
+    version: str
+
+
+class StageCache:
+    """
+    단계별 결과를 STORAGE_DIR/stage_cache/<단계>/<키>.parquet(또는 .pkl)에 저장하는 캐시
+
+    키는 (단계 이름, 코드 버전, 입력 해시)의 해시이고, 입력 해시는 이전 단계 결과의 내용 해시이므로
+    데이터나 코드가 바뀐 첫 단계부터만 다시 계산합니다.
+    Parquet으로 저장한 결과를 다시 읽었을 때 내용 해시가 같지 않으면(리스트 컬럼 등) pickle로 저장합니다.
+    """
+
+    def __init__(self, root: Path, keep: int = STAGE_CACHE_KEEP):
+        self.root = Path(root)
+        self.keep = keep
+
+    def _meta_path(self, stage: str, key: str) -> Path:
+        return self.root / stage / f"{key}.json"
+
+    def lookup(self, stage: str, key: str) -> Optional[dict]:
+        try:
+            with open(self._meta_path(stage, key), "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            if (self.root / stage / meta["file"]).exists():
+                return meta
+        except Exception:
+            pass
+        return None
+
+    def load(self, stage: str, meta: dict) -> pd.DataFrame:
+        path = self.root / stage / meta["file"]
+        if meta["format"] == "parquet":
+            return pd.read_parquet(path)
+        return pd.read_pickle(path)
+
+    def save(self, stage: str, key: str, df: pd.DataFrame, output_hash: str, input_hash: str) -> dict:
+        """
+        단계 결과 저장 (임시 파일에 쓴 뒤 os.replace, manifest는 마지막에 기록)
+
+        Returns:
+            dict: 저장된 manifest
+        """
+        stage_dir = self.root / stage
+        stage_dir.mkdir(parents=True, exist_ok=True)
+        # 같은 키를 여러 프로세스가 동시에 저장해도 임시 파일이 겹치지 않도록 uuid 사용
+        tmp = stage_dir / f".tmp-{key}-{uuid.uuid4().hex[:6]}"
+        meta_tmp = stage_dir / f".tmp-{key}-{uuid.uuid4().hex[:6]}.json"
+        try:
+            file_format = "parquet"
+            if not _write_parquet(df, tmp) or hash_dataframe(pd.read_parquet(tmp)) != output_hash:
+                file_format = "pickle"
+                df.to_pickle(tmp)
+            file_name = f"{key}.{'parquet' if file_format == 'parquet' else 'pkl'}"
+            os.replace(tmp, stage_dir / file_name)
+
+            meta = {
+                "stage": stage,
+                "key": key,
+                "input_hash": input_hash,
+                "output_hash": output_hash,
+                "format": file_format,
+                "file": file_name,
+                "rows": int(len(df)),
+                "created_at": datetime.now().isoformat(),
+            }
+            with open(meta_tmp, "w", encoding="utf-8") as f:
+                json.dump(meta, f, ensure_ascii=False, indent=2)
+            os.replace(meta_tmp, self._meta_path(stage, key))
+            return meta
+        finally:
+            for path in (tmp, meta_tmp):
+                if path.exists():
+                    path.unlink()
+
+    def prune(self, stage: str) -> int:
+        """단계별로 최근 keep개 결과만 남기고 삭제"""
+        stage_dir = self.root / stage
+        if not stage_dir.exists():
+            return 0
+        # 다른 프로세스가 작성 중인 임시 파일(.tmp-*)은 제외
+        metas = sorted((p for p in stage_dir.glob("*.json") if not p.name.startswith(".")),
+                       key=lambda p: p.stat().st_mtime, reverse=True)
+        removed = 0
+        for meta_path in metas[max(1, self.keep):]:
+            for path in stage_dir.glob(f"{meta_path.stem}.*"):
+                path.unlink(missing_ok=True)
+            removed += 1
+        return removed
+
+
+def get_stage_cache() -> StageCache:
+    """STORAGE_DIR/stage_cache 캐시 생성"""
+    from app.config import STORAGE_DIR
+    return StageCache(Path(STORAGE_DIR) / "stage_cache")
+
+
+def run_stages(stages: List[Stage], source_hash: str, source=None, force_rebuild: bool = False,
+               cache: Optional[StageCache] = None) -> pd.DataFrame:
+    """
+    단계들을 순서대로 실행하되, 캐시가 있는 앞쪽 단계는 건너뛰고 마지막으로 캐시된 결과부터 이어서 계산
+
+    캐시 키 확인에는 manifest의 결과 해시만 사용하므로 모든 단계가 캐시되어 있으면 마지막 결과만 읽습니다.
+
+    Args:
+        stages: 실행할 단계 목록
+        source_hash: 첫 단계 입력의 내용 해시 (예: 원본 JSON 파일 해시)
+        source: 첫 단계 fn에 넘길 입력
+        force_rebuild: True이면 캐시를 읽지 않고 모든 단계를 다시 계산 (결과는 다시 저장)
+        cache: 사용할 캐시 (기본값: get_stage_cache())
+
+    Returns:
+        pd.DataFrame: 마지막 단계 결과
+    """
+    if not STAGE_CACHE_ENABLED and cache is None:
+        data = source
+        for stage in stages:
+            data = stage.fn(data)
+        return data
+
+    cache = cache or get_stage_cache()
+    input_hashes, metas = [source_hash], []
+    if not force_rebuild:
+        for stage in stages:
+            meta = cache.lookup(stage.name, hash_bytes(stage.name, stage.version, input_hashes[-1]))
+            if meta is None:
+                break
+            metas.append(meta)
+            input_hashes.append(meta["output_hash"])
+
+    data = source
+    start = len(metas)
+    if metas:
+        try:
+            data = cache.load(stages[start - 1].name, metas[-1])
+        except Exception as e:
+            # 캐시 파일을 읽지 못하면 처음부터 다시 계산
+            logger.error(f"단계 캐시 로드 오류 ({stages[start - 1].name}): {e}", exc_info=True)
+            data, start, input_hashes = source, 0, [source_hash]
+
+    for i, stage in enumerate(stages):
+        if i < start:
+            logger.info(f"단계 캐시 사용: {stage.name}")
+            continue
+        data = stage.fn(data)
+        output_hash = hash_dataframe(data)
+        try:
+            key = hash_bytes(stage.name, stage.version, input_hashes[i])
+            meta = cache.save(stage.name, key, data, output_hash, input_hashes[i])
+            cache.prune(stage.name)
+            logger.info(f"단계 계산 후 저장: {stage.name} ({meta['format']}, {meta['rows']}행)")
+        except Exception as e:
+            # 저장에 실패해도 계산 결과로 계속 진행
+            logger.error(f"단계 캐시 저장 오류 ({stage.name}): {e}", exc_info=True)
+        input_hashes = input_hashes[:i + 1] + [output_hash]
+    return data
@@ -5,3 +5,32 @@ B_VALUE = float(os.getenv("B_VALUE", 2.5))
 REVIEW_WEIGHT = float(os.getenv("REVIEW_WEIGHT", 0.4))
 CAUTION_WEIGHT = float(os.getenv("CAUTION_WEIGHT", 0.15))
 CONVENIENCE_WEIGHT = float(os.getenv("CONVENIENCE_WEIGHT", 0.15))
+RECOMMEND_TOP_K = int(os.getenv("RECOMMEND_TOP_K", 15))
+RECOMMEND_MAX_TOP_K = int(os.getenv("RECOMMEND_MAX_TOP_K", 100))
+RECOMMEND_WORKERS = int(os.getenv("RECOMMEND_WORKERS", min(4, os.cpu_count() or 1)))
+RECOMMEND_QUEUE_SIZE = int(os.getenv("RECOMMEND_QUEUE_SIZE", 32))
+RECOMMEND_RETRY_AFTER = int(os.getenv("RECOMMEND_RETRY_AFTER", 1))
+RECOMMEND_BATCH_WINDOW_MS = float(os.getenv("RECOMMEND_BATCH_WINDOW_MS", 2))
+RECOMMEND_BATCH_MAX_SIZE = int(os.getenv("RECOMMEND_BATCH_MAX_SIZE", 32))
+RECOMMEND_BATCH_MAX_PENDING = int(os.getenv("RECOMMEND_BATCH_MAX_PENDING", 256))  # 배처가 받아 둔(대기 + 계산 중) 요청 수 한도, 넘으면 503
+RECOMMEND_BATCH_CHUNK_SIZE = int(os.getenv("RECOMMEND_BATCH_CHUNK_SIZE", 64))
+RECOMMEND_BATCH_MAX_USERS = int(os.getenv("RECOMMEND_BATCH_MAX_USERS", 1000))
+RECOMMEND_CACHE_BACKEND = os.getenv("RECOMMEND_CACHE_BACKEND", "memory")  # memory, file, none
+RECOMMEND_CACHE_MAX_SIZE = int(os.getenv("RECOMMEND_CACHE_MAX_SIZE", 10000))
+RECOMMEND_CACHE_TTL = float(os.getenv("RECOMMEND_CACHE_TTL", 600))
+RECOMMEND_CACHE_DIR = os.getenv("RECOMMEND_CACHE_DIR")  # file 백엔드 디렉토리 (기본값: STORAGE_DIR/recommend_cache)
+MODEL_ARTIFACT_KEEP = int(os.getenv("MODEL_ARTIFACT_KEEP", 3))
+TRAIN_CPU_BUDGET = int(os.getenv("TRAIN_CPU_BUDGET", 0))  # 모델 학습에 사용할 코어 수 (0 이하이면 전체 코어)
+HYPERPARAM_FULL_SEARCH_DAYS = float(os.getenv("HYPERPARAM_FULL_SEARCH_DAYS", 7))  # 캐시된 하이퍼파라미터 재사용 기간 (0 이하이면 항상 전체 탐색)
+HYPERPARAM_R2_DRIFT = float(os.getenv("HYPERPARAM_R2_DRIFT", 0.02))  # 검증 R²가 이만큼 떨어지면 전체 탐색
+HYPERPARAM_SEARCH_MODE = os.getenv("HYPERPARAM_SEARCH_MODE", "grid")  # grid, halving (successive halving)
+MODEL_PRUNING_ENABLED = os.getenv("MODEL_PRUNING_ENABLED", "false").lower() == "true"  # 비용 대비 기여도가 낮은 개별 모델 제외 여부
+MODEL_PRUNING_MIN_GAIN_PER_MS = float(os.getenv("MODEL_PRUNING_MIN_GAIN_PER_MS", 1e-6))  # 유지할 최소 CV R² 기여도 / ms
+IMPUTATION_MODE = os.getenv("IMPUTATION_MODE", "iterative")  # iterative, category_median, log_linear
+IMPUTER_REUSE = os.getenv("IMPUTER_REUSE", "true").lower() == "true"  # 재학습 시 저장된 결측치 보완 모델 재사용 여부
+IMPUTER_MAX_AGE_DAYS = float(os.getenv("IMPUTER_MAX_AGE_DAYS", 7))  # 저장된 결측치 보완 모델 재사용 기간 (0 이하이면 항상 다시 학습)
+IMPUTER_MAX_ROW_DRIFT = float(os.getenv("IMPUTER_MAX_ROW_DRIFT", 0.1))  # 학습 당시 대비 행 수 변화율이 이보다 크면 다시 학습
+STAGE_CACHE_ENABLED = os.getenv("STAGE_CACHE_ENABLED", "true").lower() == "true"  # 데이터 파이프라인 단계별 결과 캐시 사용 여부
+STAGE_CACHE_KEEP = int(os.getenv("STAGE_CACHE_KEEP", 3))  # 단계별로 보관할 캐시 결과 수
+STAGE_CACHE_FORCE_REBUILD = os.getenv("STAGE_CACHE_FORCE_REBUILD", "false").lower() == "true"  # 시작 시 단계 캐시를 무시하고 전체 재계산
+COLUMNAR_SNAPSHOT_ENABLED = os.getenv("COLUMNAR_SNAPSHOT_ENABLED", "true").lower() == "true"  # 동기화 시 Arrow 스냅샷을 함께 저장하고 로드 시 우선 사용 (pyarrow 필요)
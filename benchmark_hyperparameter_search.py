@@ -0,0 +1,59 @@
+# benchmark_hyperparameter_search.py
+# 하이퍼파라미터 탐색 방식(grid / halving)별 학습 시간과 검증 R² 비교
+#
+# 사용법: python benchmark_hyperparameter_search.py [--modes grid halving] [--models xgb rf ...]
+import argparse
+import logging
+import time
+from dotenv import load_dotenv
+from sklearn.metrics import r2_score
+from app.config import RESTAURANTS_DIR
+from app.services.preprocess.restaurant.data_loader import load_restaurant_json_files
+from app.services.preprocess.restaurant.preprocessor import preprocess_data
+from app.services.model_trainer import load_or_train_model, scale_and_split
+from app.services.model_trainer.model_training import train_ridge, train_rf, train_xgb, train_lgb, train_cat, train_mlp
+
+# .env 파일 로드
+load_dotenv()
+
+# 로깅 설정 (탐색 과정 로그는 생략)
+logging.basicConfig(level=logging.WARNING,
+                   format='%(asctime)s - %(levelname)s - %(name)s - %(message)s')
+
+TRAINERS = {
+    "ridge": train_ridge,
+    "rf": train_rf,
+    "xgb": train_xgb,
+    "lgb": train_lgb,
+    "cat": train_cat,
+    "mlp": train_mlp,
+}
+
+parser = argparse.ArgumentParser(description="하이퍼파라미터 탐색 방식 벤치마크")
+parser.add_argument("--modes", nargs="+", default=["grid", "halving"])
+parser.add_argument("--models", nargs="+", default=list(TRAINERS), choices=list(TRAINERS))
+args = parser.parse_args()
+
+# 학습과 같은 피처/분할을 쓰기 위해 저장된 모델 아티팩트(없으면 학습)의 df_model 사용
+print("데이터 준비 중...")
+df_final = preprocess_data(load_restaurant_json_files(str(RESTAURANTS_DIR)))
+model_dict, version = load_or_train_model(df_final)
+df_model = model_dict["df_model"]
+_, X_train, X_test, y_train, y_test = scale_and_split(df_model[model_dict["model_features"]], df_model["score"])
+print(f"모델 버전: {version}, 학습 {len(X_train)}행 / 검증 {len(X_test)}행\n")
+
+results = {}
+for mode in args.modes:
+    for name in args.models:
+        start = time.perf_counter()
+        model = TRAINERS[name](X_train, y_train, n_jobs=1, search_mode=mode)
+        elapsed = time.perf_counter() - start
+        r2 = r2_score(y_test, model.predict(X_test))
+        results[(mode, name)] = (elapsed, r2)
+        print(f"[{mode:8s}] {name:6s} {elapsed:8.2f}초  검증 R² {r2:.6f}")
+    print()
+
+print(f"{'모델':6s} " + " ".join(f"{mode + ' 시간':>14s} {mode + ' R²':>14s}" for mode in args.modes))
+for name in args.models:
+    print(f"{name:6s} " + " ".join(f"{results[(mode, name)][0]:13.2f}초 {results[(mode, name)][1]:14.6f}" for mode in args.modes))
+print(f"{'합계':6s} " + " ".join(f"{sum(results[(mode, n)][0] for n in args.models):13.2f}초 {'':>14s}" for mode in args.modes))
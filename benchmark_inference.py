@@ -0,0 +1,60 @@
+# benchmark_inference.py
+# 스태킹 앙상블 원본 predict와 추론 전용 모델(CompiledStackingModel)의 지연 시간 비교
+#
+# 사용법: python benchmark_inference.py [--repeat 200]
+import argparse
+import logging
+import time
+import numpy as np
+import pandas as pd
+from dotenv import load_dotenv
+from app.config import RESTAURANTS_DIR
+from app.services.preprocess.restaurant.data_loader import load_restaurant_json_files
+from app.services.preprocess.restaurant.preprocessor import preprocess_data
+from app.services.model_trainer import load_or_train_model
+
+# .env 파일 로드
+load_dotenv()
+
+# 로깅 설정
+logging.basicConfig(level=logging.WARNING,
+                   format='%(asctime)s - %(levelname)s - %(name)s - %(message)s')
+
+parser = argparse.ArgumentParser(description="추론 지연 시간 벤치마크")
+parser.add_argument("--repeat", type=int, default=200)
+args = parser.parse_args()
+
+
+def measure(fn, X, repeat):
+    """반복 실행 지연 시간(ms)의 중앙값과 p95"""
+    fn(X)  # 워밍업
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(X)
+        timings.append((time.perf_counter() - start) * 1000)
+    return np.median(timings), np.percentile(timings, 95)
+
+
+print("모델 준비 중...")
+df_final = preprocess_data(load_restaurant_json_files(str(RESTAURANTS_DIR)))
+model_dict, version = load_or_train_model(df_final)
+stacking_reg = model_dict["stacking_reg"]
+compiled = model_dict["inference_model"]
+if compiled is None:
+    raise SystemExit("추론 전용 모델 변환에 실패했습니다. 로그를 확인하세요.")
+
+features = model_dict["model_features"]
+X_all = pd.DataFrame(model_dict["scaler"].transform(model_dict["df_model"][features]), columns=features)
+print(f"모델 버전: {version}, 원본 대비 최대 오차: {compiled.parity_max_abs_error:.3e}\n")
+
+# 1k행 입력은 학습 데이터를 반복해 채움
+rows_1k = X_all.iloc[np.arange(1000) % len(X_all)].reset_index(drop=True)
+inputs = {"1행": X_all.iloc[:1], "1k행": rows_1k}
+
+print(f"{'입력':6s} {'원본 중앙값':>12s} {'원본 p95':>10s} {'변환 중앙값':>12s} {'변환 p95':>10s} {'배속':>6s}")
+for label, X in inputs.items():
+    assert np.allclose(stacking_reg.predict(X), compiled.predict(X), rtol=0, atol=1e-9)
+    base_median, base_p95 = measure(stacking_reg.predict, X, args.repeat)
+    fast_median, fast_p95 = measure(compiled.predict, X, args.repeat)
+    print(f"{label:6s} {base_median:10.3f}ms {base_p95:8.3f}ms {fast_median:10.3f}ms {fast_p95:8.3f}ms {base_median / fast_median:5.1f}x")
@@ -0,0 +1,105 @@
+# benchmark_mongo_sync.py
+# MongoDB 동기화 비교: 매번 전체 조회(full) vs 변경분만 조회해 로컬 스냅샷에 병합(incremental)
+# 조회한 문서 수, 전송된 BSON 크기, 소요 시간과 두 방식 결과 일치 여부를 출력
+#
+# 사용법: python benchmark_mongo_sync.py [--docs 20000] [--change-ratio 0.01] [--rounds 5] [--uri mongodb://localhost:27017]
+# --uri를 지정하지 않으면 mongomock을 사용합니다. mongomock은 조건 조회를 Python에서 전체 문서를 훑어 계산하므로
+# 증분 조회 시간이 실제 서버(updated_at 인덱스 사용)보다 크게 나옵니다. 실제 시간 비교는 --uri로 측정하세요.
+import argparse
+import logging
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+from dotenv import load_dotenv
+from app.services.mongodb.incremental_sync import sync_collection
+
+# .env 파일 로드
+load_dotenv()
+
+# 로깅 설정
+logging.basicConfig(level=logging.WARNING,
+                   format='%(asctime)s - %(levelname)s - %(name)s - %(message)s')
+
+parser = argparse.ArgumentParser(description="MongoDB 증분 동기화 벤치마크")
+parser.add_argument("--docs", type=int, default=20000)
+parser.add_argument("--change-ratio", type=float, default=0.01, help="동기화 사이에 수정되는 문서 비율")
+parser.add_argument("--insert-ratio", type=float, default=0.002, help="동기화 사이에 추가되는 문서 비율")
+parser.add_argument("--rounds", type=int, default=5)
+parser.add_argument("--uri", default=None, help="실제 mongod 주소 (기본값: mongomock)")
+args = parser.parse_args()
+
+if args.uri:
+    from pymongo import MongoClient
+    client = MongoClient(args.uri)
+else:
+    import mongomock
+    client = mongomock.MongoClient()
+db = client["sync_benchmark"]
+collection = db["restaurants"]
+collection.drop()
+
+rng = random.Random(42)
+clock = datetime(2025, 1, 1)
+
+
+def make_restaurant(i, updated_at):
+    return {
+        "restaurant_id": i,
+        "name": f"식당 {i}",
+        "category_id": rng.randint(1, 12),
+        "score": round(rng.uniform(3.0, 5.0), 1),
+        "review": rng.randint(0, 3000),
+        "address": f"서울특별시 어딘가 {i}번길",
+        "operating_hour": "월~금 11:00 ~ 22:00",
+        "convenience": ["주차", "와이파이", "예약"][: rng.randint(0, 3)],
+        "caution": ["예약불가"] if rng.random() < 0.3 else [],
+        "updated_at": updated_at,
+    }
+
+
+print(f"문서 {args.docs}개 준비 중...")
+collection.insert_many([make_restaurant(i, clock - timedelta(seconds=rng.randint(0, 86400 * 365)))
+                        for i in range(args.docs)])
+collection.create_index("updated_at")
+next_id = args.docs
+
+with tempfile.TemporaryDirectory() as snapshot_dir:
+    # 최초 스냅샷 생성 (전체 조회)
+    sync_collection(db, "restaurants", mode="incremental", snapshot_dir=snapshot_dir, full_every=0)
+
+    print(f"\n{'회차':>4s} {'방식':22s} {'조회 문서':>10s} {'전송 크기':>12s} {'시간':>10s}")
+    totals = {"full": [0, 0.0], "incremental": [0, 0.0]}
+    for round_no in range(1, args.rounds + 1):
+        # 일부 문서 수정 및 추가
+        clock += timedelta(hours=1)
+        changed_ids = rng.sample(range(next_id), int(next_id * args.change_ratio))
+        for restaurant_id in changed_ids:
+            collection.update_one({"restaurant_id": restaurant_id},
+                                  {"$set": {"score": round(rng.uniform(3.0, 5.0), 1), "updated_at": clock}})
+        new_docs = [make_restaurant(next_id + i, clock) for i in range(int(next_id * args.insert_ratio))]
+        if new_docs:
+            collection.insert_many(new_docs)
+        next_id += len(new_docs)
+
+        results = {}
+        for mode in ("full", "incremental"):
+            start = time.perf_counter()
+            documents, stats = sync_collection(db, "restaurants", mode=mode, snapshot_dir=snapshot_dir,
+                                               full_every=0, count_bytes=True)
+            documents = list(documents)
+            elapsed = time.perf_counter() - start
+            results[mode] = documents
+            totals[mode][0] += stats["bytes"]
+            totals[mode][1] += elapsed
+            print(f"{round_no:4d} {stats['mode']:22s} {stats['fetched']:10d} {stats['bytes'] / 1024:10.1f}KB {elapsed * 1000:8.1f}ms")
+
+        key = lambda doc: doc["restaurant_id"]
+        if sorted(results["full"], key=key) != sorted(results["incremental"], key=key):
+            print("  경고: 증분 동기화 결과가 전체 조회 결과와 다릅니다.")
+
+    full_bytes, full_seconds = totals["full"]
+    inc_bytes, inc_seconds = totals["incremental"]
+    print(f"\n합계: 전체 조회 {full_bytes / 1024:.1f}KB / {full_seconds:.2f}s, "
+          f"증분 {inc_bytes / 1024:.1f}KB / {inc_seconds:.2f}s "
+          f"(전송량 {full_bytes / max(inc_bytes, 1):.1f}배, 시간 {full_seconds / max(inc_seconds, 1e-9):.1f}배 감소)")
@@ -0,0 +1,66 @@
+# benchmark_retrain.py
+# 재학습 시 결측치 보완 단계 비교: 방식별(iterative / category_median / log_linear) 학습 시간,
+# 저장된 imputer 재사용 시 새 행 변환 시간, 가려 둔 값에 대한 보완 오차
+#
+# 사용법: python benchmark_retrain.py [--modes iterative log_linear] [--repeat 5] [--mask-ratio 0.05]
+import argparse
+import logging
+import time
+import numpy as np
+from dotenv import load_dotenv
+from app.config import RESTAURANTS_DIR
+from app.services.preprocess.restaurant.data_loader import load_restaurant_json_files
+from app.services.preprocess.restaurant.preprocessor import preprocess_data
+from app.services.model_trainer.data_preparation import FittedImputer, IMPUTATION_MODES
+
+# .env 파일 로드
+load_dotenv()
+
+# 로깅 설정 (학습 과정 로그는 생략)
+logging.basicConfig(level=logging.WARNING,
+                   format='%(asctime)s - %(levelname)s - %(name)s - %(message)s')
+
+parser = argparse.ArgumentParser(description="재학습 결측치 보완 벤치마크")
+parser.add_argument("--modes", nargs="+", default=list(IMPUTATION_MODES), choices=list(IMPUTATION_MODES))
+parser.add_argument("--repeat", type=int, default=5)
+parser.add_argument("--mask-ratio", type=float, default=0.05, help="오차 측정을 위해 가릴 관측값 비율")
+args = parser.parse_args()
+
+IMPUTE_COLS = ["score", "review"]
+
+
+def median_ms(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return float(np.median(timings))
+
+
+print("데이터 준비 중...")
+df_final = preprocess_data(load_restaurant_json_files(str(RESTAURANTS_DIR)))
+complete = df_final.dropna(subset=IMPUTE_COLS).reset_index(drop=True)
+new_rows = df_final[df_final[IMPUTE_COLS].isna().any(axis=1)].reset_index(drop=True)
+
+# 관측값 일부를 가려서 보완 오차 측정
+rng = np.random.default_rng(42)
+masked = complete.copy()
+mask = rng.random((len(masked), len(IMPUTE_COLS))) < args.mask_ratio
+for i, col in enumerate(IMPUTE_COLS):
+    masked.loc[mask[:, i], col] = np.nan
+print(f"학습 {len(complete)}행, 결측치가 있는 새 행 {len(new_rows)}개, 오차 측정용으로 가린 값 {int(mask.sum())}개\n")
+
+# 기존 동작: 재학습마다 IterativeImputer를 새로 학습해 전체 행 변환
+baseline_ms = median_ms(lambda: FittedImputer(IMPUTE_COLS, "iterative").fit(masked).transform(masked.copy()), args.repeat)
+print(f"기존 방식(매번 iterative 학습): {baseline_ms:.2f}ms\n")
+
+print(f"{'방식':16s} {'학습+변환':>10s} {'재사용(새 행)':>14s} {'기존 대비 절약':>14s} {'score MAE':>10s} {'review MAE':>11s}")
+for mode in args.modes:
+    fit_ms = median_ms(lambda: FittedImputer(IMPUTE_COLS, mode).fit(masked).transform(masked.copy()), args.repeat)
+    imputer = FittedImputer(IMPUTE_COLS, mode).fit(masked)
+    reuse_ms = median_ms(lambda: imputer.transform(new_rows.copy()), args.repeat)
+
+    filled = imputer.transform(masked.copy())
+    errors = [np.abs(filled.loc[mask[:, i], col] - complete.loc[mask[:, i], col]).mean() for i, col in enumerate(IMPUTE_COLS)]
+    print(f"{mode:16s} {fit_ms:8.2f}ms {reuse_ms:12.2f}ms {baseline_ms - reuse_ms:12.2f}ms {errors[0]:10.4f} {errors[1]:11.2f}")
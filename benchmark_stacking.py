@@ -0,0 +1,66 @@
+# benchmark_stacking.py
+# 스태킹 단계 비교: 기존 StackingRegressor(cv=3) + cross_val_score(cv=3)와
+# 폴드마다 개별 모델을 다시 학습해 폴드 밖 예측을 한 번 만드는 train_stacking의 학습 시간, CV R², 검증 예측 차이
+#
+# 사용법: python benchmark_stacking.py [--repeat 3] [--cv 3]
+import argparse
+import logging
+import time
+import numpy as np
+from dotenv import load_dotenv
+from sklearn.ensemble import StackingRegressor
+from sklearn.model_selection import cross_val_score
+from app.config import RESTAURANTS_DIR
+from app.services.preprocess.restaurant.data_loader import load_restaurant_json_files
+from app.services.preprocess.restaurant.preprocessor import preprocess_data
+from app.services.model_trainer import load_or_train_model, scale_and_split
+from app.services.model_trainer.model_training import FinalRidge, train_stacking
+
+# .env 파일 로드
+load_dotenv()
+
+# 로깅 설정 (학습 과정 로그는 생략)
+logging.basicConfig(level=logging.WARNING,
+                   format='%(asctime)s - %(levelname)s - %(name)s - %(message)s')
+
+parser = argparse.ArgumentParser(description="스태킹 학습 벤치마크")
+parser.add_argument("--repeat", type=int, default=3)
+parser.add_argument("--cv", type=int, default=3)
+args = parser.parse_args()
+
+
+def previous_stacking(estimators, X, y):
+    # 최적화 이전 train_stacking과 같은 구성
+    stacking = StackingRegressor(estimators=estimators, final_estimator=FinalRidge(), cv=args.cv, n_jobs=1)
+    stacking.fit(X, y)
+    cv_score = cross_val_score(stacking, X, y, cv=args.cv, scoring='r2', n_jobs=1).mean()
+    return stacking, cv_score
+
+
+def timed(fn, repeat):
+    timings, result = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings)), result
+
+
+# 탐색이 끝난 개별 모델은 저장된 모델 아티팩트(없으면 학습)에서 가져옴
+print("데이터 준비 중...")
+df_final = preprocess_data(load_restaurant_json_files(str(RESTAURANTS_DIR)))
+model_dict, version = load_or_train_model(df_final)
+df_model = model_dict["df_model"]
+_, X_train, X_test, y_train, y_test = scale_and_split(df_model[model_dict["model_features"]], df_model["score"])
+estimators = list(model_dict["stacking_reg"].estimators_)
+print(f"모델 버전: {version}, 학습 {len(X_train)}행 / 검증 {len(X_test)}행, 개별 모델 {[name for name, _ in estimators]}\n")
+
+previous_s, (previous, previous_cv) = timed(lambda: previous_stacking(estimators, X_train, y_train), args.repeat)
+current_s, (current, current_cv) = timed(lambda: train_stacking(estimators, X_train, y_train, n_jobs=1, cv=args.cv), args.repeat)
+
+# 개별 모델 학습 횟수: 기존은 (1 + cv) × (1 + cv), 현재는 폴드마다 한 번 (전체 학습은 탐색 결과 재사용)
+print(f"{'방식':34s} {'시간':>8s} {'모델당 학습':>10s} {'CV R²':>10s}")
+print(f"{'StackingRegressor + cross_val_score':34s} {previous_s:7.2f}초 {(1 + args.cv) ** 2:10d} {previous_cv:10.6f}")
+print(f"{'train_stacking (폴드별 재학습)':34s} {current_s:7.2f}초 {args.cv:10d} {current_cv:10.6f}")
+print(f"\n시간 비율: {current_s / previous_s:.2f}배")
+print(f"검증 예측 최대 차이: {np.max(np.abs(previous.predict(X_test) - current.predict(X_test))):.3e}")
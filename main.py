@@ -112,7 +112,8 @@ async def startup_event():
             logger.info("MongoDB 데이터 동기화 완료, 모델 초기화 시작...")
             # 모델 초기화 함수 호출
             from app.router.recommendation_api import initialize_model
-            init_result = initialize_model()
+            from app.setting import STAGE_CACHE_FORCE_REBUILD
+            init_result = initialize_model(rebuild=STAGE_CACHE_FORCE_REBUILD)
             
             if init_result:
                 logger.info("모델 초기화 성공")
@@ -138,9 +139,23 @@ async def startup_event():
 async def shutdown_event():
     logger.info("서버를 종료합니다.")
     # 필요한 정리 작업 수행
+    from app.services.recommend_executor import shutdown_recommend_executor
+    shutdown_recommend_executor()
+    # 공유 MongoDB 연결과 SSH 터널 종료
+    from app.services.mongodb.connection import close_mongodb_connection
+    close_mongodb_connection()
 
 # 서버 실행
 if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="식당 추천 API 서버")
+    parser.add_argument("--force-rebuild", action="store_true",
+                        help="시작 시 데이터 파이프라인 단계 캐시를 무시하고 전체 재계산")
+    args = parser.parse_args()
+    if args.force_rebuild:
+        # reload 모드의 서버 프로세스에도 전달되도록 환경 변수로 설정
+        os.environ["STAGE_CACHE_FORCE_REBUILD"] = "true"
+
     uvicorn.run(
         "main:app",
         host="0.0.0.0",
@@ -154,4 +169,5 @@ if __name__ == "__main__":
         multiprocessing.freeze_support()
 
 # 실행 명령어 (터미널에서 실행 시):
-# uvicorn main:app --host 0.0.0.0 --port 5000 --reload --log-config logging_config.json
\ No newline at end of file
+# uvicorn main:app --host 0.0.0.0 --port 5000 --reload --log-config logging_config.json
+# 단계 캐시 전체 재계산: python main.py --force-rebuild (또는 STAGE_CACHE_FORCE_REBUILD=true)
\ No newline at end of file
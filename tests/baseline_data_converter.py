@@ -0,0 +1,22 @@
+# tests/baseline_data_converter.py
+# 최적화 이전(baseline) JSON 저장 코드 사본 - 등가성 테스트의 기준 결과 계산용 (수정하지 않음)
+
+import json
+
+from app.services.mongodb.data_converter import convert_bytes_to_str, convert_datetime, convert_numpy_types
+
+
+def save_json(data, filepath):
+    """전체 목록을 변환한 뒤 json.dump로 한 번에 저장"""
+    # 바이트 데이터를 문자열로 변환
+    data = convert_bytes_to_str(data)
+    # 날짜/시간 객체와 NumPy 타입을 변환
+    data = convert_datetime(data)
+    data = convert_numpy_types(data)
+
+    # 디렉토리 확인 및 생성
+    filepath.parent.mkdir(parents=True, exist_ok=True)
+
+    # JSON으로 저장
+    with open(filepath, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
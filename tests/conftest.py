@@ -0,0 +1,130 @@
+# tests/conftest.py
+# 테스트 공통 설정: 저장 경로를 임시 디렉토리로 분리하고 합성 식당/사용자 데이터와 간단한 모델 제공
+
+import os
+import tempfile
+
+# app 모듈을 import하기 전에 저장 경로를 임시 디렉토리로 지정 (실제 storage 디렉토리를 건드리지 않음)
+_storage_dir = tempfile.mkdtemp(prefix="tri-ai-test-")
+os.environ["STORAGE_DIR"] = _storage_dir
+os.environ["RESTAURANTS_DIR"] = os.path.join(_storage_dir, "input_json", "restaurants")
+os.environ["USER_DIR"] = os.path.join(_storage_dir, "input_json", "user")
+os.environ["FEEDBACK_DIR"] = os.path.join(_storage_dir, "output_feedback_json")
+os.environ.setdefault("USE_SSH_TUNNEL", "false")
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import Ridge
+from sklearn.preprocessing import StandardScaler
+
+MODEL_FEATURES = ["score", "review", "price", "duration_hours", "caution_예약가능", "conv_주차"]
+
+
+def make_restaurants(n=300, seed=0) -> pd.DataFrame:
+    """전처리된 식당 데이터와 같은 컬럼 구성의 합성 데이터 (가격, 운영 시간은 동점이 생기지 않도록 연속값 사용)"""
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "restaurant_id": np.arange(1, n + 1),
+        "category_id": rng.integers(1, 13, n),
+        "score": np.round(rng.uniform(3.0, 5.0, n), 1),  # 실제 데이터처럼 소수점 한 자리
+        "review": rng.integers(0, 3000, n).astype(str),
+        "price": rng.uniform(10000, 500000, n),
+        "duration_hours": rng.uniform(4, 14, n),
+    })
+    for col in ["caution_배달가능", "caution_예약가능", "caution_포장가능", "caution_예약불가"]:
+        df[col] = rng.integers(0, 2, n)
+    for col in ["conv_주차", "conv_와이파이", "conv_편의시설 정보 없음"]:
+        df[col] = rng.integers(0, 2, n)
+    return df
+
+
+def make_user_features(n=20, seed=1) -> pd.DataFrame:
+    """preprocessed_user_features.csv와 같은 컬럼 구성의 합성 사용자 특성"""
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "user_id": np.arange(1, n + 1),
+        "max_price": np.where(rng.random(n) < 0.2, 0, rng.integers(100000, 500000, n)),
+        "min_price": rng.integers(10000, 100000, n),
+    })
+    for i in range(1, 13):
+        df[f"category_{i}"] = rng.integers(0, 2, n)
+    df["total_reservations"] = rng.integers(0, 20, n).astype(float)
+    df["completed_reservations"] = rng.integers(0, 20, n)
+    df["reservation_completion_rate"] = rng.random(n)
+    df["total_likes"] = rng.integers(0, 20, n)
+    df["like_to_reservation_ratio"] = rng.uniform(0, 3, n)
+    return df
+
+
+@pytest.fixture(scope="session")
+def storage_dir():
+    return _storage_dir
+
+
+@pytest.fixture(scope="session")
+def restaurants():
+    return make_restaurants()
+
+
+@pytest.fixture(scope="session")
+def user_features():
+    return make_user_features()
+
+
+@pytest.fixture(scope="session")
+def fitted_model(restaurants):
+    """(stacking_reg, model_features, scaler) - 추천 경로 테스트용 간단한 회귀 모델"""
+    X = restaurants[MODEL_FEATURES].astype(float)
+    scaler = StandardScaler().fit(X)
+    model = Ridge().fit(pd.DataFrame(scaler.transform(X), columns=MODEL_FEATURES), restaurants["score"])
+    return model, list(MODEL_FEATURES), scaler
+
+
+@pytest.fixture(scope="session")
+def score_table(restaurants, fitted_model):
+    from app.services.model_trainer.recommenation.score_table import RestaurantScoreTable
+    stacking_reg, model_features, scaler = fitted_model
+    return RestaurantScoreTable.build(restaurants, stacking_reg, model_features, scaler)
+
+
+@pytest.fixture(scope="session")
+def user_store(user_features):
+    """사용자 특성 저장소 (3번 사용자는 선호 카테고리가 하나도 없음)"""
+    from app.services.preprocess.user.user_feature_store import UserFeatureStore
+    features = user_features.copy()
+    features.loc[features["user_id"] == 3, [f"category_{i}" for i in range(1, 13)]] = 0
+    return UserFeatureStore.from_dataframe(features)
+
+
+@pytest.fixture
+def api_client(monkeypatch, restaurants, fitted_model, score_table, user_store):
+    """
+    추천 라우터만 올린 TestClient (모델 스냅샷, 작업자 풀, 캐시는 테스트 전용으로 교체)
+
+    Returns:
+        tuple: (TestClient, RecommendExecutor)
+    """
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+    from app import dependencies
+    from app.router.recommendation_api import router
+    from app.services import recommend_cache, recommend_executor
+    from app.services.recommend_cache import RecommendCache
+    from app.services.recommend_executor import RecommendExecutor
+
+    stacking_reg, model_features, scaler = fitted_model
+    snapshot = dependencies.ModelSnapshot(
+        scaler=scaler, stacking_reg=stacking_reg, model_features=model_features, df_model=restaurants,
+        score_table=score_table, user_feature_store=user_store, model_version="test-model",
+    )
+    executor = RecommendExecutor(max_workers=2, queue_size=1)
+    monkeypatch.setattr(dependencies, "_model_snapshot", snapshot)
+    monkeypatch.setattr(recommend_executor, "_recommend_executor", executor)
+    monkeypatch.setattr(recommend_cache, "_recommend_cache", RecommendCache(None))
+
+    app = FastAPI()
+    app.include_router(router, prefix="/recommend")
+    with TestClient(app) as client:
+        yield client, executor
+    executor.shutdown()
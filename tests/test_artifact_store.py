@@ -0,0 +1,111 @@
+# tests/test_artifact_store.py
+# 모델 아티팩트: 데이터 해시 + 학습 설정/코드 버전이 모두 같을 때만 재사용, 결측치 보완 모델 재사용 한도
+
+import pandas as pd
+from sklearn.linear_model import Ridge
+from sklearn.preprocessing import StandardScaler
+
+from app.services.model_trainer.artifact_store import (
+    compute_data_hash, compute_training_signature, save_model_artifact, load_latest_model_artifact, load_latest_imputer
+)
+from app.services.model_trainer.data_preparation import FittedImputer
+
+
+def _model_dict(restaurants):
+    X = restaurants[["score", "price"]]
+    return {
+        "scaler": StandardScaler().fit(X),
+        "stacking_reg": Ridge().fit(X, restaurants["score"]),
+        "model_features": ["score", "price"],
+        "df_model": restaurants,
+        "imputer": FittedImputer(["score", "price"], "category_median").fit(restaurants),
+    }
+
+
+def test_artifact_is_reused_only_for_same_data_settings_and_code(tmp_path, restaurants):
+    data_hash = compute_data_hash(restaurants)
+    signature = compute_training_signature()
+    version = save_model_artifact(_model_dict(restaurants), data_hash, root=tmp_path, training_signature=signature)
+
+    model_dict, loaded = load_latest_model_artifact(data_hash, root=tmp_path, training_signature=signature)
+    assert loaded == version
+    assert model_dict["model_features"] == ["score", "price"]
+
+    other_data = compute_data_hash(restaurants.iloc[1:])
+    assert load_latest_model_artifact(other_data, root=tmp_path, training_signature=signature) == (None, None)
+
+    other_setting = {**signature, "settings": {**signature["settings"], "IMPUTATION_MODE": "log_linear"}}
+    assert load_latest_model_artifact(data_hash, root=tmp_path, training_signature=other_setting) == (None, None)
+
+    other_code = {**signature, "code_version": "0" * 64}
+    assert load_latest_model_artifact(data_hash, root=tmp_path, training_signature=other_code) == (None, None)
+
+
+def test_training_signature_tracks_settings_and_trainer_code(monkeypatch, tmp_path):
+    from app import setting
+    from app.services import stage_cache
+
+    signature = compute_training_signature()
+    assert compute_training_signature() == signature
+    assert set(signature["settings"]) >= {"IMPUTATION_MODE", "HYPERPARAM_SEARCH_MODE",
+                                          "MODEL_PRUNING_ENABLED", "MODEL_PRUNING_MIN_GAIN_PER_MS"}
+
+    monkeypatch.setattr(setting, "HYPERPARAM_SEARCH_MODE", "halving")
+    assert compute_training_signature()["settings"] != signature["settings"]
+    monkeypatch.undo()
+
+    # 학습 코드 디렉토리 내용이 바뀌면 코드 버전도 바뀜
+    trainer_dir = tmp_path / "model_trainer"
+    trainer_dir.mkdir()
+    (trainer_dir / "train_model.py").write_text("A = 1\n")
+    before = stage_cache.code_version(trainer_dir)
+    (trainer_dir / "train_model.py").write_text("A = 2\n")
+    assert stage_cache.code_version(trainer_dir) != before
+
+
+def test_imputer_is_refit_when_old_or_data_drifted(restaurants):
+    from datetime import datetime, timedelta
+    from app.services.model_trainer.data_preparation import fit_or_reuse_imputer
+
+    imputer = FittedImputer(["score", "price"], "category_median").fit(restaurants)
+    assert not imputer.is_stale(len(restaurants))
+    assert fit_or_reuse_imputer(restaurants, ["score", "price"], imputer, mode="category_median") is imputer
+
+    # 행 수 변화가 한도를 넘으면 다시 학습
+    grown = pd.concat([restaurants, restaurants.iloc[:len(restaurants) // 5]], ignore_index=True)
+    assert imputer.is_stale(len(grown))
+    refit = fit_or_reuse_imputer(grown, ["score", "price"], imputer, mode="category_median")
+    assert refit is not imputer and refit.n_fit_rows_ == len(grown)
+
+    # 재사용 기간이 지났거나 0 이하이면 다시 학습
+    assert imputer.is_stale(len(restaurants), max_age_days=0)
+    imputer.fitted_at_ = (datetime.now() - timedelta(days=8)).isoformat()
+    assert imputer.is_stale(len(restaurants), max_age_days=7)
+
+
+def test_force_retrain_refits_imputer_and_signature_gates_reuse(monkeypatch, tmp_path, restaurants):
+    import sys
+    from app.services.model_trainer import artifact_store
+    train_model_module = sys.modules["app.services.model_trainer.train_model"]  # 패키지의 train_model 함수와 이름이 같음
+
+    signature = compute_training_signature()
+    save_model_artifact(_model_dict(restaurants), compute_data_hash(restaurants), root=tmp_path,
+                        training_signature=signature)
+    assert load_latest_imputer(root=tmp_path, training_signature=signature) is not None
+    other_code = {**signature, "code_version": "0" * 64}
+    assert load_latest_imputer(root=tmp_path, training_signature=other_code) is None
+
+    passed = []
+
+    def fake_train_model(df_final, full_search=False, imputer=None):
+        passed.append(imputer)
+        return _model_dict(restaurants)
+
+    monkeypatch.setattr(artifact_store, "get_artifact_root", lambda: tmp_path)
+    monkeypatch.setattr(train_model_module, "train_model", fake_train_model)
+    changed = restaurants.iloc[1:]
+
+    artifact_store.load_or_train_model(changed)
+    assert passed[-1] is not None  # 일반 재학습은 저장된 imputer를 넘김 (오래되었는지는 train_model에서 확인)
+    artifact_store.load_or_train_model(changed, force_retrain=True)
+    assert passed[-1] is None
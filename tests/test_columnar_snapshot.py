@@ -0,0 +1,128 @@
+# tests/test_columnar_snapshot.py
+# Arrow 스냅샷: data_loader로 읽은 DataFrame이 JSON 경로와 같은지(값, dtype), 오래되거나 없는 스냅샷은 JSON으로 대체
+
+import os
+
+import pandas as pd
+import pytest
+
+from app.services import columnar_snapshot
+from app.services.columnar_snapshot import open_snapshot_writer, load_snapshot_frame, snapshot_path
+from app.services.mongodb.data_converter import process_and_save_data
+from app.services.preprocess.restaurant.data_loader import load_restaurant_json_files, load_user_json_files
+
+
+def _restaurants(start, n):
+    # 실제 데이터처럼 review는 숫자와 문자열("1,079")이 섞여 있고, 일부 필드는 비어 있음
+    return [
+        {
+            "db_category_id": i % 3,
+            "restaurant_id": i,
+            "name": f"식당 {i}",
+            "category_id": str(i % 12 + 1),
+            "score": None if i % 7 == 0 else 3.5 + (i % 3) * 0.5,
+            "review": f"{i},079" if i % 4 == 0 else i * 10,
+            "address": "서울 중구",
+            "operating_hour": None if i % 5 == 0 else "월 11:00~21:00",
+            "expanded_days": None if i % 5 == 0 else "월,화,수",
+            "time_range": None if i % 5 == 0 else "11:00~21:00",
+            "phone_number": None if i % 3 == 0 else 21234567.0 + i,
+            "image_urls": "['a.jpg']",
+            "convenience": "['주차']",
+            "caution": "['예약가능']",
+            "is_deleted": i % 11 == 0,
+        }
+        for i in range(start, start + n)
+    ]
+
+
+def _save(collection_name, documents, path):
+    assert process_and_save_data(iter(documents), path, collection_name, open_snapshot_writer(collection_name, path))
+
+
+def _json_path(monkeypatch, load, *args):
+    """스냅샷을 끈 상태(JSON 경로)로 로드"""
+    with monkeypatch.context() as m:
+        m.setattr(columnar_snapshot, "COLUMNAR_SNAPSHOT_ENABLED", False)
+        return load(*args)
+
+
+@pytest.fixture
+def restaurant_dir(tmp_path):
+    _save("restaurants", _restaurants(0, 40), tmp_path / "restaurant_data_20250101_000000.json")
+    # 두 번째 파일은 필드 순서가 다르고 일부 필드가 없음
+    documents = [{key: doc[key] for key in reversed(list(doc)) if key != "caution"} for doc in _restaurants(40, 30)]
+    _save("restaurants", documents, tmp_path / "restaurant_data_20250102_000000.json")
+    return tmp_path
+
+
+def test_restaurant_snapshot_matches_json_path(restaurant_dir, monkeypatch):
+    json_files = sorted(restaurant_dir.glob("restaurant_data*.json"))
+    assert all(snapshot_path(path).exists() for path in json_files)
+    assert load_snapshot_frame(json_files) is not None
+
+    from_snapshot = load_restaurant_json_files(str(restaurant_dir))
+    from_json = _json_path(monkeypatch, load_restaurant_json_files, str(restaurant_dir))
+    pd.testing.assert_frame_equal(from_snapshot, from_json, check_exact=True)
+    assert from_snapshot["review"].dtype == object
+
+
+@pytest.mark.parametrize("review", [[570, 12], ["570", "1,079"]], ids=["int", "str"])
+def test_single_type_review_keeps_json_dtype(tmp_path, monkeypatch, review):
+    documents = _restaurants(0, 2)
+    for document, value in zip(documents, review):
+        document["review"] = value
+    _save("restaurants", documents, tmp_path / "restaurant_data_1.json")
+
+    from_snapshot = load_restaurant_json_files(str(tmp_path))
+    from_json = _json_path(monkeypatch, load_restaurant_json_files, str(tmp_path))
+    assert load_snapshot_frame([tmp_path / "restaurant_data_1.json"]) is not None
+    pd.testing.assert_frame_equal(from_snapshot, from_json, check_exact=True)
+
+
+def test_user_snapshots_match_json_path(tmp_path, monkeypatch):
+    _save("user_preferences", [{"user_id": i, "min_price": 10000, "max_price": 30000 + i} for i in range(20)],
+          tmp_path / "user_preferences_1.json")
+    _save("likes", [{"user_id": i % 5, "restaurant_id": i} for i in range(30)], tmp_path / "likes_1.json")
+    _save("reservations", [
+        {"user_id": i % 5, "restaurant_id": i, "status": "COMPLETED" if i % 2 else "CANCELED",
+         "reservation_time_id": i, "reservation_date": "2025-01-01", "seat_type_id": 1}
+        for i in range(30)
+    ], tmp_path / "reservations_1.json")
+    assert all(snapshot_path(path).exists() for path in tmp_path.glob("*.json"))
+
+    from_snapshot = load_user_json_files(str(tmp_path))
+    from_json = _json_path(monkeypatch, load_user_json_files, str(tmp_path))
+    assert from_snapshot.keys() == from_json.keys() and from_snapshot
+    for key in from_json:
+        pd.testing.assert_frame_equal(from_snapshot[key], from_json[key], check_exact=True)
+
+
+def test_stale_or_missing_snapshot_falls_back_to_json(restaurant_dir, monkeypatch):
+    json_files = sorted(restaurant_dir.glob("restaurant_data*.json"))
+    from_json = _json_path(monkeypatch, load_restaurant_json_files, str(restaurant_dir))
+
+    # JSON 파일만 다시 저장되어 스냅샷이 더 오래됨
+    newer = snapshot_path(json_files[0]).stat().st_mtime + 10
+    os.utime(json_files[0], (newer, newer))
+    assert load_snapshot_frame(json_files) is None
+    pd.testing.assert_frame_equal(load_restaurant_json_files(str(restaurant_dir)), from_json)
+
+    # 파일 하나의 스냅샷이 없으면 JSON과 섞지 않고 전부 JSON으로 로드
+    snapshot_path(json_files[1]).unlink()
+    assert load_snapshot_frame(json_files[1:]) is None
+    pd.testing.assert_frame_equal(load_restaurant_json_files(str(restaurant_dir)), from_json)
+
+
+def test_values_that_would_change_dtype_skip_the_snapshot(tmp_path, monkeypatch):
+    # float64 필드에 정수만 있으면 JSON 경로는 int64가 되므로 스냅샷을 만들지 않음
+    documents = [dict(doc, score=4) for doc in _restaurants(0, 5)]
+    _save("restaurants", documents, tmp_path / "restaurant_data_1.json")
+    # 숫자 필드의 문자열 값도 변환하지 않고 스냅샷을 만들지 않음
+    _save("likes", [{"user_id": "7", "restaurant_id": 1}], tmp_path / "likes_1.json")
+
+    assert not snapshot_path(tmp_path / "restaurant_data_1.json").exists()
+    assert not snapshot_path(tmp_path / "likes_1.json").exists()
+    assert not list(tmp_path.glob(".*tmp*"))
+    pd.testing.assert_frame_equal(load_restaurant_json_files(str(tmp_path)),
+                                  _json_path(monkeypatch, load_restaurant_json_files, str(tmp_path)))
@@ -0,0 +1,79 @@
+# tests/test_compiled_model.py
+# 추론 전용 스태킹 모델과 scikit-learn 스태킹 모델의 예측 일치 여부
+
+import numpy as np
+import pandas as pd
+import pytest
+from catboost import CatBoostRegressor
+from lightgbm import LGBMRegressor
+from sklearn.ensemble import RandomForestRegressor, StackingRegressor
+from sklearn.linear_model import Ridge
+from sklearn.neural_network import MLPRegressor
+from xgboost import XGBRegressor
+
+from app.services.model_trainer.compiled_model import PARITY_ATOL, CompiledStackingModel, compile_stacking_model
+from app.services.model_trainer.model_training import train_stacking
+
+
+def _estimators():
+    return [
+        ("ridge", Ridge()),
+        ("rf", RandomForestRegressor(n_estimators=20, max_depth=6, random_state=42)),
+        ("xgb", XGBRegressor(n_estimators=30, max_depth=3, random_state=42, n_jobs=1)),
+        ("lgb", LGBMRegressor(n_estimators=30, num_leaves=15, random_state=42, n_jobs=1, verbose=-1)),
+        ("cat", CatBoostRegressor(iterations=30, depth=3, random_state=42, verbose=0, allow_writing_files=False,
+                                  thread_count=1)),
+        ("mlp", MLPRegressor(hidden_layer_sizes=(16,), max_iter=300, random_state=42)),
+    ]
+
+
+@pytest.fixture(scope="module")
+def scaled_data():
+    rng = np.random.default_rng(0)
+    columns = [f"f{i}" for i in range(6)]
+    X = pd.DataFrame(rng.normal(size=(1400, 6)), columns=columns)
+    y = 3.5 + 0.6 * X["f0"] - 0.3 * X["f1"] + 0.2 * np.tanh(X["f2"] * X["f3"]) + rng.normal(scale=0.05, size=len(X))
+    return X.iloc[:400], y.iloc[:400], X.iloc[400:].reset_index(drop=True)
+
+
+@pytest.fixture(scope="module")
+def oof_stacking(scaled_data):
+    X_train, y_train, _ = scaled_data
+    fitted = [(name, estimator.fit(X_train, y_train)) for name, estimator in _estimators()]
+    stacking, _ = train_stacking(fitted, X_train, y_train)
+    return stacking
+
+
+@pytest.fixture(scope="module")
+def sklearn_stacking(scaled_data):
+    X_train, y_train, _ = scaled_data
+    return StackingRegressor(estimators=_estimators(), final_estimator=Ridge(), cv=3).fit(X_train, y_train)
+
+
+@pytest.mark.parametrize("stacking_name", ["oof_stacking", "sklearn_stacking"])
+def test_compiled_predictions_match_stacking_predict(request, scaled_data, stacking_name):
+    stacking = request.getfixturevalue(stacking_name)
+    X_train, _, X_new = scaled_data
+
+    compiled = compile_stacking_model(stacking, X_train)
+    assert isinstance(compiled, CompiledStackingModel)
+    assert compiled.names == ["ridge", "rf", "xgb", "lgb", "cat", "mlp"]
+
+    # 학습에 쓰지 않은 1k행, 한 행, DataFrame/ndarray 입력 모두 원본과 일치
+    for X in (X_new, X_new.iloc[:1], X_new.to_numpy()):
+        expected = np.asarray(stacking.predict(X), dtype=float)
+        np.testing.assert_allclose(compiled.predict(X), expected, rtol=0, atol=PARITY_ATOL)
+
+
+def test_compile_rejects_mismatching_model(oof_stacking, scaled_data):
+    X_train, _, _ = scaled_data
+
+    class ShiftedStacking:
+        # 구조는 같지만 predict 결과가 다른 모델 - 변환 결과를 쓰면 안 됨
+        final_estimator_ = oof_stacking.final_estimator_
+        named_estimators_ = oof_stacking.named_estimators_
+
+        def predict(self, X):
+            return oof_stacking.predict(X) + 1e-6
+
+    assert compile_stacking_model(ShiftedStacking(), X_train) is None
@@ -0,0 +1,149 @@
+# tests/test_data_collector.py
+# 사용자 컬렉션 동시 조회: 한 컬렉션의 실패가 다른 컬렉션 결과에 영향을 주지 않고, 완료 순서와 무관하게 결과가 완전한지 확인
+
+import json
+import logging
+import threading
+import time
+
+import mongomock
+import pytest
+from pymongo.errors import PyMongoError
+
+from app.services.mongodb import data_collector
+from app.services.mongodb.data_collector import USER_COLLECTIONS, process_user_data
+
+TIMESTAMP = "20250101_000000"
+
+
+class _Collection:
+    """조회 지연과 실패(처음부터 또는 문서 일부를 보낸 뒤)를 흉내 내는 mongomock 컬렉션 래퍼"""
+
+    def __init__(self, collection, tracker, delay=0.0, fail_after=None):
+        self._collection = collection
+        self._tracker = tracker
+        self.delay = delay
+        self.fail_after = fail_after
+        self.name = collection.name
+
+    def __getattr__(self, attr):
+        return getattr(self._collection, attr)
+
+    def find(self, *args, **kwargs):
+        return _Cursor(self, self._collection.find(*args, **kwargs))
+
+
+class _Cursor:
+    def __init__(self, owner, cursor):
+        self._owner = owner
+        self._cursor = cursor
+
+    def batch_size(self, size):
+        return self
+
+    def __iter__(self):
+        owner = self._owner
+        with owner._tracker:
+            time.sleep(owner.delay)
+            for i, document in enumerate(self._cursor):
+                if owner.fail_after is not None and i >= owner.fail_after:
+                    raise PyMongoError(f"{owner.name} cursor lost")
+                yield document
+
+
+class _Tracker:
+    """동시에 조회 중인 컬렉션 수의 최댓값 기록"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.active = self.peak = 0
+
+    def __enter__(self):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+
+    def __exit__(self, *exc):
+        with self._lock:
+            self.active -= 1
+
+
+def _documents(name, n):
+    return [{"user_id": i, "restaurant_id": i * 10 + 1, "source": name} for i in range(n)]
+
+
+@pytest.fixture
+def user_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(data_collector, "USER_DIR", str(tmp_path))
+    return tmp_path
+
+
+def _make_db(delays=None, failures=None):
+    server = mongomock.MongoClient()["sync_test"]
+    tracker = _Tracker()
+    db = {}
+    for i, (name, _, _) in enumerate(USER_COLLECTIONS):
+        server[name].insert_many(_documents(name, 20 + i))
+        db[name] = _Collection(server[name], tracker, delay=(delays or {}).get(name, 0.0),
+                               fail_after=(failures or {}).get(name))
+    return db, tracker
+
+
+def _saved(user_dir):
+    saved = {}
+    for name, file_prefix, _ in USER_COLLECTIONS:
+        path = user_dir / f"{file_prefix}{TIMESTAMP}.json"
+        if path.exists():
+            with open(path, encoding="utf-8") as f:
+                saved[name] = json.load(f)
+    return saved
+
+
+@pytest.mark.parametrize("fail_after", [0, 5], ids=["before_first_document", "mid_stream"])
+def test_failed_collection_is_reported_without_losing_the_others(user_dir, caplog, fail_after):
+    db, _ = _make_db(failures={"likes": fail_after})
+
+    with caplog.at_level(logging.INFO, logger=data_collector.__name__):
+        assert process_user_data(db, TIMESTAMP, concurrency=5) is True
+
+    saved = _saved(user_dir)
+    assert "likes" not in saved
+    for i, (name, _, _) in enumerate(USER_COLLECTIONS):
+        if name != "likes":
+            assert saved[name] == _documents(name, 20 + i)
+    # 실패한 컬렉션은 쓰다 만 파일을 남기지 않고 로그로 보고
+    assert not list(user_dir.glob("likes_*"))
+    assert not list(user_dir.glob(".*tmp*"))
+    assert "likes 동기화 실패" in caplog.text
+    assert f"{len(USER_COLLECTIONS) - 1}/{len(USER_COLLECTIONS)} 쿼리 성공" in caplog.text
+
+
+def test_results_are_complete_and_independent_of_completion_order(user_dir, tmp_path_factory, monkeypatch):
+    # 목록 앞쪽 컬렉션이 가장 늦게 끝나도록 지연
+    names = [name for name, _, _ in USER_COLLECTIONS]
+    delays = {name: 0.05 * (len(names) - i) for i, name in enumerate(names)}
+    db, tracker = _make_db(delays=delays)
+
+    assert process_user_data(db, TIMESTAMP, concurrency=5) is True
+    concurrent = _saved(user_dir)
+    assert tracker.peak > 1
+
+    # 순차 조회 결과와 같음
+    sequential_dir = tmp_path_factory.mktemp("sequential")
+    monkeypatch.setattr(data_collector, "USER_DIR", str(sequential_dir))
+    db, tracker = _make_db()
+    assert process_user_data(db, TIMESTAMP, concurrency=1) is True
+    assert tracker.peak == 1
+
+    assert concurrent == _saved(sequential_dir)
+    assert sorted(concurrent) == sorted(names)
+    for i, name in enumerate(names):
+        assert concurrent[name] == _documents(name, 20 + i)
+
+
+def test_all_collections_failing_returns_false(user_dir, caplog):
+    db, _ = _make_db(failures={name: 0 for name, _, _ in USER_COLLECTIONS})
+    with caplog.at_level(logging.INFO, logger=data_collector.__name__):
+        assert process_user_data(db, TIMESTAMP, concurrency=5) is False
+    assert _saved(user_dir) == {}
+    assert "모든 사용자 데이터 쿼리 실패" in caplog.text
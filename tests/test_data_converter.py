@@ -0,0 +1,105 @@
+# tests/test_data_converter.py
+# JSON 스트리밍 저장: 기존 json.dump 결과와 같은 내용, 중간 실패 시 쓰다 만 파일을 남기지 않음
+
+import json
+from datetime import date, datetime
+
+import numpy as np
+import pytest
+
+from app.services.mongodb.data_converter import write_json_array, process_and_save_data
+
+import baseline_data_converter as baseline
+
+
+def _documents():
+    return [
+        {
+            "restaurant_id": np.int64(1),
+            "name": "을지로 노포 🍜",
+            "category": "한식",
+            "score": np.float64(4.5),
+            "tags": ("국밥", "24시간"),
+            "vector": np.array([0.1, 0.2]),
+            "raw": "café".encode("utf-8"),
+            "opened": date(2020, 3, 1),
+            "updated_at": datetime(2025, 1, 1, 12, 30),
+            "menu": [{"name": "순대국", "price": np.int32(9000)}, {"name": "수육", "price": None}],
+            "open": True,
+        },
+        {"restaurant_id": 2, "name": "Quote \"and\" backslash \\ / tab\t", "score": 3.0, "nested": {"a": [1, [2, 3]]}},
+        {},
+    ]
+
+
+@pytest.mark.parametrize("documents", [_documents(), []], ids=["documents", "empty"])
+def test_streamed_json_matches_json_dump(tmp_path, documents):
+    streamed, dumped = tmp_path / "streamed.json", tmp_path / "dumped.json"
+
+    # 커서처럼 한 번만 순회할 수 있는 입력
+    assert write_json_array(iter(documents), streamed) == len(documents)
+    baseline.save_json(documents, dumped)
+
+    with open(streamed, encoding="utf-8") as f:
+        loaded = json.load(f)
+    with open(dumped, encoding="utf-8") as f:
+        expected = json.load(f)
+    assert loaded == expected
+    assert type(loaded) is list and len(loaded) == len(documents)
+
+    # 한글 등 비 ASCII 문자는 기존과 같이 이스케이프하지 않음
+    if documents:
+        text = streamed.read_text(encoding="utf-8")
+        assert "을지로 노포 🍜" in text and "\\u" not in text
+
+
+def _failing(documents, fail_after):
+    for i, document in enumerate(documents):
+        if i == fail_after:
+            raise RuntimeError("cursor lost")
+        yield document
+
+
+def test_failure_leaves_no_partial_file(tmp_path):
+    path = tmp_path / "restaurants.json"
+    with pytest.raises(RuntimeError):
+        write_json_array(_failing(_documents(), fail_after=2), path)
+    assert list(tmp_path.iterdir()) == []
+
+    # 이전 파일이 있으면 그대로 유지
+    write_json_array(_documents()[:1], path)
+    previous = path.read_bytes()
+    with pytest.raises(RuntimeError):
+        write_json_array(_failing(_documents(), fail_after=1), path)
+    assert path.read_bytes() == previous
+    assert [p.name for p in tmp_path.iterdir()] == ["restaurants.json"]
+
+
+class _Snapshot:
+    def __init__(self):
+        self.documents = []
+        self.committed = self.aborted = False
+
+    def add(self, document):
+        self.documents.append(document)
+
+    def commit(self):
+        self.committed = True
+        return False
+
+    def abort(self):
+        self.aborted = True
+
+
+def test_process_and_save_data_aborts_snapshot_on_failure(tmp_path):
+    path = tmp_path / "restaurants.json"
+    snapshot = _Snapshot()
+    assert process_and_save_data(_failing(_documents(), fail_after=2), path, "식당", snapshot) is False
+    assert snapshot.aborted and not snapshot.committed
+    assert not path.exists()
+
+    snapshot = _Snapshot()
+    assert process_and_save_data(iter(_documents()), path, "식당", snapshot) is True
+    assert snapshot.committed and not snapshot.aborted
+    with open(path, encoding="utf-8") as f:
+        assert snapshot.documents == json.load(f)
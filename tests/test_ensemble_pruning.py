@@ -0,0 +1,85 @@
+# tests/test_ensemble_pruning.py
+# 앙상블 가지치기: 비용 대비 기여도가 낮은 모델 제외, 최소 한 개 유지, 남은 모델로 다시 만든 스택과 같은 예측
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.compose import ColumnTransformer
+from sklearn.linear_model import Ridge
+from sklearn.neighbors import KNeighborsRegressor
+from sklearn.pipeline import make_pipeline
+
+from app.services.model_trainer import ensemble_pruning
+from app.services.model_trainer.ensemble_pruning import prune_ensemble
+from app.services.model_trainer.model_training import train_stacking, _fit_oof_stacking
+
+# 측정값에 흔들리지 않도록 지연 시간(ms)은 고정 (noise는 기여도가 없으면서 느린 모델)
+LATENCIES = {"ridge": 0.05, "knn": 2.0, "noise": 1.0}
+
+
+@pytest.fixture(scope="module")
+def data():
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.uniform(-2, 2, size=(300, 3)), columns=["a", "b", "c"])
+    # 선형 항(a)은 ridge, 비선형 항(b)은 knn이 설명하고 c 열은 타깃과 무관
+    y = X["a"] * 2 + np.sin(X["b"] * 3) * 1.5 + rng.normal(scale=0.1, size=len(X))
+    return X, y
+
+
+@pytest.fixture
+def stacking(data, monkeypatch):
+    monkeypatch.setattr(ensemble_pruning, "measure_predict_latency",
+                        lambda estimators, X: {name: LATENCIES[name] for name, _ in estimators})
+    X, y = data
+    estimators = [
+        ("ridge", Ridge(alpha=1.0)),
+        ("knn", make_pipeline(ColumnTransformer([("b", "passthrough", ["b"])]), KNeighborsRegressor(n_neighbors=10))),
+        ("noise", make_pipeline(ColumnTransformer([("c", "passthrough", ["c"])]), Ridge())),
+    ]
+    fitted = [(name, estimator.fit(X, y)) for name, estimator in estimators]
+    stacking, _ = train_stacking(fitted, X, y, cv=3)
+    return stacking
+
+
+def test_low_gain_per_ms_learner_is_dropped(data, stacking):
+    X, y = data
+    pruned, report = prune_ensemble(stacking, X, y, enabled=True, min_gain_per_ms=1e-3)
+
+    assert report["dropped"] == ["noise"]
+    assert report["chosen"] == ["ridge", "knn"]
+    assert report["learners"]["noise"]["kept"] is False
+    assert [name for name, _ in pruned.estimators_] == report["chosen"]
+    assert report["latency_ms_chosen"] < report["latency_ms_full"]
+    # 기여도가 없는 모델만 뺐으므로 CV R²는 거의 그대로
+    assert report["cv_r2_chosen"] >= report["cv_r2_full"] - 1e-3
+
+
+def test_pruning_never_leaves_an_empty_ensemble(data, stacking):
+    X, y = data
+    pruned, report = prune_ensemble(stacking, X, y, enabled=True, min_gain_per_ms=float("inf"))
+
+    assert len(report["chosen"]) == 1
+    assert len(pruned.estimators_) == 1
+    assert np.isfinite(pruned.predict(X)).all()
+
+
+def test_disabled_pruning_keeps_every_learner(data, stacking):
+    X, y = data
+    pruned, report = prune_ensemble(stacking, X, y, enabled=False, min_gain_per_ms=float("inf"))
+
+    assert pruned is stacking
+    assert report["dropped"] == [] and len(report["chosen"]) == len(LATENCIES)
+
+
+def test_pruned_stack_matches_stack_refit_on_kept_learners(data, stacking):
+    X, y = data
+    pruned, report = prune_ensemble(stacking, X, y, enabled=True, min_gain_per_ms=1e-3)
+    assert report["dropped"]
+
+    kept = [(name, stacking.named_estimators_[name]) for name in report["chosen"]]
+    refit = _fit_oof_stacking(kept, X, y, cv=3)
+
+    np.testing.assert_allclose(pruned.oof_predictions_, refit.oof_predictions_)
+    np.testing.assert_allclose(pruned.final_estimator_.coef_, refit.final_estimator_.coef_)
+    np.testing.assert_allclose(pruned.predict(X), refit.predict(X))
+    assert pruned.cv_score_ == pytest.approx(refit.cv_score_)
@@ -0,0 +1,28 @@
+# tests/test_feature_engineering.py
+# 향상된 특성 엔지니어링 결과가 최적화 이전(baseline) 결과와 비트 단위로 같은지 확인
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.model_trainer.feature_engineering import enhance_feature_engineering
+
+import baseline_feature_engineering as baseline
+from conftest import make_restaurants
+
+
+def _prepared(n=400, seed=0, missing_category=False) -> pd.DataFrame:
+    """train_model의 특성 엔지니어링 직전과 같은 형태 (리뷰 수는 숫자)"""
+    df = make_restaurants(n, seed)
+    df["review"] = df["review"].astype(float)
+    if missing_category:
+        df["category_id"] = df["category_id"].astype(float)
+        df.loc[df.index[::50], "category_id"] = np.nan
+    return df
+
+
+@pytest.mark.parametrize("missing_category", [False, True])
+def test_matches_baseline(missing_category):
+    df = _prepared(missing_category=missing_category)
+    pd.testing.assert_frame_equal(enhance_feature_engineering(df.copy()),
+                                  baseline.enhance_feature_engineering(df.copy()), check_exact=True)
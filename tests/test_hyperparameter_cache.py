@@ -0,0 +1,130 @@
+# tests/test_hyperparameter_cache.py
+# 하이퍼파라미터 캐시: 같은 지문은 재사용, 지문/탐색 설정이 바뀌거나 검증 R²가 떨어지면 다시 탐색
+
+import json
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import Ridge
+
+from app.services.model_trainer import hyperparameter_cache, training_scheduler
+from app.services.model_trainer.hyperparameter_cache import HyperparameterCache, compute_data_fingerprint
+from app.services.model_trainer.training_scheduler import BASE_LEARNERS
+
+SEARCHED_ALPHA = 3.0
+
+
+def _data(n=256, seed=0, columns=("a", "b", "c")):
+    rng = np.random.default_rng(seed)
+    X = pd.DataFrame(rng.normal(size=(n, len(columns))), columns=list(columns))
+    y = X.to_numpy() @ np.arange(1, len(columns) + 1) + rng.normal(scale=0.1, size=n)
+    return X, y
+
+
+class _Trainer:
+    """전체 탐색(_train_base_learner)과 캐시 재사용(fit_with_params)을 기록하는 가짜 학습기"""
+
+    def __init__(self):
+        self.searched = []
+        self.reused = []
+        self.degrade = False
+
+    def search(self, name, X, y, search_jobs, threads):
+        self.searched.append(name)
+        return Ridge(alpha=SEARCHED_ALPHA).fit(X, y)
+
+    def fit_with_params(self, name, X, y, params, n_jobs):
+        self.reused.append((name, params))
+        if self.degrade:
+            # 캐시된 설정이 더 이상 맞지 않는 상황: 검증 R²가 크게 떨어짐
+            y = np.random.default_rng(1).permutation(y)
+        return Ridge(**params).fit(X, y)
+
+
+@pytest.fixture
+def trainer(monkeypatch, tmp_path):
+    trainer = _Trainer()
+    cache_path = tmp_path / "hyperparameters.json"
+    # train_base_learners는 호출마다 파일에서 캐시를 다시 읽음
+    monkeypatch.setattr(training_scheduler, "get_hyperparameter_cache", lambda: HyperparameterCache(cache_path))
+    monkeypatch.setattr(training_scheduler, "_train_base_learner", trainer.search)
+    monkeypatch.setattr(training_scheduler, "fit_with_params", trainer.fit_with_params)
+    return trainer
+
+
+def _train(X, y, **kwargs):
+    X_valid, y_valid = _data(n=64, seed=5, columns=tuple(X.columns))
+    return training_scheduler.train_base_learners(X, y, cpu_budget=2, X_valid=X_valid, y_valid=y_valid, **kwargs)
+
+
+def test_matching_fingerprint_reuses_cached_params(trainer):
+    X, y = _data()
+    _train(X, y)
+    assert sorted(trainer.searched) == sorted(BASE_LEARNERS)
+
+    # 행 수가 조금 바뀌어도 같은 지문 -> 탐색 없이 캐시된 하이퍼파라미터로 한 번만 학습
+    trainer.searched.clear()
+    X2, y2 = _data(n=250, seed=2)
+    assert compute_data_fingerprint(X2) == compute_data_fingerprint(X)
+    models = _train(X2, y2)
+    assert trainer.searched == []
+    assert sorted(name for name, _ in trainer.reused) == sorted(BASE_LEARNERS)
+    assert all(params["alpha"] == SEARCHED_ALPHA for _, params in trainer.reused)
+    assert all(model.alpha == SEARCHED_ALPHA for model in models.values())
+
+
+@pytest.mark.parametrize("change", ["rows", "columns", "search_mode", "full_search", "max_age"])
+def test_changed_fingerprint_or_settings_searches_again(trainer, monkeypatch, tmp_path, change):
+    X, y = _data()
+    _train(X, y)
+    trainer.searched.clear()
+
+    kwargs = {}
+    if change == "rows":
+        X, y = _data(n=1024)
+    elif change == "columns":
+        X, y = _data(columns=("a", "b", "c", "d"))
+    elif change == "search_mode":
+        monkeypatch.setattr(hyperparameter_cache, "HYPERPARAM_SEARCH_MODE", "halving")
+    elif change == "full_search":
+        kwargs["full_search"] = True
+    else:
+        # 마지막 탐색이 HYPERPARAM_FULL_SEARCH_DAYS보다 오래됨
+        path = tmp_path / "hyperparameters.json"
+        entries = json.loads(path.read_text(encoding="utf-8"))
+        for entry in entries.values():
+            entry["searched_at"] = (datetime.now() - timedelta(days=30)).isoformat()
+        path.write_text(json.dumps(entries), encoding="utf-8")
+
+    _train(X, y, **kwargs)
+    assert trainer.reused == []
+    assert sorted(trainer.searched) == sorted(BASE_LEARNERS)
+
+
+def test_r2_drift_forces_new_search(trainer, tmp_path):
+    X, y = _data()
+    _train(X, y)
+    trainer.searched.clear()
+
+    trainer.degrade = True
+    _train(X, y)
+    # 캐시된 설정으로 먼저 학습해 보고, 검증 R²가 떨어졌으므로 다시 탐색
+    assert sorted(name for name, _ in trainer.reused) == sorted(BASE_LEARNERS)
+    assert sorted(trainer.searched) == sorted(BASE_LEARNERS)
+
+    # 다시 탐색한 결과(새 기준 R²)로 캐시가 갱신됨
+    cache = HyperparameterCache(tmp_path / "hyperparameters.json")
+    entry = cache.get("ridge", compute_data_fingerprint(X))
+    assert entry["params"] == {"alpha": SEARCHED_ALPHA} and entry["valid_r2"] > 0.9
+
+
+def test_small_r2_change_within_drift_keeps_cache(trainer):
+    X, y = _data()
+    _train(X, y)
+    trainer.searched.clear()
+
+    X2, y2 = _data(seed=3)
+    _train(X2, y2)
+    assert trainer.searched == []
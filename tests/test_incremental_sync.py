@@ -0,0 +1,164 @@
+# tests/test_incremental_sync.py
+# MongoDB 증분 동기화: high-water mark(수정/추가/삭제), _id 기준 허용 설정, 변경 스트림과 실패 시 전체 조회
+
+from datetime import datetime, timedelta
+
+import mongomock
+import pytest
+from pymongo.errors import PyMongoError
+
+from app.services.mongodb.incremental_sync import sync_collection, load_snapshot
+
+T0 = datetime(2025, 1, 1)
+
+
+@pytest.fixture
+def db():
+    return mongomock.MongoClient()["sync_test"]
+
+
+def _sync(db, tmp_path, **kwargs):
+    documents, stats = sync_collection(db, "restaurants", mode="incremental", snapshot_dir=tmp_path,
+                                       full_every=0, **kwargs)
+    return sorted(documents, key=lambda doc: doc["restaurant_id"]), stats
+
+
+def _server_documents(collection):
+    return sorted(collection.find({}, {"_id": 0}), key=lambda doc: doc["restaurant_id"])
+
+
+def _insert(collection, n, start=0, updated_at=True):
+    collection.insert_many([
+        {"restaurant_id": i, "score": 4.0, **({"updated_at": T0 + timedelta(seconds=i)} if updated_at else {})}
+        for i in range(start, start + n)
+    ])
+
+
+def test_updated_at_high_water_picks_up_inserts_and_updates(db, tmp_path):
+    collection = db["restaurants"]
+    _insert(collection, 50)
+
+    documents, stats = _sync(db, tmp_path)
+    assert stats["mode"] == "full" and stats["fetched"] == 50
+
+    collection.update_one({"restaurant_id": 3}, {"$set": {"score": 2.5, "updated_at": T0 + timedelta(hours=1)}})
+    collection.insert_one({"restaurant_id": 50, "score": 3.0, "updated_at": T0 + timedelta(hours=1)})
+
+    documents, stats = _sync(db, tmp_path)
+    assert stats["mode"] == "high_water:updated_at"
+    # 이전 high-water와 같은 시각의 문서(>=) 1개와 변경된 2개만 조회
+    assert stats["fetched"] == 3
+    assert documents == _server_documents(collection)
+
+
+def test_delete_falls_back_to_full_pull(db, tmp_path):
+    collection = db["restaurants"]
+    _insert(collection, 20)
+    _sync(db, tmp_path)
+
+    collection.delete_one({"restaurant_id": 7})
+    documents, stats = _sync(db, tmp_path)
+    assert stats["mode"] == "full"
+    assert documents == _server_documents(collection)
+
+
+def test_id_high_water_only_when_configured(db, tmp_path):
+    collection = db["restaurants"]
+    _insert(collection, 20, updated_at=False)
+
+    # 수정 시각 필드가 없고 _id 기준이 허용되지 않으면 매번 전체 조회 (수정도 반영)
+    _sync(db, tmp_path)
+    assert load_snapshot("restaurants", tmp_path)["high_water_field"] is None
+    collection.update_one({"restaurant_id": 2}, {"$set": {"score": 1.0}})
+    documents, stats = _sync(db, tmp_path)
+    assert stats["mode"] == "full"
+    assert documents == _server_documents(collection)
+
+    # 추가만 되는 컬렉션으로 설정하면 _id 이후 문서만 조회
+    _sync(db, tmp_path, id_collections=["restaurants"])
+    _insert(collection, 3, start=20, updated_at=False)
+    documents, stats = _sync(db, tmp_path, id_collections=["restaurants"])
+    assert (stats["mode"], stats["fetched"]) == ("high_water:_id", 3)
+    assert documents == _server_documents(collection)
+
+    # 설정에서 빠지면 _id 기준으로 만든 스냅샷은 버리고 전체 조회
+    documents, stats = _sync(db, tmp_path)
+    assert stats["mode"] == "full"
+    assert load_snapshot("restaurants", tmp_path)["high_water_field"] is None
+
+
+class _FakeStream:
+    def __init__(self, events, token):
+        self._events = list(events)
+        self.resume_token = token
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def try_next(self):
+        if not self._events:
+            return None
+        change = self._events.pop(0)
+        self.resume_token = {"_data": f"{self.resume_token['_data']}+"}
+        return change
+
+
+class _ChangeStreamCollection:
+    """mongomock 컬렉션에 변경 스트림(watch)을 흉내 낸 래퍼 - events에 넣은 이벤트를 resume 이후 반환"""
+
+    def __init__(self, collection):
+        self._collection = collection
+        self.name = collection.name
+        self.events = []
+        self.fail_watch = False
+
+    def __getattr__(self, attr):
+        return getattr(self._collection, attr)
+
+    def watch(self, full_document=None, resume_after=None):
+        if self.fail_watch and resume_after is not None:
+            raise PyMongoError("resume token is no longer in the oplog")
+        events, self.events = (self.events, []) if resume_after is not None else ([], self.events)
+        return _FakeStream(events, {"_data": "token"})
+
+    def record(self, operation, doc=None, _id=None):
+        change = {"operationType": operation, "documentKey": {"_id": doc["_id"] if doc else _id}}
+        if doc is not None:
+            change["fullDocument"] = doc
+        self.events.append(change)
+
+
+def test_change_stream_applies_events_and_falls_back_on_failure(db, tmp_path):
+    collection = _ChangeStreamCollection(db["restaurants"])
+    fake_db = {"restaurants": collection}
+    _insert(collection, 10, updated_at=False)
+
+    _sync(fake_db, tmp_path)
+    assert load_snapshot("restaurants", tmp_path)["resume_token"] is not None
+
+    # 수정, 추가, 삭제 이벤트 적용
+    collection.update_one({"restaurant_id": 1}, {"$set": {"score": 1.5}})
+    collection.record("update", collection.find_one({"restaurant_id": 1}))
+    collection.insert_one({"restaurant_id": 10, "score": 3.0})
+    collection.record("insert", collection.find_one({"restaurant_id": 10}))
+    removed = collection.find_one({"restaurant_id": 4})
+    collection.delete_one({"_id": removed["_id"]})
+    collection.record("delete", _id=removed["_id"])
+
+    documents, stats = _sync(fake_db, tmp_path)
+    assert (stats["mode"], stats["fetched"], stats["deleted"]) == ("change_stream", 2, 1)
+    assert documents == _server_documents(collection)
+
+    # 컬렉션 교체 같은 이벤트나 resume 실패는 전체 조회
+    collection.record("invalidate", _id=None)
+    documents, stats = _sync(fake_db, tmp_path)
+    assert stats["mode"] == "full"
+
+    collection.fail_watch = True
+    collection.delete_one({"restaurant_id": 5})
+    documents, stats = _sync(fake_db, tmp_path)
+    assert stats["mode"] == "full"
+    assert documents == _server_documents(collection)
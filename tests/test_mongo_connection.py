@@ -0,0 +1,148 @@
+# tests/test_mongo_connection.py
+# 공유 MongoDB 연결 관리자: 연결 재사용, 종료, 연결 실패/끊김 후 재연결
+
+import threading
+
+import mongomock
+import pytest
+from pymongo.errors import ConnectionFailure
+
+from app.services.mongodb import connection
+from app.services.mongodb.connection import MongoConnectionManager
+
+
+class _Client(mongomock.MongoClient):
+    """ping 실패와 종료 여부를 흉내 낼 수 있는 mongomock 클라이언트"""
+
+    def __init__(self):
+        super().__init__()
+        self.alive = True
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+        super().close()
+
+    def __getattr__(self, name):
+        if name == "admin" and not self.alive:
+            raise ConnectionFailure("connection reset")
+        return super().__getattr__(name)
+
+
+class _Tunnel:
+    def __init__(self):
+        self.is_active = True
+        self.stopped = False
+
+    def stop(self):
+        self.stopped = True
+        self.is_active = False
+
+
+class _Connector:
+    """연결 함수 대용 - 만든 클라이언트/터널을 기록하고 지정한 횟수만큼 실패"""
+
+    def __init__(self, fail_times=0):
+        self.fail_times = fail_times
+        self.clients = []
+        self.tunnels = []
+
+    def __call__(self):
+        if self.fail_times > 0:
+            self.fail_times -= 1
+            raise ConnectionFailure("server selection timeout")
+        client, tunnel = _Client(), _Tunnel()
+        self.clients.append(client)
+        self.tunnels.append(tunnel)
+        return client, client["recsys"], tunnel
+
+
+def test_connection_is_opened_once_and_shared():
+    connector = _Connector()
+    manager = MongoConnectionManager(connect=connector, health_check_interval=0)
+    dbs = []
+
+    def borrow():
+        for _ in range(20):
+            with manager.borrow() as db:
+                db["likes"].insert_one({"user_id": 1})
+                dbs.append(db)
+
+    threads = [threading.Thread(target=borrow) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert manager.connect_count == 1 and len(connector.clients) == 1
+    assert all(db is dbs[0] for db in dbs)
+    assert dbs[0]["likes"].count_documents({}) == 80
+    # 빌려 쓴 뒤에도 연결은 닫히지 않음
+    assert not connector.clients[0].closed
+
+
+def test_close_stops_client_and_tunnel_and_next_borrow_reconnects():
+    connector = _Connector()
+    manager = MongoConnectionManager(connect=connector, health_check_interval=60)
+    manager.get_db()
+
+    manager.close()
+    assert connector.clients[0].closed and connector.tunnels[0].stopped
+
+    manager.get_db()
+    assert manager.connect_count == 2
+    assert not connector.clients[1].closed
+
+
+def test_failed_ping_or_dead_tunnel_reconnects():
+    connector = _Connector()
+    manager = MongoConnectionManager(connect=connector, health_check_interval=0)
+    first = manager.get_db()
+
+    connector.clients[0].alive = False
+    second = manager.get_db()
+    assert manager.connect_count == 2 and second is not first
+    assert connector.clients[0].closed and connector.tunnels[0].stopped
+
+    connector.tunnels[1].is_active = False
+    manager.get_db()
+    assert manager.connect_count == 3 and connector.clients[1].closed
+
+
+def test_connection_failure_while_borrowed_forces_health_check():
+    connector = _Connector()
+    # 상태 확인 간격이 길어도 사용 중 연결 오류가 나면 다음 대여 때 바로 확인
+    manager = MongoConnectionManager(connect=connector, health_check_interval=3600)
+    manager.get_db()
+
+    connector.clients[0].alive = False
+    with pytest.raises(ConnectionFailure):
+        with manager.borrow():
+            raise ConnectionFailure("connection reset")
+
+    with manager.borrow() as db:
+        db["likes"].insert_one({"user_id": 1})
+    assert manager.connect_count == 2 and connector.clients[0].closed
+
+
+def test_failed_connect_is_retried_on_next_borrow():
+    connector = _Connector(fail_times=1)
+    manager = MongoConnectionManager(connect=connector, health_check_interval=0)
+
+    with pytest.raises(ConnectionFailure):
+        manager.get_db()
+    assert manager.get_db() is not None
+    assert manager.connect_count == 1
+
+
+def test_shared_manager_is_a_singleton_and_closes(monkeypatch):
+    connector = _Connector()
+    monkeypatch.setattr(connection, "_connection_manager", None)
+    monkeypatch.setattr(connection, "get_mongodb_connection", connector)
+
+    manager = connection.get_connection_manager()
+    assert connection.get_connection_manager() is manager
+    manager.get_db()
+
+    connection.close_mongodb_connection()
+    assert connector.clients[0].closed and connector.tunnels[0].stopped
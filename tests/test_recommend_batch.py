@@ -0,0 +1,77 @@
+# tests/test_recommend_batch.py
+# 배치 추천: 사용자 × 식당 행렬 계산 결과가 사용자별 rank_recommendations와 같은지, /recommend/batch 응답(JSON, NDJSON)
+
+import json
+
+import pytest
+
+from app.schema.recommendation_schema import CATEGORY_MAPPING
+from app.services.model_trainer.recommenation.basic import rank_recommendations, rank_recommendations_batch
+
+CATEGORY_NAMES = {category_id: name for name, category_id in CATEGORY_MAPPING.items()}
+
+# 기존 사용자, 선호 카테고리가 없는 사용자(3), 저장소에 없는 사용자(999, 1000), 전체 카테고리(None)
+REQUESTS = [
+    (1, [4, 7], 15),
+    (999, [2], 15),
+    (3, [1, 9, 10], 15),
+    (2, None, 10),
+    (1000, [4, 7, 12], 5),
+    (5, [7], 15),
+    (8, [3, 4, 5], 20),
+]
+
+
+def _expected(score_table, user_store, requests):
+    return [
+        rank_recommendations(score_table, user_id, category_ids, user_store, top_k=k).model_dump()
+        for user_id, category_ids, k in requests
+    ]
+
+
+@pytest.mark.parametrize("chunk_size", [len(REQUESTS), 3, 1])
+def test_batch_matches_per_user_ranking(score_table, user_store, chunk_size):
+    results = rank_recommendations_batch(score_table, REQUESTS, user_store, chunk_size=chunk_size)
+    assert [result.model_dump() for result in results] == _expected(score_table, user_store, REQUESTS)
+    assert [result.is_new_user for result in results] == [False, True, False, False, True, False, False]
+
+
+def test_batch_without_user_store_matches_per_user(score_table):
+    results = rank_recommendations_batch(score_table, REQUESTS, None)
+    assert [result.model_dump() for result in results] == _expected(score_table, None, REQUESTS)
+
+
+def _payload(requests):
+    return [
+        {"userId": user_id, "preferredCategories": [CATEGORY_NAMES[c] for c in category_ids]}
+        for user_id, category_ids, _ in requests
+    ]
+
+
+def test_batch_endpoint_returns_per_user_results(api_client, score_table, user_store):
+    client, _ = api_client
+    requests = [(user_id, category_ids, 15) for user_id, category_ids, _ in REQUESTS if category_ids is not None]
+    payload = _payload(requests) + [{"userId": 77, "preferredCategories": ["없는 카테고리"]}]
+
+    response = client.post("/recommend/batch", params={"k": 15}, json=payload)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["results"] == json.loads(json.dumps(_expected(score_table, user_store, requests)))
+    assert [error["user"] for error in body["errors"]] == [77]
+
+
+def test_batch_endpoint_streams_ndjson(api_client, score_table, user_store, monkeypatch):
+    from app.router import recommendation_api
+
+    client, _ = api_client
+    # 청크 여러 개로 나뉘어 스트리밍되도록 청크 크기를 줄임
+    monkeypatch.setattr(recommendation_api, "RECOMMEND_BATCH_CHUNK_SIZE", 2)
+    requests = [(user_id, category_ids, 10) for user_id, category_ids, _ in REQUESTS if category_ids is not None]
+    payload = _payload(requests) + [{"userId": 77, "preferredCategories": ["없는 카테고리"]}]
+
+    response = client.post("/recommend/batch", params={"k": 10, "stream": "true"}, json=payload)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert lines[:-1] == json.loads(json.dumps(_expected(score_table, user_store, requests)))
+    assert lines[-1]["user"] == 77 and "detail" in lines[-1]
@@ -0,0 +1,77 @@
+# tests/test_recommend_batcher.py
+# 마이크로 배처: 결과 전달, 배치 태스크 참조 유지, 요청 수 기준 포화(503) 처리
+
+import asyncio
+import gc
+
+import pytest
+
+from app.services.recommend_batcher import RecommendBatcher
+from app.services.recommend_executor import ExecutorSaturatedError
+
+
+class FakeExecutor:
+    """release 이벤트가 설정될 때까지 배치 계산을 붙잡아 두는 작업자 풀 대역"""
+
+    def __init__(self):
+        self.release = asyncio.Event()
+        self.batches = []
+
+    async def run(self, fn, score_table, requests, user_store):
+        self.batches.append(len(requests))
+        await self.release.wait()
+        return [f"result-{user_id}" for user_id, _, _ in requests]
+
+
+def test_batched_requests_receive_their_own_results():
+    async def scenario():
+        executor = FakeExecutor()
+        batcher = RecommendBatcher(window_ms=1, max_batch=8, executor=executor, max_pending=16)
+        executor.release.set()
+        results = await asyncio.gather(*[batcher.submit("table", None, i, [1], 15) for i in range(5)])
+        return results, executor.batches, batcher
+
+    results, batches, batcher = asyncio.run(scenario())
+    assert results == [f"result-{i}" for i in range(5)]
+    assert batches == [5]
+    assert batcher.outstanding == 0
+    assert batcher.stats()["running_batches"] == 0
+
+
+def test_running_batch_survives_garbage_collection():
+    async def scenario():
+        executor = FakeExecutor()
+        batcher = RecommendBatcher(window_ms=0, max_batch=2, executor=executor, max_pending=16)
+        waiters = [asyncio.ensure_future(batcher.submit("table", None, i, [1], 15)) for i in range(2)]
+        await asyncio.sleep(0.01)
+        assert len(batcher._tasks) == 1
+        gc.collect()
+        executor.release.set()
+        results = await asyncio.wait_for(asyncio.gather(*waiters), timeout=1)
+        return results, batcher
+
+    results, batcher = asyncio.run(scenario())
+    assert results == ["result-0", "result-1"]
+    assert not batcher._tasks
+
+
+def test_submit_rejects_when_outstanding_requests_reach_limit():
+    async def scenario():
+        executor = FakeExecutor()
+        batcher = RecommendBatcher(window_ms=0, max_batch=2, executor=executor, max_pending=3)
+        waiters = [asyncio.ensure_future(batcher.submit("table", None, i, [1], 15)) for i in range(3)]
+        await asyncio.sleep(0.01)
+        with pytest.raises(ExecutorSaturatedError):
+            await batcher.submit("table", None, 99, [1], 15)
+        rejected = batcher.rejected
+
+        # 계산이 끝나 자리가 나면 다시 받음
+        executor.release.set()
+        await asyncio.gather(*waiters)
+        result = await batcher.submit("table", None, 100, [1], 15)
+        return rejected, result, batcher
+
+    rejected, result, batcher = asyncio.run(scenario())
+    assert rejected == 1
+    assert result == "result-100"
+    assert batcher.outstanding == 0
@@ -0,0 +1,87 @@
+# tests/test_recommend_cache.py
+# 추천 결과 캐시: 워커 간 공유(결정적 모델 버전), 무효화, LRU/TTL
+
+import time
+
+import pytest
+
+from app.dependencies import make_model_version
+from app.services.recommend_cache import RecommendCache, MemoryCacheBackend, FileCacheBackend
+
+
+@pytest.fixture(params=["memory", "file"])
+def shared_backend(request, tmp_path):
+    """
+    여러 워커가 함께 쓰는 공유 백엔드 대역
+    memory: 두 RecommendCache가 백엔드 객체 하나를 공유, file: 같은 디렉토리를 사용하는 백엔드 두 개
+    """
+    if request.param == "memory":
+        backend = MemoryCacheBackend(max_size=100, ttl=60)
+        return lambda: backend
+    return lambda: FileCacheBackend(tmp_path / "recommend_cache", max_size=100, ttl=60)
+
+
+def test_model_version_is_deterministic_per_artifact_and_user_features(user_features):
+    version = make_model_version("20250101000000-abcdef12-123456", user_features)
+    assert version == make_model_version("20250101000000-abcdef12-123456", user_features.copy())
+    assert version != make_model_version("20250102000000-abcdef12-654321", user_features)
+
+    changed = user_features.copy()
+    changed.loc[0, "max_price"] += 1
+    assert version != make_model_version("20250101000000-abcdef12-123456", changed)
+    assert version != make_model_version("20250101000000-abcdef12-123456", None)
+
+
+def test_model_version_without_artifact_is_unique():
+    assert make_model_version() != make_model_version()
+
+
+def test_workers_share_hits_for_the_same_model(shared_backend, user_features):
+    # 같은 아티팩트와 사용자 특성을 로드한 워커 두 개가 각자 모델 버전을 계산
+    worker_a = RecommendCache(shared_backend())
+    worker_b = RecommendCache(shared_backend())
+    version_a = make_model_version("20250101000000-abcdef12-123456", user_features)
+    version_b = make_model_version("20250101000000-abcdef12-123456", user_features.copy())
+
+    assert worker_a.get(version_a, 1, [4, 7], 15) is None
+    worker_a.set(version_a, 1, [4, 7], 15, '{"user": 1}')
+
+    # 카테고리 순서/중복과 무관하게 다른 워커에서 적중
+    assert worker_b.get(version_b, 1, [7, 4, 4], 15) == '{"user": 1}'
+    assert (worker_a.misses, worker_b.hits) == (1, 1)
+
+    # 재학습으로 모델 버전이 바뀌면 이전 항목은 조회되지 않음
+    retrained = make_model_version("20250102000000-abcdef12-654321", user_features)
+    assert worker_b.get(retrained, 1, [4, 7], 15) is None
+    # k나 사용자가 다르면 다른 항목
+    assert worker_b.get(version_b, 1, [4, 7], 10) is None
+    assert worker_b.get(version_b, 2, [4, 7], 15) is None
+
+
+def test_memory_backend_evicts_least_recently_used():
+    cache = RecommendCache(MemoryCacheBackend(max_size=2, ttl=60))
+    cache.set("v", 1, [1], 15, "a")
+    cache.set("v", 2, [1], 15, "b")
+    assert cache.get("v", 1, [1], 15) == "a"
+    cache.set("v", 3, [1], 15, "c")
+
+    assert cache.get("v", 2, [1], 15) is None
+    assert cache.get("v", 1, [1], 15) == "a"
+    assert cache.stats()["evictions"] == 1
+
+
+def test_entries_expire_after_ttl(tmp_path):
+    for backend in (MemoryCacheBackend(max_size=10, ttl=0.05), FileCacheBackend(tmp_path, max_size=10, ttl=0.05)):
+        cache = RecommendCache(backend)
+        cache.set("v", 1, [1], 15, "a")
+        assert cache.get("v", 1, [1], 15) == "a"
+        time.sleep(0.1)
+        assert cache.get("v", 1, [1], 15) is None
+        assert cache.stats()["expirations"] == 1
+
+
+def test_disabled_cache_is_a_no_op():
+    cache = RecommendCache(None)
+    cache.set("v", 1, [1], 15, "a")
+    assert cache.get("v", 1, [1], 15) is None
+    assert cache.stats() == {"backend": "none"}
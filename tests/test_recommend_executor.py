@@ -0,0 +1,77 @@
+# tests/test_recommend_executor.py
+# 추천 작업자 풀: 실제 RecommendExecutor를 작업으로 가득 채우면 /recommend, /recommend/batch가 503과 Retry-After로 응답
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.services import recommend_batcher
+from app.services.recommend_batcher import RecommendBatcher
+from app.services.recommend_executor import RecommendExecutor, ExecutorSaturatedError
+
+PAYLOAD = {"userId": 1, "preferredCategories": ["중식", "일식집"]}
+
+
+def test_executor_rejects_when_workers_and_queue_are_full():
+    async def scenario():
+        executor = RecommendExecutor(max_workers=1, queue_size=1)
+        release = threading.Event()
+        running = [asyncio.ensure_future(executor.run(release.wait)) for _ in range(executor.capacity)]
+        await asyncio.sleep(0.01)
+        assert executor.saturated and executor.stats()["queued"] == 1
+
+        with pytest.raises(ExecutorSaturatedError):
+            await executor.run(lambda: None)
+
+        release.set()
+        await asyncio.gather(*running)
+        result = await executor.run(lambda: "ok")
+        executor.shutdown()
+        return result, executor.stats()
+
+    result, stats = asyncio.run(scenario())
+    assert result == "ok"
+    assert stats["rejected"] == 1 and stats["completed"] == 3 and stats["in_flight"] == 0
+
+
+def _fill(client, executor, release):
+    """앱 이벤트 루프에서 끝나지 않는 작업을 한도만큼 실행해 작업자 풀과 대기열을 채움"""
+    futures = [client.portal.start_task_soon(executor.run, release.wait) for _ in range(executor.capacity)]
+    deadline = time.monotonic() + 5
+    while not executor.saturated:
+        assert time.monotonic() < deadline, "작업자 풀이 가득 차지 않음"
+        time.sleep(0.005)
+    return futures
+
+
+def test_router_returns_503_when_real_executor_is_full(api_client, monkeypatch):
+    from app.router import recommendation_api
+
+    client, executor = api_client
+    monkeypatch.setattr(recommendation_api, "RECOMMEND_RETRY_AFTER", 7)
+    monkeypatch.setattr(recommend_batcher, "_recommend_batcher", RecommendBatcher(window_ms=1))
+    release = threading.Event()
+    futures = _fill(client, executor, release)
+    try:
+        response = client.post("/recommend", params={"k": 5}, json=PAYLOAD)
+        assert response.status_code == 503
+        assert response.headers["retry-after"] == "7"
+
+        for params in ({"k": 5}, {"k": 5, "stream": "true"}):
+            response = client.post("/recommend/batch", params=params, json=[PAYLOAD])
+            assert response.status_code == 503
+            assert response.headers["retry-after"] == "7"
+
+        assert executor.stats()["rejected"] >= 1
+        assert executor.in_flight == executor.capacity
+    finally:
+        release.set()
+        for future in futures:
+            future.result(timeout=5)
+
+    # 작업이 끝나면 같은 요청이 정상 처리됨
+    assert executor.in_flight == 0
+    assert client.post("/recommend", params={"k": 5}, json=PAYLOAD).status_code == 200
+    assert client.post("/recommend/batch", params={"k": 5}, json=[PAYLOAD]).status_code == 200
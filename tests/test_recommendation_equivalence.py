@@ -0,0 +1,56 @@
+# tests/test_recommendation_equivalence.py
+# 벡터화한 추천 생성 결과가 baseline(행 단위 apply) 결과와 같은지 확인
+
+import json
+
+import numpy as np
+import pytest
+
+from app.setting import REVIEW_WEIGHT, CAUTION_WEIGHT, CONVENIENCE_WEIGHT
+from app.services.model_trainer.recommenation.basic import generate_recommendations, compute_composite_score
+from app.services.model_trainer.recommenation.scoring import compute_composite_scores
+
+import baseline_recommendation as baseline
+
+
+def _baseline(restaurants, fitted_model, user_id, categories, user_features):
+    stacking_reg, model_features, scaler = fitted_model
+    data_filtered = restaurants[restaurants["category_id"].isin(categories)].copy()
+    features = user_features.copy() if user_features is not None else None
+    result = baseline.generate_recommendations(data_filtered, stacking_reg, model_features, user_id, scaler,
+                                               user_features=features)
+    return json.loads(result)
+
+
+def _optimized(restaurants, fitted_model, user_id, categories, user_features):
+    stacking_reg, model_features, scaler = fitted_model
+    data_filtered = restaurants[restaurants["category_id"].isin(categories)].copy()
+    result = generate_recommendations(data_filtered, stacking_reg, model_features, user_id, scaler,
+                                      user_features=user_features)
+    return result.model_dump(mode="json")
+
+
+def test_composite_scores_match_row_apply(restaurants):
+    df = restaurants.copy()
+    df["final_score"] = df["score"]
+    df["review"] = df["review"].astype(float)
+    expected = df.apply(
+        lambda row: compute_composite_score(row, REVIEW_WEIGHT, CAUTION_WEIGHT, CONVENIENCE_WEIGHT), axis=1
+    ).to_numpy()
+    actual = compute_composite_scores(df, REVIEW_WEIGHT, CAUTION_WEIGHT, CONVENIENCE_WEIGHT)
+    np.testing.assert_allclose(actual, expected, rtol=0, atol=1e-12)
+
+
+@pytest.mark.parametrize("user_id", [1, 2, 3, 5, 8, 13, 999])
+@pytest.mark.parametrize("categories", [[4], [1, 7, 9], list(range(1, 13))])
+def test_generate_recommendations_matches_baseline(restaurants, user_features, fitted_model, user_id, categories):
+    expected = _baseline(restaurants, fitted_model, user_id, categories, user_features)
+    actual = _optimized(restaurants, fitted_model, user_id, categories, user_features)
+    assert actual == expected
+
+
+@pytest.mark.parametrize("user_id", [1, 999])
+def test_generate_recommendations_without_user_features_matches_baseline(restaurants, fitted_model, user_id):
+    expected = _baseline(restaurants, fitted_model, user_id, [2, 5], None)
+    actual = _optimized(restaurants, fitted_model, user_id, [2, 5], None)
+    assert actual == expected
@@ -0,0 +1,58 @@
+# tests/test_stacking.py
+# 폴드 밖 예측 스태킹 앙상블: scikit-learn 추정기 규약(get_params/clone)과 학습 결과
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.base import clone
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.linear_model import Ridge
+
+from app.services.model_trainer.model_training import OOFStackingRegressor, train_stacking, meta_cv_score
+
+
+@pytest.fixture(scope="module")
+def training_data():
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(240, 4)), columns=["a", "b", "c", "d"])
+    y = X["a"] * 2 - X["b"] + np.sin(X["c"]) + rng.normal(scale=0.1, size=len(X))
+    return X, y
+
+
+def _base_estimators(X, y):
+    return [
+        ("ridge", Ridge().fit(X, y)),
+        ("rf", RandomForestRegressor(n_estimators=20, random_state=0).fit(X, y)),
+    ]
+
+
+def test_train_stacking_builds_fitted_ensemble(training_data):
+    X, y = training_data
+    stacking, cv_score = train_stacking(_base_estimators(X, y), X, y, cv=3)
+
+    assert cv_score == stacking.cv_score_
+    assert cv_score == pytest.approx(meta_cv_score(stacking.oof_predictions_, y.to_numpy(), stacking.folds_))
+    assert set(stacking.oof_metrics_) == {"ridge", "rf"}
+    assert stacking.predict(X).shape == (len(X),)
+
+
+def test_get_params_and_clone_follow_estimator_contract(training_data):
+    X, y = training_data
+    stacking, _ = train_stacking(_base_estimators(X, y), X, y, cv=3)
+
+    params = stacking.get_params(deep=False)
+    assert set(params) == {"estimators", "final_estimator", "cv", "n_jobs"}
+    assert params["cv"] == 3
+
+    unfitted = clone(stacking)
+    assert not hasattr(unfitted, "estimators_")
+    refit = unfitted.fit(X, y)
+    np.testing.assert_allclose(refit.predict(X), stacking.predict(X), rtol=1e-10, atol=1e-10)
+
+
+def test_fit_from_unfitted_estimators(training_data):
+    X, y = training_data
+    stacking = OOFStackingRegressor([("ridge", Ridge()), ("rf", RandomForestRegressor(n_estimators=20, random_state=0))],
+                                    cv=3).fit(X, y)
+    assert stacking.score(X, y) > 0.9
+    assert [name for name, _ in stacking.estimators_] == ["ridge", "rf"]
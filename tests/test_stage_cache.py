@@ -0,0 +1,84 @@
+# tests/test_stage_cache.py
+# 파이프라인 단계 캐시: 캐시된 단계 건너뛰기, 코드 버전별 재계산, 동시 저장
+
+import threading
+
+import pandas as pd
+
+from app.services.stage_cache import Stage, StageCache, hash_bytes, hash_dataframe, run_stages
+
+
+def _stages(calls, preprocess_version="v1"):
+    def load(_):
+        calls.append("load")
+        return pd.DataFrame({"id": [1, 2, 3], "score": [4.0, 3.5, 5.0]})
+
+    def preprocess(df):
+        calls.append("preprocess")
+        return df.assign(log_score=df["score"] * 2)
+
+    return [Stage("load", load, "v1"), Stage("preprocess", preprocess, preprocess_version)]
+
+
+def test_cached_stages_are_skipped_and_code_changes_recompute(tmp_path):
+    cache = StageCache(tmp_path, keep=3)
+    calls = []
+
+    cold = run_stages(_stages(calls), "source-1", cache=cache)
+    assert calls == ["load", "preprocess"]
+
+    calls.clear()
+    warm = run_stages(_stages(calls), "source-1", cache=cache)
+    assert calls == []
+    pd.testing.assert_frame_equal(warm, cold)
+
+    # 전처리 코드만 바뀌면 로드 단계 캐시는 그대로 사용
+    calls.clear()
+    run_stages(_stages(calls, preprocess_version="v2"), "source-1", cache=cache)
+    assert calls == ["preprocess"]
+
+    # 원본이 바뀌거나 강제 재계산이면 모든 단계 계산
+    calls.clear()
+    run_stages(_stages(calls), "source-2", cache=cache)
+    assert calls == ["load", "preprocess"]
+    calls.clear()
+    run_stages(_stages(calls), "source-1", cache=cache, force_rebuild=True)
+    assert calls == ["load", "preprocess"]
+
+
+def test_concurrent_saves_of_the_same_key_do_not_collide(tmp_path):
+    cache = StageCache(tmp_path, keep=3)
+    df = pd.DataFrame({"id": range(100), "score": [4.0] * 100})
+    key, output_hash = hash_bytes("load", "v1", "source"), hash_dataframe(df)
+    errors = []
+
+    def save():
+        try:
+            for _ in range(20):
+                cache.save("load", key, df, output_hash, "source")
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=save) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert cache.lookup("load", key)["output_hash"] == output_hash
+    assert not list((tmp_path / "load").glob(".tmp-*"))
+
+
+def test_prune_keeps_recent_results_and_ignores_temp_files(tmp_path):
+    cache = StageCache(tmp_path, keep=1)
+    df = pd.DataFrame({"id": [1]})
+    cache.save("load", "old", df, hash_dataframe(df), "a")
+    cache.save("load", "new", df, hash_dataframe(df), "b")
+    in_progress = tmp_path / "load" / ".tmp-other-abc123.json"
+    in_progress.write_text("{}")
+
+    assert cache.prune("load") == 1
+    assert cache.lookup("load", "new") is not None
+    assert cache.lookup("load", "old") is None
+    assert in_progress.exists()
@@ -0,0 +1,130 @@
+# tests/test_training_scheduler.py
+# 개별 모델 학습 스케줄러: CPU 예산 배분, 동시 사용 코어 제한, BLAS 스레드 제한(threadpool_limits)과 joblib 백엔드 적용
+
+import threading
+import time
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+import pytest
+from joblib._parallel_backends import ThreadingBackend
+from joblib.parallel import get_active_backend
+from sklearn.linear_model import Ridge
+
+from app.services.model_trainer import training_scheduler
+from app.services.model_trainer.hyperparameter_cache import HyperparameterCache
+from app.services.model_trainer.training_scheduler import (
+    BASE_LEARNERS, BASE_LEARNER_COST, BASE_LEARNER_FITS, NATIVE_THREADED, CpuBudget, plan_cpu_budget,
+)
+
+
+@pytest.mark.parametrize("cpu_budget", [1, 2, 6, 8, 16, 67, 128])
+def test_plan_splits_budget_across_learners(cpu_budget):
+    plan = plan_cpu_budget(cpu_budget)
+
+    assert list(plan) == list(BASE_LEARNERS)
+    for name, entry in plan.items():
+        assert entry["cores"] >= 1
+        assert 1 <= entry["search_jobs"] <= min(entry["cores"], BASE_LEARNER_FITS[name])
+        # 모델 내부 스레드는 라이브러리 자체 스레드 풀이 있는 모델만, 배분된 코어 안에서 사용
+        assert entry["search_jobs"] * entry["threads"] <= entry["cores"]
+        if name not in NATIVE_THREADED:
+            assert entry["threads"] == 1
+
+    total = sum(entry["cores"] for entry in plan.values())
+    # 모델마다 최소 1코어를 보장하므로 예산이 작으면 합이 예산을 넘을 수 있음 (동시 사용은 CpuBudget이 제한)
+    assert total >= cpu_budget
+    if cpu_budget >= sum(BASE_LEARNER_COST.values()):
+        assert total == cpu_budget
+        # 비용이 가장 큰 모델이 가장 많은 코어를 받음
+        assert max(plan, key=lambda name: plan[name]["cores"]) == "xgb"
+
+
+def test_cpu_budget_gate_limits_concurrent_cores():
+    budget = CpuBudget(4)
+    lock = threading.Lock()
+    state = {"in_use": 0, "peak": 0}
+
+    def work(cores):
+        acquired = budget.acquire(cores)
+        with lock:
+            state["in_use"] += acquired
+            state["peak"] = max(state["peak"], state["in_use"])
+        time.sleep(0.01)
+        with lock:
+            state["in_use"] -= acquired
+        budget.release(acquired)
+
+    threads = [threading.Thread(target=work, args=(cores,)) for cores in [3, 1, 2, 4, 1, 1, 9]]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert state["peak"] <= 4
+    assert budget.available == 4
+
+
+def test_train_base_learners_applies_budget_threadpool_limits_and_backend(monkeypatch, tmp_path):
+    cpu_budget = 8
+    plan = plan_cpu_budget(cpu_budget)
+    lock = threading.Lock()
+    state = {"in_use": 0, "peak": 0, "overlap": 0, "active": 0}
+    limits_calls = []
+    blas_limited = {"active": False}
+    seen = {}
+
+    real_threadpool_limits = training_scheduler.threadpool_limits
+
+    @contextmanager
+    def recording_threadpool_limits(*args, **kwargs):
+        limits_calls.append(kwargs)
+        with real_threadpool_limits(*args, **kwargs):
+            blas_limited["active"] = True
+            try:
+                yield
+            finally:
+                blas_limited["active"] = False
+
+    def fake_search(name, X, y, search_jobs, threads):
+        backend, n_jobs = get_active_backend()
+        seen[name] = {
+            "blas_limited": blas_limited["active"],
+            "backend": type(backend),
+            "n_jobs": n_jobs,
+            "search_jobs": search_jobs,
+            "threads": threads,
+        }
+        with lock:
+            state["in_use"] += plan[name]["cores"]
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["in_use"])
+            state["overlap"] = max(state["overlap"], state["active"])
+        time.sleep(0.02)
+        with lock:
+            state["in_use"] -= plan[name]["cores"]
+            state["active"] -= 1
+        return Ridge().fit(X, y)
+
+    monkeypatch.setattr(training_scheduler, "threadpool_limits", recording_threadpool_limits)
+    monkeypatch.setattr(training_scheduler, "_train_base_learner", fake_search)
+    monkeypatch.setattr(training_scheduler, "get_hyperparameter_cache",
+                        lambda: HyperparameterCache(tmp_path / "hyperparameters.json"))
+
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(64, 3)), columns=["a", "b", "c"])
+    y = X["a"] * 2 + rng.normal(scale=0.1, size=len(X))
+    models = training_scheduler.train_base_learners(X, y, cpu_budget=cpu_budget, full_search=True)
+
+    assert list(models) == list(BASE_LEARNERS)
+    assert limits_calls == [{"limits": 1, "user_api": "blas"}]
+    for name in BASE_LEARNERS:
+        assert seen[name]["blas_limited"]
+        # 탐색 워커는 작업 스레드 안에서 지정한 threading 백엔드와 배분된 워커 수로 실행
+        assert seen[name]["backend"] is ThreadingBackend
+        assert seen[name]["n_jobs"] == plan[name]["search_jobs"] == seen[name]["search_jobs"]
+        assert seen[name]["threads"] == plan[name]["threads"]
+    # 동시에 사용한 코어는 예산 이하이고, 예산 안에서 여러 모델이 함께 학습됨
+    assert state["peak"] <= cpu_budget
+    assert state["overlap"] > 1